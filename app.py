@@ -2,19 +2,24 @@
 import streamlit as st
 import os
 import base64
+import hashlib
 import pandas as pd
 import uuid
 
 from streamlit_cookies_manager import EncryptedCookieManager
 from sidebar import render_sidebar
 from home import run as run_home
+from home import banner_bytes, banner_hash, banner_source, set_banner, clear_banner
+import blobstore
+import search
+from tables import as_frame
 import tabs.design_analysis as design_analysis
 import tabs.project_management as project_management
 import tabs.compliance_reporting as compliance_reporting
 import tabs.tools_utilities as tools_utilities
 import tabs.collaboration_documentation as collaboration_documentation
 
-from pushpull import pull_database, push_database, pull_users, push_users
+from pushpull import pull_shards, read_shard, push_shard, read_table, push_table, pull_users, push_users
 
 # ── Streamlit page config ───────────────────────────────────────────────────
 st.set_page_config(page_title="Civil Engineer Automation Tool", layout="wide")
@@ -79,121 +84,120 @@ def clear_token(tok):
     save_users_local(df)
 
 # ── Banner file & GitHub sync ───────────────────────────────────────────────
-HOME_BANNER_PATH = "home_banner.jpg"
+# One banner file for the whole app (its path, HOME_BANNER_PATH, lives in home.py):
+# home.py displays/edits it, we sync it with the database.  The `HomeBanner`
+# shard only holds a blob reference; the image itself lives in the blob store.
+def _banner_source(value):
+    # blob refs are already hashes; legacy Base64 rows are hashed here
+    return value if blobstore.is_ref(value) else hashlib.sha1(value.encode()).hexdigest()
 
 def sync_home_banner_after_pull():
-    """Pull the Base64 from session_state['db_df'] and write/erase local banner."""
-    df = st.session_state.get("db_df", pd.DataFrame())
-    idx = df.index[df["Tab"]=="HomeBanner"].tolist()
-    # if there's data and non‑empty string, decode + write
-    if idx and df.at[idx[0],"Data"]:
-        b64 = df.at[idx[0],"Data"]
+    """
+    Bring the local banner in line with the pulled `HomeBanner` shard.
+    Nothing is fetched, decoded or written unless the stored reference
+    differs from the one we last synced.
+    """
+    value = (read_shard("HomeBanner") or b"").decode().strip()
+    src = _banner_source(value)
+    if src == banner_source():
+        return
+    if blobstore.is_ref(value):
+        sha = blobstore.ref_sha(value)
+        if sha == banner_hash():
+            set_banner(banner_bytes(), source=src)
+        else:
+            data = blobstore.get(sha)  # lazy: local cache first, GitHub on a miss
+            if data is not None:
+                set_banner(data, source=src)
+    elif value:
+        # legacy row with the Base64 image inline
         try:
-            img = base64.b64decode(b64)
-            with open(HOME_BANNER_PATH, "wb") as f:
-                f.write(img)
+            set_banner(base64.b64decode(value), source=src)
         except Exception:
             pass
     else:
         # no entry or empty Data → ensure file is removed
-        if os.path.exists(HOME_BANNER_PATH):
-            os.remove(HOME_BANNER_PATH)
+        clear_banner(source=src)
 
 def save_home_banner_to_github():
     """
-    Read the local banner file if it exists (or empty string if not),
-    then update the `HomeBanner` row in database.csv on GitHub.
+    Store the local banner (if any) in the blob store, then point the
+    `HomeBanner` shard at it (or clear it).
     """
-    df, sha = pull_database()
-    # prepare new Base64 or empty
-    if os.path.exists(HOME_BANNER_PATH):
-        with open(HOME_BANNER_PATH, "rb") as f:
-            b64 = base64.b64encode(f.read()).decode()
-    else:
-        b64 = ""
-    # upsert
-    idx = df.index[df["Tab"]=="HomeBanner"].tolist()
-    if not idx:
-        new = pd.DataFrame([{"Tab":"HomeBanner","SubTab":"","Data":b64}])
-        df = pd.concat([df, new], ignore_index=True)
-    else:
-        df.at[idx[0],"Data"] = b64
-    return push_database(df, sha)
+    data = banner_bytes()
+    value = ""
+    if data is not None:
+        sha = blobstore.put(data)
+        code = blobstore.publish(sha)
+        if code not in (200,201):
+            return code
+        value = blobstore.make_ref(sha)
+    code = push_shard("HomeBanner", "", value)
+    if code in (200,201):
+        # what we just pushed is already on disk — don't fetch it again
+        if data is not None:
+            set_banner(data, source=_banner_source(value))
+        else:
+            clear_banner(source=_banner_source(value))
+    return code
 
 # ── “Save” handlers for other tabs ──────────────────────────────────────────
+# Each (Tab, SubTab) is its own shard, so a save uploads just that table.
+SAVED_TABLES = {
+    "structural_data":      ("Design and Analysis", "Structural Analysis"),
+    "scheduling_data":      ("Project Management", "Scheduling"),
+    "cost_estimation_data": ("Tools and Utilities", "Cost Estimation"),
+    "document_data":        ("Collaboration and Documentation", "Documents"),
+}
+
+def load_saved_tables():
+    """Seed session tables from the pulled shards (once per session)."""
+    for key, (tab, subtab) in SAVED_TABLES.items():
+        if key not in st.session_state:
+            df = read_table(tab, subtab)
+            if df is not None:
+                st.session_state[key] = df
+
+def index_saved_tables():
+    """Bring the search index up to date with the pulled tables and documents (once per session)."""
+    if st.session_state.get("search_indexed"):
+        return
+    search.index_frame("Task", as_frame(st.session_state.get("scheduling_data")),
+                       "Task", "Task", ["Description", "Priority", "Status"])
+    search.index_frame("Document", as_frame(st.session_state.get("document_data")),
+                       "File Name", "File Name", ["File Name"])
+    docs_dir = collaboration_documentation.UPLOADS_DIR
+    if os.path.isdir(docs_dir):
+        search.index_many("Document", [(name, name, name) for name in os.listdir(docs_dir)])
+    st.session_state.search_indexed = True
+
 def save_structural_analysis_to_github():
     if "structural_data" not in st.session_state:
         st.error("No structural data to save.")
         return None
-    df_data, sha = pull_database()
-    csv = st.session_state.structural_data.to_csv(index=False)
-    idx = df_data.index[
-        (df_data["Tab"]=="Design and Analysis") & (df_data["SubTab"]=="Structural Analysis")
-    ].tolist()
-    if not idx:
-        new = pd.DataFrame([{
-            "Tab":"Design and Analysis",
-            "SubTab":"Structural Analysis",
-            "Data":csv
-        }])
-        df_data = pd.concat([df_data, new], ignore_index=True)
-    else:
-        df_data.at[idx[0],"Data"] = csv
-    return push_database(df_data, sha)
+    return push_table("Design and Analysis", "Structural Analysis", as_frame(st.session_state.structural_data))
 
 def save_project_management_to_github():
-    df_data, sha = pull_database()
-    if "scheduling_data" in st.session_state:
-        csv = st.session_state.scheduling_data.to_csv(index=False)
-        idx = df_data.index[
-            (df_data["Tab"]=="Project Management") & (df_data["SubTab"]=="Scheduling")
-        ].tolist()
-        if not idx:
-            new = pd.DataFrame([{
-                "Tab":"Project Management",
-                "SubTab":"Scheduling",
-                "Data":csv
-            }])
-            df_data = pd.concat([df_data,new], ignore_index=True)
-        else:
-            df_data.at[idx[0],"Data"] = csv
-    return push_database(df_data, sha)
+    if "scheduling_data" not in st.session_state:
+        return 200  # nothing to upload
+    return push_table("Project Management", "Scheduling", as_frame(st.session_state.scheduling_data))
 
 def save_tools_utilities_to_github():
-    df_data, sha = pull_database()
-    if "cost_estimation_data" in st.session_state:
-        csv = st.session_state.cost_estimation_data.to_csv(index=False)
-        idx = df_data.index[
-            (df_data["Tab"]=="Tools and Utilities") & (df_data["SubTab"]=="Cost Estimation")
-        ].tolist()
-        if not idx:
-            new = pd.DataFrame([{
-                "Tab":"Tools and Utilities",
-                "SubTab":"Cost Estimation",
-                "Data":csv
-            }])
-            df_data = pd.concat([df_data,new], ignore_index=True)
-        else:
-            df_data.at[idx[0],"Data"] = csv
-    return push_database(df_data, sha)
+    if "cost_estimation_data" not in st.session_state:
+        return 200  # nothing to upload
+    return push_table("Tools and Utilities", "Cost Estimation", as_frame(st.session_state.cost_estimation_data))
 
 def save_collaboration_docs_to_github():
-    df_data, sha = pull_database()
-    if "document_data" in st.session_state:
-        csv = st.session_state.document_data.to_csv(index=False)
-        idx = df_data.index[
-            (df_data["Tab"]=="Collaboration and Documentation") & (df_data["SubTab"]=="Documents")
-        ].tolist()
-        if not idx:
-            new = pd.DataFrame([{
-                "Tab":"Collaboration and Documentation",
-                "SubTab":"Documents",
-                "Data":csv
-            }])
-            df_data = pd.concat([df_data,new], ignore_index=True)
-        else:
-            df_data.at[idx[0],"Data"] = csv
-    return push_database(df_data, sha)
+    if "document_data" not in st.session_state:
+        return 200  # nothing to upload
+    docs = as_frame(st.session_state.document_data)
+    if "Blob" in docs:
+        # upload document contents first so the table never references a missing blob
+        for blob in docs["Blob"].dropna().unique():
+            code = blobstore.publish(blob)
+            if code not in (200,201):
+                return code
+    return push_table("Collaboration and Documentation", "Documents", docs)
 
 # ── Authentication Screens ─────────────────────────────────────────────────
 def sign_up_screen():
@@ -235,10 +239,11 @@ def logout():
 
 # ── Main App ───────────────────────────────────────────────────────────────
 def main_app():
-    # 1) pull DB, store in session, sync banner  
-    df, sha = pull_database()
-    st.session_state["db_df"], st.session_state["db_sha"] = df, sha
+    # 1) pull changed DB shards, keep their shas in session, sync banner
+    st.session_state["db_shas"] = pull_shards()
     sync_home_banner_after_pull()
+    load_saved_tables()
+    index_saved_tables()
 
     if st.button("Logout"):
         logout(); st.stop()
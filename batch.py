@@ -0,0 +1,187 @@
+# batch.py
+"""
+Headless batch beam analysis.
+
+    python -m batch jobs.json members.csv -o results.jsonl --processes 8
+
+Job files are JSON (a list of jobs, or {"jobs": [...]}), JSON lines
+(.jsonl, one job per line) or CSV.  A JSON job:
+
+    {"member": "B1", "length": 6.0, "supports": [0, 6],
+     "point_loads": [{"position": 2, "magnitude": 10, "direction": "Downward"}],
+     "udls": [{"start": 0, "end": 6, "intensity": 5}],
+     "load_cases": {"Live": {"point_loads": [...], "udls": [...]}},
+     "section": {"b": 300, "h": 500, "d": 450, "fc": 28, "fy": 420, "As": 1500, "Av": 157, "s": 150}}
+
+Each load case is analysed with the member's own loads plus the case's;
+without load_cases the member is one case.  A CSV has one row per load —
+Member, Length (m), optional Case and Support A/B (m), the Beam Analysis
+import columns (Position/Magnitude or Start/End/Intensity, Direction) and
+optionally the member‑results section columns — with each member's rows
+together.  Every (member, case) becomes one JSON line with the reactions
+and extrema the Beam Analysis tab shows (plus the member‑results values
+when a section is given), written as the worker pool returns them.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+from functools import partial
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from compliance import MEMBER_VARIABLES, beam_member_result
+from core import Beam, beam_summary, load_arrays
+
+CSV_CHUNK_ROWS = 50_000
+SECTION_COLUMNS = {c: v for v, c in MEMBER_VARIABLES.items() if v in ("b", "h", "d", "fc", "fy", "As", "Av", "s")}
+REQUIRED_SECTION = {"b", "h", "d", "fc", "fy", "As"}   # Av and s default to no stirrups
+
+# ── Jobs ─────────────────────────────────────────────────────────────────────
+def _supports(value, length):
+    if not value:
+        return [(0.0, "pin"), (float(length), "roller")]
+    return [(float(s), "pin" if i == 0 else "roller") if not isinstance(s, (list, tuple)) else (float(s[0]), s[1])
+            for i, s in enumerate(value)]
+
+def _json_jobs(job):
+    """
+    One normalised job per load case of a JSON member (its loads are parsed
+    in the worker); a member that can't be read becomes one error job.
+    """
+    try:
+        base = [*job.get("point_loads", []), *job.get("udls", [])]
+        cases = job.get("load_cases") or {"": {}}
+        jobs = [{"member": str(job.get("member", "")), "case": case, "length": float(job["length"]),
+                 "supports": _supports(job.get("supports"), job["length"]),
+                 "loads": base + [*extra.get("point_loads", []), *extra.get("udls", [])],
+                 "section": job.get("section")}
+                for case, extra in cases.items()]
+    except Exception as e:
+        member = job.get("member", "") if isinstance(job, dict) else ""
+        jobs = [{"member": str(member), "case": "", "error": f"{type(e).__name__}: {e}"}]
+    yield from jobs
+
+def _column(df, col):
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) if col in df else np.full(len(df), np.nan)
+
+def _csv_chunk_jobs(chunk):
+    """Jobs for the (member, case) groups of a CSV chunk, in order of appearance; loads parsed once per chunk."""
+    if not len(chunk):
+        return
+    point, udl = load_arrays(chunk)
+    length, sup_a, sup_b = (_column(chunk, c) for c in ("Length (m)", "Support A (m)", "Support B (m)"))
+    section = {v: _column(chunk, c) for c, v in SECTION_COLUMNS.items() if c in chunk}
+    codes = chunk.groupby(["Member", "Case"], sort=False).ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    members, cases = chunk["Member"].to_numpy(), chunk["Case"].to_numpy()
+    for rows in np.split(order, bounds):
+        i = rows[0]
+        sec = {v: float(col[i]) for v, col in section.items() if col[i] == col[i]}
+        yield {"member": str(members[i]), "case": str(cases[i]), "length": float(length[i]),
+               "supports": _supports([sup_a[i], sup_b[i]] if sup_a[i] == sup_a[i] and sup_b[i] == sup_b[i] else None,
+                                     length[i]),
+               "point": point[rows], "udl": udl[rows],
+               "section": sec if REQUIRED_SECTION <= sec.keys() else None}
+
+def _csv_jobs(path):
+    """Jobs from a CSV read CSV_CHUNK_ROWS rows at a time; the last member of a chunk waits for the next one."""
+    carry = None
+    for chunk in pd.read_csv(path, chunksize=CSV_CHUNK_ROWS):
+        chunk = chunk[chunk["Member"].notna()].copy()
+        chunk["Case"] = chunk["Case"].fillna("").astype(str) if "Case" in chunk else ""
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        if not len(chunk):
+            continue
+        last = (chunk["Member"] == chunk["Member"].iloc[-1]) & (chunk["Case"] == chunk["Case"].iloc[-1])
+        carry = chunk[last]
+        if not last.all():
+            yield from _csv_chunk_jobs(chunk[~last])
+    if carry is not None and len(carry):
+        yield from _csv_chunk_jobs(carry)
+
+def read_jobs(path):
+    """Normalised jobs of a .json, .jsonl or .csv job file, read lazily where the format allows."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        yield from _csv_jobs(path)
+    elif ext in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield from _json_jobs(json.loads(line))
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for job in data.get("jobs", []) if isinstance(data, dict) else data:
+            yield from _json_jobs(job)
+
+# ── Analysis ─────────────────────────────────────────────────────────────────
+def run_job(job, points=500):
+    """Analyse one normalised job; errors come back as an "Error" field instead of raising."""
+    out = {"Member": job["member"], "Case": job["case"]}
+    if "error" in job:
+        out["Error"] = job["error"]
+        return out
+    try:
+        point, udl = (job["point"], job["udl"]) if "point" in job else load_arrays(pd.DataFrame(job["loads"]))
+        beam = Beam(job["length"], supports=job["supports"])
+        for kind, rows in (("point", point), ("udl", udl)):
+            rows = rows[np.isfinite(rows).all(axis=1)]
+            beam.sync_loads(kind, np.arange(len(rows)), rows)
+        out.update(beam_summary(beam, points))
+        if job["section"]:
+            row = beam_member_result(beam, job["member"], **job["section"])
+            out.update({k: float(v) for k, v in row.items() if k not in out and k != "Member"})
+    except Exception as e:
+        out["Error"] = f"{type(e).__name__}: {e}"
+    return out
+
+def run_batch(jobs, processes=None, chunksize=64, points=500):
+    """
+    Results of `jobs` in input order, streamed: the pool is fed a window of
+    jobs at a time, so neither the input nor the results are held whole.
+    processes=1 runs in this process.
+    """
+    work = partial(run_job, points=points)
+    if processes == 1:
+        yield from map(work, jobs)
+        return
+    with Pool(processes) as pool:
+        window = chunksize * (processes or os.cpu_count() or 1) * 4
+        jobs = iter(jobs)
+        while batch := list(itertools.islice(jobs, window)):
+            yield from pool.imap(work, batch, chunksize)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("jobs", nargs="+", help="job files (.json, .jsonl or .csv)")
+    ap.add_argument("-o", "--output", default="-", help="JSON lines output (default stdout)")
+    ap.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--chunksize", type=int, default=64, help="jobs per worker task")
+    ap.add_argument("--points", type=int, default=500, help="grid points per beam for the extrema")
+    args = ap.parse_args(argv)
+
+    jobs = itertools.chain.from_iterable(read_jobs(p) for p in args.jobs)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    done = failed = 0
+    try:
+        for result in run_batch(jobs, args.processes, args.chunksize, args.points):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            done += 1
+            failed += "Error" in result
+            if done % args.chunksize == 0:
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{done} analyses, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
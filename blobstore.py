@@ -0,0 +1,122 @@
+# blobstore.py
+"""
+Content‑addressed storage for binary assets (home banner, documents).
+
+Database rows only hold a reference ``blob:<sha>``; the bytes live in the
+repo under ``blobs/<sha>`` and in a local cache directory keyed by the same
+hash.  The sha is git's own blob hash, so a blob is never uploaded twice
+and a cached copy never goes stale.
+"""
+import os
+import hashlib
+
+from pushpull import blob_exists, pull_blob, push_blob
+
+BLOB_CACHE_DIR = "uploads/blobs"
+PUBLISHED_FILE = os.path.join(BLOB_CACHE_DIR, "published.txt")   # shas GitHub is known to have
+BLOB_REF = "blob:"
+CHUNK_SIZE = 1 << 20
+
+def blob_sha(data):
+    """Git blob hash of `data` (what GitHub reports as the blob sha)."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def is_ref(value):
+    return isinstance(value, str) and value.startswith(BLOB_REF)
+
+def make_ref(sha):
+    return f"{BLOB_REF}{sha}"
+
+def ref_sha(value):
+    return value[len(BLOB_REF):] if is_ref(value) else None
+
+def cache_path(sha):
+    return os.path.join(BLOB_CACHE_DIR, sha)
+
+def _write_cache(sha, data):
+    path = cache_path(sha)
+    if not os.path.exists(path):
+        os.makedirs(BLOB_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return path
+
+def put(data):
+    """Store `data` in the local cache and return its sha (no network)."""
+    sha = blob_sha(data)
+    _write_cache(sha, data)
+    return sha
+
+def put_stream(stream):
+    """
+    put() for a seekable file‑like object, read CHUNK_SIZE bytes at a time:
+    one pass hashes it, and only a blob the cache doesn't have yet is
+    copied in (through a temp file, so a half‑written blob is never seen).
+    """
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(0)
+    digest = hashlib.sha1(b"blob %d\0" % size)
+    while chunk := stream.read(CHUNK_SIZE):
+        digest.update(chunk)
+    sha = digest.hexdigest()
+    path = cache_path(sha)
+    if not os.path.exists(path):
+        os.makedirs(BLOB_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}"
+        stream.seek(0)
+        with open(tmp, "wb") as f:
+            while chunk := stream.read(CHUNK_SIZE):
+                f.write(chunk)
+        os.replace(tmp, path)
+    return sha, size
+
+def get(sha):
+    """Return the blob bytes, fetching from GitHub only on a cache miss."""
+    path = cache_path(sha)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    data = pull_blob(sha)
+    if data is None or blob_sha(data) != sha:
+        return None
+    _write_cache(sha, data)
+    return data
+
+_PUBLISHED = None   # set of shas, loaded from PUBLISHED_FILE on first use
+
+def _published():
+    global _PUBLISHED
+    if _PUBLISHED is None:
+        try:
+            with open(PUBLISHED_FILE, encoding="utf-8") as f:
+                _PUBLISHED = {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            _PUBLISHED = set()
+    return _PUBLISHED
+
+def _mark_published(sha):
+    _published().add(sha)
+    os.makedirs(BLOB_CACHE_DIR, exist_ok=True)
+    with open(PUBLISHED_FILE, "a", encoding="utf-8") as f:
+        f.write(sha + "\n")
+
+def publish(sha):
+    """
+    Make sure GitHub has blob `sha`; returns an HTTP‑style status code.
+    Blobs already published are remembered, so they cost no request.
+    """
+    if sha in _published():
+        return 200
+    if blob_exists(sha):
+        _mark_published(sha)
+        return 200
+    path = cache_path(sha)
+    if not os.path.exists(path):
+        return 404
+    with open(path, "rb") as f:
+        code = push_blob(sha, f.read())
+    if code in (200, 201):
+        _mark_published(sha)
+    return code
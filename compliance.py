@@ -0,0 +1,158 @@
+# compliance.py
+import ast
+import numpy as np
+import pandas as pd
+
+# ── Result tables ────────────────────────────────────────────────────────────
+# Rule expressions use short names; each component maps them onto the
+# columns of its result table (one row per member / footing).
+MEMBER_VARIABLES = {
+    "L": "Length (m)", "Mu": "Mu (kN·m)", "Vu": "Vu (kN)", "delta": "Deflection (mm)",
+    "b": "b (mm)", "h": "h (mm)", "d": "d (mm)", "fc": "f'c (MPa)", "fy": "fy (MPa)",
+    "As": "As (mm²)", "Av": "Av (mm²)", "s": "s (mm)",
+}
+FOOTING_VARIABLES = {
+    "B": "Width B (m)", "Df": "Depth Df (m)", "q": "q_applied (kPa)", "qu": "q_ult (kPa)",
+    "FS": "FS", "s_i": "Immediate (mm)", "s_c": "Consolidation (mm)",
+}
+VARIABLES = {"Beam": MEMBER_VARIABLES, "Foundation": FOOTING_VARIABLES}
+MEMBER_COLUMNS = ["Member", *MEMBER_VARIABLES.values()]
+
+FUNCTIONS = {"sqrt": np.sqrt, "abs": np.abs, "minimum": np.minimum, "maximum": np.maximum,
+             "where": np.where, "clip": np.clip, "log10": np.log10, "pi": np.pi}
+
+def beam_member_result(beam, member, b, h, d, fc, fy, As, Av=0.0, s=0.0, n=501):
+    """
+    One member‑results row for an analysed Beam and its rectangular RC
+    section (mm, MPa): peak |M|, |V| and deflection, the latter with
+    Ec = 4700√f'c and the gross moment of inertia.
+    """
+    beam.analyze()
+    xs = np.linspace(0.0, beam.length, n)
+    EI = 4700.0 * np.sqrt(fc) * 1e3 * (b * h ** 3 / 12) * 1e-12   # kPa × m⁴
+    values = [beam.length, np.abs(beam.moment(xs)).max(), np.abs(beam.shear(xs)).max(),
+              np.abs(beam.deflection(xs, EI)).max() * 1000, b, h, d, fc, fy, As, Av, s]
+    return {"Member": member, **dict(zip(MEMBER_VARIABLES.values(), values))}
+
+# ── Rules ────────────────────────────────────────────────────────────────────
+# A rule passes where Demand ≤ Capacity; both are NumPy expressions over the
+# component's variables, so one evaluation covers every member.
+RULE_COLUMNS = ["Rule", "Regulation", "Component", "Risk Level", "Demand", "Capacity"]
+DEFAULT_RULES = pd.DataFrame([
+    ("Flexure: Mu ≤ φMn", "ACI 318", "Beam", "High",
+     "Mu", "0.9 * As * fy * (d - As * fy / (1.7 * fc * b)) / 1e6"),
+    ("Shear: Vu ≤ φ(Vc + Vs)", "ACI 318", "Beam", "High",
+     "Vu", "0.75 * (0.17 * sqrt(fc) * b * d + where(s > 0, Av * fy * d / s, 0)) / 1e3"),
+    ("Shear: section size", "ACI 318", "Beam", "High",
+     "Vu", "0.75 * 0.83 * sqrt(fc) * b * d / 1e3"),
+    ("Minimum flexural steel", "ACI 318", "Beam", "Medium",
+     "maximum(0.25 * sqrt(fc), 1.4) * b * d / fy", "As"),
+    ("Tension‑controlled: c/d ≤ 0.375", "ACI 318", "Beam", "Medium",
+     "As * fy / (0.85 * fc * b * clip(0.85 - 0.05 * (fc - 28) / 7, 0.65, 0.85) * d)", "0.375"),
+    ("Deflection ≤ L/240", "IBC", "Beam", "Medium",
+     "delta", "L * 1000 / 240"),
+    ("Bearing pressure ≤ q_ult / 3", "Local Code", "Foundation", "High",
+     "q", "qu / 3"),
+    ("Total settlement ≤ 25 mm", "Local Code", "Foundation", "Medium",
+     "s_i + s_c", "25"),
+], columns=RULE_COLUMNS)
+
+RESULT_COLUMNS = ["Member", "Rule", "Regulation", "Component", "Risk Level",
+                  "Demand", "Capacity", "Utilization", "Status"]
+
+_COMPILED = {}   # expression → (code, names)
+_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Load,
+          ast.Constant, ast.operator, ast.unaryop, ast.cmpop)
+
+def compile_rule(expr, component):
+    """
+    Parse and check a rule expression (arithmetic, comparisons and FUNCTIONS
+    over the component's variables and numeric constants, which are
+    evaluated as float64) — once per distinct expression.
+    """
+    key = str(expr).strip()
+    if key not in _COMPILED:
+        tree = ast.parse(key, mode="eval")
+        for node in ast.walk(tree):
+            if not isinstance(node, _NODES):
+                raise ValueError(f"'{key}': {type(node).__name__} is not allowed")
+            if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS):
+                raise ValueError(f"'{key}': only {', '.join(FUNCTIONS)} may be called")
+            if isinstance(node, ast.Constant):
+                # numbers only, and as floats: no string repetition, and no
+                # unbounded big‑int arithmetic such as 10**10**10
+                if type(node.value) not in (int, float):
+                    raise ValueError(f"'{key}': {node.value!r} is not a number")
+                try:
+                    node.value = float(node.value)
+                except OverflowError:
+                    raise ValueError(f"'{key}': a constant is too large") from None
+        names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)} - set(FUNCTIONS)
+        _COMPILED[key] = (compile(tree, "<rule>", "eval"), names)
+    code, names = _COMPILED[key]
+    unknown = names - set(VARIABLES.get(component, ()))
+    if unknown:
+        raise ValueError(f"'{key}': unknown variable(s) {', '.join(sorted(unknown))} for {component}")
+    return code
+
+def _labels(df):
+    if "Member" in df:
+        return df["Member"].astype(str).to_numpy()
+    return np.arange(1, len(df) + 1).astype(str).astype(object)
+
+def evaluate(rules, tables):
+    """
+    Check every rule against every row of its component's table
+    (`tables`: component → DataFrame).  Returns (results, errors): one row
+    per rule × member — Pass when demand ≤ capacity, Pending when an input
+    is missing — and (rule, message) for rules that don't compile or evaluate.
+    """
+    parts, errors = [], []
+    for component, group in rules.dropna(subset=["Demand", "Capacity"]).groupby("Component", sort=False):
+        df = tables.get(component)
+        if df is None or not len(df):
+            continue
+        n = len(df)
+        env = {**FUNCTIONS, **{v: (pd.to_numeric(df[c], errors="coerce").to_numpy(float) if c in df
+                                   else np.full(n, np.nan))
+                               for v, c in VARIABLES.get(component, {}).items()}}
+        demand, capacity, keep = [], [], []
+        for i, rule in enumerate(group.itertuples(index=False)):
+            try:
+                with np.errstate(all="ignore"):
+                    d = eval(compile_rule(rule.Demand, component), {"__builtins__": {}}, env)
+                    c = eval(compile_rule(rule.Capacity, component), {"__builtins__": {}}, env)
+                demand.append(np.broadcast_to(np.asarray(d, float), n))
+                capacity.append(np.broadcast_to(np.asarray(c, float), n))
+                keep.append(i)
+            except (SyntaxError, ValueError, TypeError, ArithmeticError) as e:
+                errors.append((rule.Rule, str(e)))
+        if not keep:
+            continue
+        demand, capacity = np.concatenate(demand), np.concatenate(capacity)
+        with np.errstate(all="ignore"):
+            util = np.where(capacity > 0, demand / capacity, np.where(demand <= 0, 0.0, np.inf))
+        missing = np.isnan(demand) | np.isnan(capacity)
+        util[missing] = np.nan
+        meta = group.iloc[keep]
+        parts.append(pd.DataFrame({
+            "Member": np.tile(_labels(df), len(keep)),
+            **{c: np.repeat(meta[c].to_numpy(), n) for c in ["Rule", "Regulation", "Component", "Risk Level"]},
+            "Demand": demand, "Capacity": capacity, "Utilization": util,
+            "Status": np.select([missing, util <= 1], ["Pending", "Pass"], "Fail"),
+        }))
+    results = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=RESULT_COLUMNS)
+    return results, errors
+
+def compliance_rows(results, check_date):
+    """Rule‑engine results in the Standards Verification log's columns."""
+    return pd.DataFrame({
+        "Requirement": results["Rule"],
+        "Regulation": results["Regulation"],
+        "Project Component": results["Component"] + " " + results["Member"],
+        "Risk Level": results["Risk Level"],
+        "Date": check_date,
+        "Status": results["Status"],
+        "Utilization": results["Utilization"].round(3),
+        "Source": "Rule engine",
+    })
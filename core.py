@@ -1,13 +1,21 @@
 import numpy as np
+import pandas as pd
 
 class Beam:
+    """
+    Simply supported beam.  Point loads (pos, mag) and UDLs (start, end,
+    intensity) live in id‑tagged NumPy arrays, so a whole table of loads can
+    be synced as a diff (`sync_loads`) and the diagrams are evaluated for all
+    x at once from sorted cumulative sums.
+    """
+    _WIDTH = {"point": 2, "udl": 3}
+
     def __init__(self, length, supports=None, loads=None):
         self.length = length
         self.supports = []
-        self.point_loads = []
-        self.dist_loads = []
         self.reactions = []
-        self._point_loads = []
+        self._loads = {k: (np.empty(0, np.int64), np.empty((0, w))) for k, w in self._WIDTH.items()}
+        self._solved = None
         if supports:
             for s in supports:
                 self.add_support(*s)
@@ -18,50 +26,276 @@ class Beam:
                 else:
                     self.add_distributed_load(l["start"], l["end"], l["intensity"])
 
+    @property
+    def point_loads(self):
+        return [tuple(r) for r in self._loads["point"][1].tolist()]
+
+    @property
+    def dist_loads(self):
+        return [tuple(r) for r in self._loads["udl"][1].tolist()]
+
+    def load_array(self, kind):
+        """(ids, rows) of the 'point' or 'udl' loads."""
+        return self._loads[kind]
+
+    def _changed(self):
+        self._solved = None
+        self.reactions = []
+
+    def _add(self, kind, row):
+        ids, rows = self._loads[kind]
+        new_id = ids.max() + 1 if ids.size else 0
+        self._loads[kind] = (np.append(ids, new_id), np.vstack([rows, row]))
+        self._changed()
+
     def add_support(self, pos, sup_type="pin"):
         self.supports.append((pos, sup_type))
+        self._changed()
 
     def add_point_load(self, pos, mag):
-        self.point_loads.append((pos, mag))
+        self._add("point", [pos, mag])
 
     def add_distributed_load(self, start, end, intensity):
-        self.dist_loads.append((start, end, intensity))
+        self._add("udl", [start, end, intensity])
 
-    def analyze(self):
-        # Convert UDL → eq. point loads
-        eq = []
-        for s,e,w in self.dist_loads:
-            L = e - s
-            eq.append((s + L/2, w * L))
-        loads = self.point_loads + eq
+    def sync_loads(self, kind, ids, rows):
+        """
+        Make the `kind` loads equal to `rows` (keyed by `ids`), touching only
+        the ones that differ.  Returns (added, removed, changed) counts; when
+        all are zero the previous analysis stays valid.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        rows = np.asarray(rows, dtype=float).reshape(len(ids), self._WIDTH[kind])
+        old_ids, old_rows = self._loads[kind]
 
+        keep = np.isin(old_ids, ids)
+        removed = int((~keep).sum())
+        old_ids, old_rows = old_ids[keep], old_rows[keep].copy()
+
+        order = np.argsort(ids)
+        match = order[np.searchsorted(ids, old_ids, sorter=order)]
+        diff = np.any(old_rows != rows[match], axis=1)
+        old_rows[diff] = rows[match][diff]
+        changed = int(diff.sum())
+
+        new = ~np.isin(ids, old_ids)
+        added = int(new.sum())
+        if added or removed or changed:
+            self._loads[kind] = (np.concatenate([old_ids, ids[new]]), np.vstack([old_rows, rows[new]]))
+            self._changed()
+        return added, removed, changed
+
+    def analyze(self):
+        pts = self._loads["point"][1]
+        udl = self._loads["udl"][1]
         if len(self.supports) != 2:
             raise ValueError("Need exactly 2 supports.")
         a, _ = self.supports[0]
         b, _ = self.supports[1]
 
-        # reactions for simply supported
-        M_A = sum(m * (x - a) for x,m in loads)
-        W   = sum(m for _,m in loads)
+        # reactions for simply supported, each UDL taken as its resultant
+        L = udl[:, 1] - udl[:, 0]
+        pos = np.concatenate([pts[:, 0], udl[:, 0] + L / 2])
+        mag = np.concatenate([pts[:, 1], udl[:, 2] * L])
+        M_A = float((mag * (pos - a)).sum())
+        W   = float(mag.sum())
         Rb  = M_A / (b - a)
         Ra  = W - Rb
         self.reactions = [Ra, Rb]
-        self._point_loads = loads
+
+        # point loads sorted by position with running Σm and Σm·x, so the
+        # load terms left of any x are two lookups after a binary search
+        order = np.argsort(pts[:, 0], kind="stable")
+        P, m = pts[order, 0], pts[order, 1]
+        # each UDL is a ramp of +w from its start and −w from its end; with
+        # running Σw, Σw·p and Σw·p² the distributed terms are lookups too
+        R = np.concatenate([udl[:, 0], udl[:, 1]])
+        w = np.concatenate([udl[:, 2], -udl[:, 2]])
+        order = np.argsort(R, kind="stable")
+        R, w = R[order], w[order]
+        self._solved = (a, Ra, P,
+                        np.concatenate([[0.0], np.cumsum(m)]),
+                        np.concatenate([[0.0], np.cumsum(m * P)]),
+                        R, *(np.concatenate([[0.0], np.cumsum(w * R ** i)]) for i in range(3)))
+
+    def shear(self, xs):
+        """Shear force at every x in `xs` (zeros until analyze() is run)."""
+        xs = np.asarray(xs, dtype=float)
+        if self._solved is None:
+            return np.zeros_like(xs)
+        a, Ra, P, cm, _, R, cw, cwp, _ = self._solved
+        k = np.searchsorted(P, xs, side="right")
+        j = np.searchsorted(R, xs, side="right")
+        return np.where(xs >= a, Ra, 0.0) - cm[k] - (xs * cw[j] - cwp[j])
+
+    def moment(self, xs):
+        """Bending moment at every x in `xs` (zeros until analyze() is run)."""
+        xs = np.asarray(xs, dtype=float)
+        if self._solved is None:
+            return np.zeros_like(xs)
+        a, Ra, P, cm, cmx, R, cw, cwp, cwp2 = self._solved
+        k = np.searchsorted(P, xs, side="right")
+        j = np.searchsorted(R, xs, side="right")
+        return (np.where(xs >= a, Ra * (xs - a), 0.0) - (xs * cm[k] - cmx[k])
+                - (xs ** 2 * cw[j] - 2 * xs * cwp[j] + cwp2[j]) / 2)
+
+    def deflection(self, xs, EI, n=2001):
+        """
+        Deflection (m, downward negative) at every x in `xs` for flexural
+        stiffness EI (kN·m²): the moment diagram integrated twice on an
+        n‑point grid, then corrected so both supports stay at zero.
+        """
+        xs = np.asarray(xs, dtype=float)
+        if self._solved is None:
+            return np.zeros_like(xs)
+        g = np.linspace(0.0, self.length, n)
+        kappa = -self.moment(g) / EI
+        dx = np.diff(g)
+        slope = np.concatenate([[0.0], np.cumsum((kappa[1:] + kappa[:-1]) / 2 * dx)])
+        y = np.concatenate([[0.0], np.cumsum((slope[1:] + slope[:-1]) / 2 * dx)])
+        (a, _), (b, _) = self.supports
+        ya, yb = np.interp([a, b], g, y)
+        y = y - (ya + (yb - ya) * (g - a) / (b - a))
+        return np.interp(xs, g, y)
 
     def shear_at(self, x):
-        V = 0.0
-        if self.reactions and x >= self.supports[0][0]:
-            V += self.reactions[0]
-        for px, pm in self._point_loads:
-            if px <= x:
-                V -= pm
-        return V
+        return float(self.shear(x))
 
     def moment_at(self, x):
-        M = 0.0
-        if self.reactions and x >= self.supports[0][0]:
-            M += self.reactions[0] * (x - self.supports[0][0])
-        for px, pm in self._point_loads:
-            if px <= x:
-                M -= pm * (x - px)
-        return M
+        return float(self.moment(x))
+
+def beam_summary(beam, n=500):
+    """
+    Analyse `beam` and return its critical values on an n‑point grid:
+    reactions, peak shear and moment (signed) with their positions, and the
+    first shear zero‑crossing (where |M| peaks; the |M| peak's x if V never
+    changes sign).
+    """
+    beam.analyze()
+    xs = np.linspace(0, beam.length, n)
+    Vs = beam.shear(xs)
+    Ms = beam.moment(xs)
+    idx_v = np.argmax(np.abs(Vs))
+    idx_m = np.argmax(np.abs(Ms))
+    zero_idxs = np.where(Vs[:-1] * Vs[1:] < 0)[0]
+    if zero_idxs.size > 0:
+        i0 = zero_idxs[0]
+        x0 = xs[i0] - Vs[i0] * (xs[i0 + 1] - xs[i0]) / (Vs[i0 + 1] - Vs[i0])
+    else:
+        x0 = xs[idx_m]
+    return {
+        "Reactions (kN)": [float(r) for r in beam.reactions],
+        "Max Shear (kN)": float(Vs[idx_v]), "x Max Shear (m)": float(xs[idx_v]),
+        "Shear Zero (m)": float(x0),
+        "Max Moment (kN·m)": float(Ms[idx_m]), "x Max Moment (m)": float(xs[idx_m]),
+    }
+
+
+# ── Structural load schedules ────────────────────────────────────────────────
+LOAD_COLUMNS = ["Load Type", "Load Value (kN)", "Distance (m)", "Load Factor", "Moment (kN-m)"]
+LOAD_TYPES   = ["Dead Load", "Live Load", "Wind Load", "Seismic Load", "Snow Load"]
+
+def _match_column(df, name):
+    """Find `name` in df, ignoring case and a trailing '(unit)'."""
+    key = name.split(" (")[0].strip().lower()
+    for c in df.columns:
+        if str(c).split(" (")[0].strip().lower() == key:
+            return df[c]
+    return None
+
+def compute_load_table(df):
+    """
+    Validate a load schedule and compute its moments in one vectorised pass.
+
+    Columns are matched by name (units optional); a missing Load Factor
+    defaults to 1.0.  Returns (loads, rejected): `loads` has LOAD_COLUMNS
+    with Moment = Load Value × Distance × Load Factor, `rejected` holds the
+    input rows with a non‑numeric or negative value and a Reason column.
+    """
+    n = len(df)
+    load_type = _match_column(df, "Load Type")
+    load_type = (load_type.astype("string").str.strip() if load_type is not None
+                 else pd.Series(["Dead Load"] * n, index=df.index, dtype="string"))
+    num = {}
+    for col, default in (("Load Value (kN)", np.nan), ("Distance (m)", np.nan), ("Load Factor", 1.0)):
+        src = _match_column(df, col)
+        num[col] = (pd.to_numeric(src, errors="coerce").to_numpy(dtype=float) if src is not None
+                    else np.full(n, default))
+
+    V, x, f = num["Load Value (kN)"], num["Distance (m)"], num["Load Factor"]
+    finite = np.isfinite(V) & np.isfinite(x) & np.isfinite(f)
+    negative = finite & ((V < 0) | (x < 0) | (f < 0))
+    untyped = load_type.isna().to_numpy() | (load_type.fillna("") == "").to_numpy()
+    ok = finite & ~negative & ~untyped
+
+    loads = pd.DataFrame({
+        "Load Type": load_type.to_numpy(dtype=object)[ok],
+        "Load Value (kN)": V[ok],
+        "Distance (m)": x[ok],
+        "Load Factor": f[ok],
+        "Moment (kN-m)": V[ok] * x[ok] * f[ok],
+    }, columns=LOAD_COLUMNS)
+
+    reason = np.select([untyped, ~finite, negative], ["missing load type", "non‑numeric value", "negative value"], "")
+    rejected = df.loc[~ok].copy()
+    rejected["Reason"] = reason[~ok]
+    return loads, rejected
+
+
+# ── Beam load tables ─────────────────────────────────────────────────────────
+POINT_LOAD_COLUMNS = ["Position (m)", "Magnitude (kN)", "Direction"]
+UDL_COLUMNS        = ["Start (m)", "End (m)", "Intensity (kN/m)", "Direction"]
+
+def beam_load_rows(df, kind):
+    """
+    (ids, rows) for Beam.sync_loads from a point‑load or UDL table: ids are
+    the DataFrame index, magnitudes are signed (Downward → negative) and
+    rows that are still incomplete are skipped.
+    """
+    cols = POINT_LOAD_COLUMNS if kind == "point" else UDL_COLUMNS
+    values = np.column_stack([pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+                              for c in cols[:-1]]) if len(df) else np.empty((0, len(cols) - 1))
+    sign = np.where(df["Direction"].astype(str).to_numpy() == "Upward", 1.0, -1.0) if len(df) else np.empty(0)
+    values[:, -1] *= sign
+    ok = np.isfinite(values).all(axis=1)
+    return df.index.to_numpy(dtype=np.int64)[ok], values[ok]
+
+def load_arrays(df):
+    """
+    Signed (point, udl) load arrays for every row of a mixed load table,
+    columns matched as in split_beam_loads: point rows are (position,
+    magnitude), UDL rows (start, end, intensity), negative unless the
+    Direction is Upward.  A row that isn't that kind of load is NaN.
+    """
+    n = len(df)
+    direction = _match_column(df, "Direction")
+    sign = (np.where(direction.astype(str).str.strip().str.lower().to_numpy() == "upward", 1.0, -1.0)
+            if direction is not None else np.full(n, -1.0))
+    out = []
+    for cols in (POINT_LOAD_COLUMNS[:-1], UDL_COLUMNS[:-1]):
+        values = np.full((n, len(cols)), np.nan)
+        for j, name in enumerate(cols):
+            src = _match_column(df, name)
+            if src is not None:
+                values[:, j] = pd.to_numeric(src, errors="coerce").to_numpy(dtype=float)
+        values[:, -1] *= sign
+        out.append(values)
+    return tuple(out)
+
+def split_beam_loads(df):
+    """
+    Split an imported load file into (point loads, UDLs) tables.  Rows with
+    Start/End/Intensity are UDLs, rows with Position/Magnitude point loads;
+    Direction defaults to Downward.
+    """
+    def pick(names):
+        cols = {n: _match_column(df, n) for n in names}
+        if any(c is None for c in cols.values()):
+            return pd.DataFrame(columns=names + ["Direction"])
+        out = pd.DataFrame({n: pd.to_numeric(c, errors="coerce") for n, c in cols.items()})
+        direction = _match_column(df, "Direction")
+        out["Direction"] = (direction.astype(str).str.strip().str.capitalize()
+                            .where(lambda d: d.isin(["Upward", "Downward"]), "Downward")
+                            if direction is not None else "Downward")
+        return out[out[names].notna().all(axis=1)].reset_index(drop=True)
+    return pick(POINT_LOAD_COLUMNS[:-1]), pick(UDL_COLUMNS[:-1])
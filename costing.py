@@ -0,0 +1,157 @@
+# costing.py
+"""
+Price catalog, exchange rates and bill‑of‑quantities roll‑ups.
+
+The catalog and the rate table are small CSV files under uploads/, read
+again only when they change on disk.  CostRollup keeps the BOQ's running
+totals per material, category and currency in native currency, so a new
+or edited line costs O(1) and a converted project total is one pass over
+the (handful of) currencies.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+RATES_FILE = "uploads/fx_rates.csv"
+CATALOG_FILE = "uploads/price_catalog.csv"
+
+RATE_COLUMNS = ["Currency", "Per USD"]
+DEFAULT_RATES = pd.DataFrame([
+    ("USD ($)", 1.0), ("IQD (Iraqi Dinar)", 1310.0), ("EUR (€)", 0.92), ("GBP (£)", 0.79),
+], columns=RATE_COLUMNS)
+
+CATALOG_COLUMNS = ["Material", "Unit", "Category", "Unit Price", "Currency"]
+# typical unit prices to start from — edit them to local rates
+DEFAULT_CATALOG = pd.DataFrame([
+    ("Concrete", "m³", "Concrete", 110.0, "USD ($)"),
+    ("Steel", "kg", "Metals", 1.2, "USD ($)"),
+    ("Rebar", "kg", "Metals", 0.9, "USD ($)"),
+    ("Bricks", "pieces", "Masonry", 0.12, "USD ($)"),
+    ("Cement", "bags", "Concrete", 7.0, "USD ($)"),
+    ("Gravel", "tonnes", "Aggregates", 18.0, "USD ($)"),
+    ("Sand", "tonnes", "Aggregates", 15.0, "USD ($)"),
+    ("Asphalt", "tonnes", "Paving", 85.0, "USD ($)"),
+    ("Wood", "m³", "Wood", 450.0, "USD ($)"),
+    ("Plywood", "sheets", "Wood", 28.0, "USD ($)"),
+    ("Glass", "m²", "Openings", 45.0, "USD ($)"),
+    ("Tiles", "m²", "Finishes", 20.0, "USD ($)"),
+    ("Paint", "liters", "Finishes", 6.0, "USD ($)"),
+    ("Pipes", "meters", "MEP", 12.0, "USD ($)"),
+], columns=CATALOG_COLUMNS)
+
+# ── Local tables ─────────────────────────────────────────────────────────────
+_FILES = {}   # path → (mtime, parsed)
+
+def _load(path, default, parse):
+    """parse(DataFrame) of the CSV at `path` (seeded from `default`), re‑read only when it changes."""
+    if not os.path.exists(path):
+        save_table(path, default)
+    mtime = os.path.getmtime(path)
+    cached = _FILES.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _FILES[path] = (mtime, parse(pd.read_csv(path, keep_default_na=False)))
+    return cached[1]
+
+def save_table(path, df):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_csv(path, index=False)
+
+def rates():
+    """Currency → units per USD."""
+    return _load(RATES_FILE, DEFAULT_RATES, lambda df: dict(zip(df["Currency"], pd.to_numeric(df["Per USD"], errors="coerce"))))
+
+class PriceCatalog:
+    """Catalog rows indexed by (material, unit); material names match case‑insensitively."""
+
+    def __init__(self, df):
+        self.frame = df.reindex(columns=CATALOG_COLUMNS)
+        self.frame["Unit Price"] = pd.to_numeric(self.frame["Unit Price"], errors="coerce")
+        self._index = {(str(m).strip().lower(), str(u)): row
+                       for m, u, row in zip(self.frame["Material"], self.frame["Unit"], self.frame.to_dict("records"))}
+        self._categories = {str(m).strip().lower(): c for m, c in zip(self.frame["Material"], self.frame["Category"]) if c}
+
+    def get(self, material, unit):
+        return self._index.get((str(material).strip().lower(), str(unit)))
+
+    def category(self, material):
+        return self._categories.get(str(material).strip().lower(), "Other")
+
+def catalog():
+    return _load(CATALOG_FILE, DEFAULT_CATALOG, PriceCatalog)
+
+def convert(amount, currency, to, fx):
+    """`amount` in `currency` expressed in `to` (NaN when either rate is unknown)."""
+    a, b = fx.get(currency), fx.get(to)
+    if not a or not b or a != a or b != b:
+        return np.nan
+    return amount / a * b
+
+# ── Roll‑ups ─────────────────────────────────────────────────────────────────
+ROLLUP_DIMENSIONS = ["Material", "Category", "Currency"]
+
+class CostRollup:
+    """
+    Running BOQ totals: for each material and category, Total Cost and line
+    count per native currency.  `catch_up` folds in only the lines appended
+    since the last call; `add` with sign=-1 takes an edited line's old
+    values back out.
+    """
+
+    def __init__(self):
+        self.totals = {d: {} for d in ROLLUP_DIMENSIONS}   # dimension → key → currency → [total, lines]
+        self.seen = 0
+
+    def add(self, material, category, currency, amount, sign=1):
+        amount = 0.0 if amount != amount else float(amount)
+        for dim, key in zip(ROLLUP_DIMENSIONS, (material, category, currency)):
+            cell = self.totals[dim].setdefault(key, {}).setdefault(currency, [0.0, 0])
+            cell[0] += sign * amount
+            cell[1] += sign
+
+    def catch_up(self, costs, category_of):
+        """Fold lines seen … len(costs)‑1 of an AppendTable in."""
+        stop = len(costs)
+        if stop <= self.seen:
+            return
+        cols = {c: costs.column(c)[self.seen:stop] for c in ("Material", "Currency", "Total Cost", "Category")}
+        for material, currency, amount, category in zip(*cols.values()):
+            self.add(material, category if isinstance(category, str) and category else category_of(material),
+                     currency, amount)
+        self.seen = stop
+
+    def update(self, costs, i, row, category_of):
+        """Edit line `i` of `costs` in place, moving its amount between roll‑ups — O(1)."""
+        def fold(sign):
+            category = costs.column("Category")[i]
+            self.add(costs.column("Material")[i],
+                     category if isinstance(category, str) and category else category_of(costs.column("Material")[i]),
+                     costs.column("Currency")[i], costs.column("Total Cost")[i], sign)
+        fold(-1)
+        costs.update(i, row)
+        fold(1)
+
+    def table(self, dim, to, fx):
+        """Lines and totals per `dim` key converted to `to`; unconvertible currencies are listed."""
+        rows = []
+        for key, cells in self.totals[dim].items():
+            lines = sum(n for _, n in cells.values())
+            if not lines:
+                continue
+            converted = {c: convert(t, c, to, fx) for c, (t, n) in cells.items() if n}
+            rows.append({dim: key, "Lines": lines,
+                         f"Total ({to})": sum(v for v in converted.values() if v == v),
+                         "Unconverted": ", ".join(f"{cells[c][0]:,.2f} {c}" for c, v in converted.items() if v != v)})
+        return pd.DataFrame(rows, columns=[dim, "Lines", f"Total ({to})", "Unconverted"])
+
+    def project_total(self, to, fx):
+        """(total in `to`, {currency: native total} that has no rate)."""
+        total, missing = 0.0, {}
+        for currency, cells in self.totals["Currency"].items():
+            t, n = cells[currency]
+            value = convert(t, currency, to, fx)
+            if value == value:
+                total += value
+            elif n:
+                missing[currency] = t
+        return total, missing
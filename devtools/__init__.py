@@ -0,0 +1 @@
+# This file ensures 'devtools/' is recognized as a package
@@ -0,0 +1,222 @@
+# devtools/github_stub.py
+"""
+Local stand‑in for the slice of the GitHub REST API that pushpull.py uses:
+
+    GET/PUT/DELETE /repos/<owner>/<repo>/contents/<path>   (files and dirs)
+    GET/HEAD       /repos/<owner>/<repo>/git/blobs/<sha>
+
+Files are kept in memory with git blob shas, so sha preconditions behave
+like GitHub's: a PUT without `sha` onto an existing file is a 422, a PUT or
+DELETE with a stale `sha` is a 409, and GETs honour If-None-Match with a
+304.  Every response can be delayed by a fixed latency plus random jitter.
+
+Run standalone:   python -m devtools.github_stub --port 8765 --latency 50
+then start the app with GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_TOKEN=x
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+def git_sha(data):
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    # ── plumbing ────────────────────────────────────────────────────────────
+    def _route(self):
+        parts = unquote(urlsplit(self.path).path).strip("/").split("/")
+        if parts[:1] == ["_stats"]:
+            return "stats", None
+        if len(parts) >= 4 and parts[0] == "repos" and parts[3] == "contents":
+            return "contents", "/".join(parts[4:])
+        if len(parts) == 6 and parts[0] == "repos" and parts[3:5] == ["git", "blobs"]:
+            return "blobs", parts[5]
+        return None, None
+
+    def _body(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(n) or b"{}") if n else {}
+
+    def _send(self, code, payload=None, etag=None, raw=None, head=False):
+        stub = self.server.stub
+        stub._record(self.command, self._kind, code)
+        if raw is not None:
+            body, ctype = raw, "application/octet-stream"
+        elif payload is not None:
+            body, ctype = json.dumps(payload).encode(), "application/json; charset=utf-8"
+        else:
+            body, ctype = b"", "application/json; charset=utf-8"
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if body and not head:
+            self.wfile.write(body)
+
+    def _dispatch(self):
+        stub = self.server.stub
+        stub._delay()
+        self._kind, arg = self._route()
+        if self._kind is None:
+            return self._send(404, {"message": "Not Found"})
+        handler = getattr(self, f"_{self.command.lower()}_{self._kind}", None)
+        if handler is None:
+            return self._send(405, {"message": "Method Not Allowed"})
+        handler(arg)
+
+    do_GET = do_PUT = do_DELETE = do_HEAD = _dispatch
+
+    # ── endpoints ───────────────────────────────────────────────────────────
+    def _get_stats(self, _):
+        self._send(200, self.server.stub.stats())
+
+    def _get_contents(self, path):
+        stub = self.server.stub
+        with stub.lock:
+            if path in stub.files:
+                data = stub.files[path]
+                sha = git_sha(data)
+                payload = {"type": "file", "name": path.rsplit("/", 1)[-1], "path": path,
+                           "sha": sha, "size": len(data), "encoding": "base64",
+                           "content": base64.encodebytes(data).decode()}
+                etag = f'"{sha}"'
+            else:
+                prefix = f"{path}/" if path else ""
+                names = {}
+                for p, data in stub.files.items():
+                    if p.startswith(prefix):
+                        head, _, rest = p[len(prefix):].partition("/")
+                        names[head] = ({"type": "dir", "sha": ""} if rest else
+                                       {"type": "file", "sha": git_sha(data), "size": len(data)})
+                if not names:
+                    return self._send(404, {"message": "Not Found"})
+                payload = [{"name": n, "path": prefix + n, **e} for n, e in sorted(names.items())]
+                etag = '"%s"' % hashlib.sha1(json.dumps(payload).encode()).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, etag=etag)
+        self._send(200, payload, etag=etag)
+
+    def _put_contents(self, path):
+        stub = self.server.stub
+        body = self._body()
+        data = base64.b64decode(body.get("content", ""))
+        with stub.lock:
+            current = stub.files.get(path)
+            if current is not None:
+                if not body.get("sha"):
+                    return self._send(422, {"message": 'Invalid request.\n\n"sha" wasn\'t supplied.'})
+                if body["sha"] != git_sha(current):
+                    return self._send(409, {"message": f"{path} does not match {body['sha']}"})
+            stub.files[path] = data
+        sha = git_sha(data)
+        self._send(201 if current is None else 200,
+                   {"content": {"name": path.rsplit("/", 1)[-1], "path": path, "sha": sha, "size": len(data)},
+                    "commit": {"message": body.get("message", "")}})
+
+    def _delete_contents(self, path):
+        stub = self.server.stub
+        body = self._body()
+        with stub.lock:
+            current = stub.files.get(path)
+            if current is None:
+                return self._send(404, {"message": "Not Found"})
+            if body.get("sha") != git_sha(current):
+                return self._send(409, {"message": f"{path} does not match {body.get('sha')}"})
+            del stub.files[path]
+        self._send(200, {"content": None, "commit": {"message": body.get("message", "")}})
+
+    def _get_blobs(self, sha, head=False):
+        stub = self.server.stub
+        with stub.lock:
+            data = next((d for d in stub.files.values() if git_sha(d) == sha), None)
+        if data is None:
+            return self._send(404, {"message": "Not Found"}, head=head)
+        if "raw" in self.headers.get("Accept", ""):
+            return self._send(200, raw=data, etag=f'"{sha}"', head=head)
+        self._send(200, {"sha": sha, "size": len(data), "encoding": "base64",
+                         "content": base64.encodebytes(data).decode()}, etag=f'"{sha}"', head=head)
+
+    def _head_blobs(self, sha):
+        self._get_blobs(sha, head=True)
+
+class GitHubStub:
+    """In‑process server; `files` maps repo paths to bytes (or str)."""
+
+    def __init__(self, files=None, latency=0.0, jitter=0.0, host="127.0.0.1", port=0):
+        self.files = {p: d.encode() if isinstance(d, str) else d for p, d in (files or {}).items()}
+        self.latency, self.jitter = latency, jitter
+        self.lock = threading.RLock()   # handlers may reply while holding it
+        self._counts = Counter()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _delay(self):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+    def _record(self, method, kind, code):
+        with self.lock:
+            self._counts[(method, kind, code)] += 1
+
+    def stats(self):
+        with self.lock:
+            return [{"method": m, "endpoint": k, "status": c, "count": n}
+                    for (m, k, c), n in sorted(self._counts.items(), key=str)]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="fixed delay per request (ms)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra random delay up to this (ms)")
+    ap.add_argument("--seed", nargs="*", default=["database.csv", "users.csv"],
+                    help="local files to preload at the same repo path")
+    args = ap.parse_args(argv)
+    files = {}
+    for path in args.seed:
+        try:
+            with open(path, "rb") as f:
+                files[path] = f.read()
+        except OSError:
+            pass
+    stub = GitHubStub(files, args.latency / 1000, args.jitter / 1000, args.host, args.port)
+    print(f"GitHub stand‑in on {stub.url} ({len(files)} files)")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# devtools/loadtest.py
+"""
+Load‑test harness for pushpull.py against the local GitHub stand‑in.
+
+Each simulated session replays what app.main_app does per rerun — pull
+users, pull changed DB shards, sync the banner — and on a fraction of
+reruns clicks one of the Save buttons.  Sessions run concurrently in
+threads sharing one working directory, like sessions of a Streamlit
+server.  The report gives request counts, latency percentiles per
+request type, and the rate of 409/422 conflicts.
+
+    python -m devtools.loadtest --sessions 20 --reruns 50 --save-prob 0.2 --latency 40
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+from devtools.github_stub import GitHubStub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (Tab, SubTab) tables saved by app.py's "Save" buttons, with a sample row
+SAVES = [
+    (("Design and Analysis", "Structural Analysis"),
+     {"Load Type": "Dead Load", "Load Value (kN)": 10.0, "Distance (m)": 2.0, "Load Factor": 1.2, "Moment (kN-m)": 24.0}),
+    (("Project Management", "Scheduling"),
+     {"Task": "Pour slab", "Description": "", "Priority": "High", "Start Date": "2025-01-01",
+      "End Date": "2025-01-05", "Status": "Not Started", "Created At": "2025-01-01 08:00:00"}),
+    (("Tools and Utilities", "Cost Estimation"),
+     {"Material": "Concrete", "Unit Price": 95.0, "Quantity": 12, "Unit": "m³", "Total Cost": 1140.0,
+      "Currency": "USD ($)", "Notes": ""}),
+    (("Collaboration and Documentation", "Documents"),
+     {"File Name": "spec.pdf", "File Path": "uploads/documents/spec.pdf", "Blob": ""}),
+]
+
+class Recorder:
+    """Wraps the `requests` verbs pushpull uses and times every call."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)   # "GET contents" → [seconds]
+        self.status = Counter()            # (method, status) → n
+
+    @staticmethod
+    def _kind(url):
+        return "blobs" if "/git/blobs/" in url else "contents"
+
+    def wrap(self, method, fn):
+        def timed(url, *args, **kwargs):
+            t0 = time.perf_counter()
+            resp = fn(url, *args, **kwargs)
+            dt = time.perf_counter() - t0
+            with self.lock:
+                self.samples[f"{method} {self._kind(url)}"].append(dt)
+                self.status[(method, resp.status_code)] += 1
+            return resp
+        return timed
+
+def percentile(sorted_xs, q):
+    if not sorted_xs:
+        return 0.0
+    i = min(len(sorted_xs) - 1, max(0, round(q / 100 * (len(sorted_xs) - 1))))
+    return sorted_xs[i]
+
+def run_session(pushpull, reruns, save_prob, think, rng, outcomes):
+    import pandas as pd
+    for _ in range(reruns):
+        pushpull.pull_users()                          # app.run → pull_users_init
+        pushpull.pull_shards()                         # main_app → pull_shards
+        pushpull.read_shard("HomeBanner")              # sync_home_banner_after_pull
+        if rng.random() < save_prob:
+            (tab, subtab), row = rng.choice(SAVES)
+            df = pushpull.read_table(tab, subtab)
+            df = pd.concat([df, pd.DataFrame([row])], ignore_index=True) if df is not None else pd.DataFrame([row])
+            outcomes[pushpull.push_table(tab, subtab, df)] += 1
+        if think:
+            time.sleep(rng.uniform(0, 2 * think))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sessions", type=int, default=10)
+    ap.add_argument("--reruns", type=int, default=20, help="reruns per session")
+    ap.add_argument("--save-prob", type=float, default=0.1, help="chance a rerun is a Save click")
+    ap.add_argument("--think", type=float, default=0.0, help="mean pause between reruns (ms)")
+    ap.add_argument("--latency", type=float, default=0.0, help="stand‑in latency per request (ms)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="stand‑in random extra latency (ms)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    files = {}
+    for name in ("database.csv", "users.csv"):
+        with open(os.path.join(ROOT, name), "rb") as f:
+            files[name] = f.read()
+    stub = GitHubStub(files, args.latency / 1000, args.jitter / 1000).start()
+
+    # pushpull reads these at import time and writes its cache files to cwd
+    os.environ["GITHUB_API_URL"] = stub.url
+    os.environ.setdefault("GITHUB_TOKEN", "loadtest")
+    os.chdir(tempfile.mkdtemp(prefix="pushpull-loadtest-"))
+    sys.path.insert(0, ROOT)
+    import requests
+    rec = Recorder()
+    for verb in ("get", "put", "head", "delete"):
+        setattr(requests, verb, rec.wrap(verb.upper(), getattr(requests, verb)))
+    import pushpull
+
+    pushpull.pull_shards()  # one‑time migration happens before the clock starts
+    rec.samples.clear(); rec.status.clear()
+
+    outcomes = Counter()
+    threads = [threading.Thread(target=run_session,
+                                args=(pushpull, args.reruns, args.save_prob, args.think / 1000,
+                                      random.Random(args.seed + i), outcomes))
+               for i in range(args.sessions)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - t0
+    stub.stop()
+
+    total = sum(len(v) for v in rec.samples.values())
+    puts = sum(n for (m, _), n in rec.status.items() if m in ("PUT", "DELETE"))
+    conflicts = sum(n for (m, c), n in rec.status.items() if m in ("PUT", "DELETE") and c in (409, 422))
+    saves = sum(outcomes.values())
+    ok = outcomes[200] + outcomes[201]
+
+    print(f"{args.sessions} sessions × {args.reruns} reruns, save‑prob {args.save_prob}, "
+          f"latency {args.latency:.0f}+{args.jitter:.0f} ms — {wall:.2f} s wall")
+    print(f"requests: {total} ({total / wall:.0f}/s, {total / (args.sessions * args.reruns):.2f} per rerun)")
+    print(f"{'request':<16}{'count':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for key in sorted(rec.samples):
+        xs = sorted(rec.samples[key])
+        print(f"{key:<16}{len(xs):>7}" + "".join(f"{percentile(xs, q) * 1000:>9.1f}" for q in (50, 90, 99, 100)))
+    print("status: " + ", ".join(f"{m} {c}: {n}" for (m, c), n in sorted(rec.status.items())))
+    print(f"saves: {saves} ({ok} ok, {saves - ok} failed); "
+          f"write conflicts: {conflicts}/{puts} ({100 * conflicts / max(puts, 1):.1f}%)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# docstore.py
+"""
+Versioned project documents on top of the blob store.
+
+`document_data` is a KeyedTable indexed by file name: every row is one
+version of that document (its blob hash, size, uploader, time), so a
+document's version chain is its history and the current version is its
+latest row.  Contents are stored once per distinct hash, however many
+documents or versions refer to them.
+"""
+from datetime import datetime
+
+import blobstore
+
+DOCUMENT_COLUMNS = ["File Name", "File Path", "Blob", "Version", "Size (bytes)", "Uploaded At", "Uploaded By"]
+DOCUMENT_DTYPES = {"Version": int, "Size (bytes)": int}
+
+def add_version(documents, name, stream, user=None):
+    """
+    Store `stream` (seekable) as the next version of document `name`.
+    Returns (row, added) — added is False when the contents equal the
+    current version, which is then returned unchanged.
+    """
+    sha, size = blobstore.put_stream(stream)
+    latest = documents.latest(name)
+    if latest is not None and latest["Blob"] == sha:
+        return latest, False
+    row = {
+        "File Name": name,
+        "File Path": blobstore.cache_path(sha),
+        "Blob": sha,
+        "Version": documents.count(name) + 1,
+        "Size (bytes)": size,
+        "Uploaded At": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "Uploaded By": user,
+    }
+    documents.append(row)
+    return row, True
+
+def document_page(documents, page, size=20):
+    """
+    Current version of the documents on one page, newest documents first —
+    only that page's rows are touched.  Returns (rows, number of pages).
+    """
+    n = len(documents.keys())
+    pages = max(-(-n // size), 1)
+    stop = n - page * size
+    names = documents.key_slice(max(stop - size, 0), max(stop, 0))[::-1]
+    return [documents.latest(n) | {"Versions": documents.count(n)} for n in names], pages
@@ -0,0 +1,101 @@
+# earned_value.py
+import numpy as np
+import pandas as pd
+
+def task_budgets(tasks, resources=None, costs=None):
+    """
+    Budget at completion per task: resource allocations (Total Cost by
+    Assigned Task) plus cost‑estimate items linked through their Task column.
+    Returns (budgets aligned with `tasks`, cost not linked to any task).
+    """
+    tasks = pd.Index([str(t) for t in tasks])
+    budget = np.zeros(len(tasks))
+    unlinked = 0.0
+    for df, col in ((resources, "Assigned Task"), (costs, "Task")):
+        if df is None or df.empty or "Total Cost" not in df:
+            continue
+        cost = pd.to_numeric(df["Total Cost"], errors="coerce").fillna(0.0).to_numpy(float)
+        idx = (tasks.get_indexer(df[col].astype(str)) if col in df else np.full(len(df), -1))
+        np.add.at(budget, idx[idx >= 0], cost[idx >= 0])
+        unlinked += cost[idx < 0].sum()
+    return budget, unlinked
+
+def _increments(task_idx, values):
+    """Per‑update change of a cumulative per‑task value (log in time order)."""
+    order = np.lexsort((np.arange(len(task_idx)), task_idx))
+    v = values[order]
+    prev = np.concatenate([[0.0], v[:-1]])
+    prev[np.r_[True, task_idx[order][1:] != task_idx[order][:-1]]] = 0.0
+    out = np.empty_like(v)
+    out[order] = v - prev
+    return out
+
+def earned_value(cpm, project_start, progress, budgets, as_of=None):
+    """
+    Daily PV / EV / AC curves with SPI and CPI.
+
+    PV spreads each task's budget evenly over its early‑start window (a
+    difference array of daily rates, then one cumulative sum).  EV and AC
+    come from the progress log — Task, Progress (%), Status, Cost to Date,
+    Updated At, in time order — as the increments of each task's reported
+    percent complete × budget and cost to date, binned by day and summed.
+    """
+    project_start = pd.Timestamp(project_start).normalize()
+    tasks = pd.Index(cpm.ids)
+    es = np.floor(cpm.es).astype(int)
+    dur = np.ceil(cpm.dur).astype(int)
+
+    log = progress[progress["Task"].astype(str).isin(tasks)] if len(progress) else progress
+    when = pd.to_datetime(log["Updated At"], errors="coerce") if len(log) else pd.Series(dtype="datetime64[ns]")
+    log, when = log[when.notna()], when[when.notna()]
+    day = np.maximum(((when - project_start).dt.days).to_numpy(int), 0)
+    end = pd.Timestamp(as_of).normalize() if as_of is not None else None
+    horizon = max(int((es + dur).max()) if len(es) else 0, int(day.max()) + 1 if len(day) else 0,
+                  (end - project_start).days + 1 if end is not None else 0, 1)
+
+    # planned value: rate b/d on [ES, EF); zero‑duration tasks land whole on their day
+    rate = np.where(dur > 0, budgets / np.maximum(dur, 1), budgets)
+    diff = np.zeros(horizon + 1)
+    np.add.at(diff, np.minimum(es, horizon), rate)
+    np.add.at(diff, np.minimum(es + np.maximum(dur, 1), horizon), -rate)
+    pv = np.cumsum(np.cumsum(diff)[:horizon])
+
+    # earned value and actual cost from the progress log
+    t_idx = tasks.get_indexer(log["Task"].astype(str))
+    pct = pd.to_numeric(log["Progress (%)"], errors="coerce").fillna(0.0).to_numpy(float)
+    if "Status" in log:
+        pct = np.where(log["Status"].astype(str).to_numpy() == "Completed", 100.0, pct)
+    pct = np.clip(pct, 0, 100) / 100.0
+    cost = (pd.to_numeric(log["Cost to Date"], errors="coerce") if "Cost to Date" in log
+            else pd.Series(np.nan, index=log.index))
+    cost = cost.groupby(t_idx).ffill().fillna(0.0).to_numpy(float)
+    ev = np.cumsum(np.bincount(day, _increments(t_idx, pct) * budgets[t_idx], minlength=horizon)[:horizon])
+    ac = np.cumsum(np.bincount(day, _increments(t_idx, cost), minlength=horizon)[:horizon])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curves = pd.DataFrame({
+            "PV": pv, "EV": ev, "AC": ac,
+            "SPI": np.where(pv > 0, ev / pv, np.nan),
+            "CPI": np.where(ac > 0, ev / ac, np.nan),
+        }, index=pd.date_range(project_start, periods=horizon, freq="D", name="Date"))
+    return curves
+
+def ev_summary(curves, budgets, as_of=None):
+    """Project‑level indicators at `as_of` (default: the last day with progress)."""
+    bac = float(np.sum(budgets))
+    if curves.empty:
+        return {}
+    if as_of is None:
+        row = curves.iloc[int(np.flatnonzero(np.diff(curves["EV"].to_numpy(), prepend=0) != 0).max(initial=0))]
+    else:
+        row = curves.iloc[min(max(curves.index.searchsorted(pd.Timestamp(as_of).normalize(), "right") - 1, 0),
+                              len(curves) - 1)]
+    pv, ev, ac = row["PV"], row["EV"], row["AC"]
+    cpi = ev / ac if ac else np.nan
+    return {
+        "Date": row.name, "BAC": bac, "PV": pv, "EV": ev, "AC": ac,
+        "SV": ev - pv, "CV": ev - ac,
+        "SPI": ev / pv if pv else np.nan, "CPI": cpi,
+        "EAC": bac / cpi if cpi and np.isfinite(cpi) else np.nan,
+        "% Complete": 100 * ev / bac if bac else 0.0,
+    }
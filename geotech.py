@@ -0,0 +1,120 @@
+# geotech.py
+import numpy as np
+import pandas as pd
+
+# Typical parameters used when a soil row doesn't give its own
+SOIL_DEFAULTS = pd.DataFrame({
+    #            φ (°)  E (MPa)  ν     Cc    e0    H (m)
+    "Clay":   [  15.0,   10.0, 0.35, 0.30, 0.90,  3.0],
+    "Sand":   [  32.0,   30.0, 0.30, 0.00, 0.65,  3.0],
+    "Gravel": [  38.0,   80.0, 0.30, 0.00, 0.45,  3.0],
+    "Silt":   [  28.0,   15.0, 0.35, 0.15, 0.80,  3.0],
+    "Rock":   [  40.0,  500.0, 0.25, 0.00, 0.30,  3.0],
+}, index=["Friction Angle (°)", "Elastic Modulus (MPa)", "Poisson's Ratio",
+          "Compression Index", "Void Ratio", "Layer Thickness (m)"]).T
+
+SOIL_COLUMNS = ["Soil Type", "Density", "Cohesion", *SOIL_DEFAULTS.columns]
+
+def soil_arrays(df):
+    """Per‑row soil parameters as float arrays, gaps filled from SOIL_DEFAULTS."""
+    defaults = SOIL_DEFAULTS.reindex(df["Soil Type"].astype(str)).set_axis(df.index)
+    out = {}
+    for col in ["Density", "Cohesion", *SOIL_DEFAULTS.columns]:
+        given = pd.to_numeric(df[col], errors="coerce") if col in df else pd.Series(np.nan, index=df.index)
+        if col in defaults:
+            given = given.fillna(defaults[col])
+        out[col] = given.fillna(0.0).to_numpy(dtype=float)
+    return out
+
+def bearing_capacity_factors(phi_deg, method="Terzaghi"):
+    """(Nc, Nq, Nγ) for friction angles in degrees (any array shape)."""
+    phi = np.radians(np.asarray(phi_deg, dtype=float))
+    tan = np.tan(phi)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method == "Terzaghi":
+            a = np.exp((0.75 * np.pi - phi / 2) * tan)
+            Nq = a ** 2 / (2 * np.cos(np.pi / 4 + phi / 2) ** 2)
+            Nc = np.where(phi > 0, (Nq - 1) / tan, 5.7)
+            Ng = 2 * (Nq + 1) * tan / (1 + 0.4 * np.sin(4 * phi))   # Coduto's fit
+        else:  # Meyerhof
+            Nq = np.exp(np.pi * tan) * np.tan(np.pi / 4 + phi / 2) ** 2
+            Nc = np.where(phi > 0, (Nq - 1) / tan, 5.14)
+            Ng = (Nq - 1) * np.tan(1.4 * phi)
+    return Nc, Nq, Ng
+
+def ultimate_bearing_capacity(c, gamma, phi_deg, B, Df, method="Terzaghi"):
+    """
+    Ultimate bearing capacity (kPa) of a square footing B × B at depth Df.
+    c in kPa, γ in kN/m³; all arguments broadcast against each other.
+    """
+    Nc, Nq, Ng = bearing_capacity_factors(phi_deg, method)
+    q = gamma * Df
+    if method == "Terzaghi":
+        return 1.3 * c * Nc + q * Nq + 0.4 * gamma * B * Ng
+    # Meyerhof shape (B/L = 1) and depth factors
+    phi = np.asarray(phi_deg, dtype=float)
+    Kp = np.tan(np.radians(45 + phi / 2)) ** 2
+    frictional = phi > 10
+    Fcs = 1 + 0.2 * Kp
+    Fqs = np.where(frictional, 1 + 0.1 * Kp, 1.0)
+    Fcd = 1 + 0.2 * np.sqrt(Kp) * Df / B
+    Fqd = np.where(frictional, 1 + 0.1 * np.sqrt(Kp) * Df / B, 1.0)
+    return c * Nc * Fcs * Fcd + q * Nq * Fqs * Fqd + 0.5 * gamma * B * Ng * Fqs * Fqd
+
+def settlement(q_net, gamma, B, Df, E_mpa, nu, Cc, e0, H, influence=0.88):
+    """
+    (immediate, consolidation) settlement in m under net pressure q_net (kPa).
+    Immediate: elastic, rigid square footing.  Consolidation: normally
+    consolidated layer of thickness H below the base, stress at mid‑layer
+    by the 2:1 method.
+    """
+    q_net = np.maximum(q_net, 0.0)
+    s_i = q_net * B * (1 - nu ** 2) * influence / np.maximum(E_mpa * 1000.0, 1e-9)
+    z = H / 2
+    sigma0 = np.maximum(gamma * (Df + z), 1e-9)
+    dsigma = q_net * B ** 2 / (B + z) ** 2
+    s_c = Cc * H / (1 + e0) * np.log10((sigma0 + dsigma) / sigma0)
+    return s_i, s_c
+
+def design_footings(df, load_kN, widths, depths, fs_target=3.0, max_settlement_mm=25.0, method="Terzaghi"):
+    """
+    Grid search over square footing width × depth for every soil row at once
+    (soils × widths × depths by broadcasting).  For each soil returns the
+    smallest footing (by plan area, then depth) with FS ≥ fs_target and total
+    settlement ≤ the limit, together with its capacity and settlement.
+    """
+    s = soil_arrays(df)
+    col = lambda a: a[:, None, None]
+    B = np.asarray(widths, dtype=float)[None, :, None]
+    D = np.asarray(depths, dtype=float)[None, None, :]
+    gamma = col(s["Density"]) * 9.81 / 1000.0   # kg/m³ → kN/m³
+
+    qu = ultimate_bearing_capacity(col(s["Cohesion"]), gamma, col(s["Friction Angle (°)"]), B, D, method)
+    q = load_kN / B ** 2
+    fs = qu / q
+    s_i, s_c = settlement(q - gamma * D, gamma, B, D, col(s["Elastic Modulus (MPa)"]),
+                          col(s["Poisson's Ratio"]), col(s["Compression Index"]),
+                          col(s["Void Ratio"]), col(s["Layer Thickness (m)"]))
+    total_mm = (s_i + s_c) * 1000.0
+
+    ok = (fs >= fs_target) & (total_mm <= max_settlement_mm)
+    # rank: area first, depth as tie‑break; infeasible cells pushed to +inf
+    rank = np.broadcast_to(B ** 2 + 1e-6 * D, ok.shape)
+    rank = np.where(ok, rank, np.inf).reshape(len(df), -1)
+    best = rank.argmin(axis=1)
+    found = np.isfinite(rank[np.arange(len(df)), best])
+    ib, idd = np.unravel_index(best, ok.shape[1:])
+    rows = np.arange(len(df))
+    pick = lambda a: np.broadcast_to(a, ok.shape)[rows, ib, idd]
+
+    return pd.DataFrame({
+        "Soil Type": df["Soil Type"].to_numpy(),
+        "Width B (m)": np.where(found, B.ravel()[ib], np.nan),
+        "Depth Df (m)": np.where(found, D.ravel()[idd], np.nan),
+        "q_ult (kPa)": np.where(found, pick(qu), np.nan),
+        "q_applied (kPa)": np.where(found, pick(q), np.nan),
+        "FS": np.where(found, pick(fs), np.nan),
+        "Immediate (mm)": np.where(found, pick(s_i) * 1000, np.nan),
+        "Consolidation (mm)": np.where(found, pick(s_c) * 1000, np.nan),
+        "Feasible": found,
+    }, index=df.index)
@@ -4,9 +4,53 @@ import streamlit as st
 import os
 import requests
 
-# Path to banner
+from blobstore import blob_sha
+
+# Path to banner (app.py syncs the database copy into this same file)
 HOME_BANNER_PATH = "uploads/home header image.jpg"
 
+# In‑memory banner cache, shared by every session in this process.
+#   hash   → blob sha of the image bytes currently on disk
+#   source → the database value (blob ref) those bytes came from
+_BANNER = {"hash": None, "source": None, "bytes": None}
+
+def banner_bytes():
+    """Return the banner image bytes, reading the file at most once."""
+    if _BANNER["bytes"] is None and os.path.exists(HOME_BANNER_PATH):
+        with open(HOME_BANNER_PATH, "rb") as f:
+            data = f.read()
+        _BANNER.update(hash=blob_sha(data), bytes=data)
+    return _BANNER["bytes"]
+
+def banner_hash():
+    banner_bytes()
+    return _BANNER["hash"]
+
+def banner_source():
+    return _BANNER["source"]
+
+def set_banner(data, source=None):
+    """Write the banner only if its content changed; remember the blob it came from."""
+    digest = blob_sha(data)
+    banner_bytes()  # prime the cache from disk so an identical image is not rewritten
+    if digest != _BANNER["hash"]:
+        os.makedirs(os.path.dirname(HOME_BANNER_PATH), exist_ok=True)
+        with open(HOME_BANNER_PATH, "wb") as f:
+            f.write(data)
+        _BANNER.update(hash=digest, bytes=data)
+    if source is not None:
+        _BANNER["source"] = source
+
+def clear_banner(source=None):
+    """Remove the banner file; returns True if there was one."""
+    existed = os.path.exists(HOME_BANNER_PATH)
+    if existed:
+        os.remove(HOME_BANNER_PATH)
+    _BANNER.update(hash=None, bytes=None)
+    if source is not None:
+        _BANNER["source"] = source
+    return existed
+
 def run():
     # Ensure upload folder exists
     if not os.path.isdir("uploads"):
@@ -40,8 +84,8 @@ def run():
         """)
     with col2:
         st.subheader("Current Banner Image")
-        if os.path.exists(HOME_BANNER_PATH):
-            st.image(HOME_BANNER_PATH, use_container_width=True)
+        if banner_bytes() is not None:
+            st.image(banner_bytes(), use_container_width=True)
         else:
             st.info("No banner image found. Manage it below.")
 
@@ -60,10 +104,9 @@ def run():
             key="home_local_image"
         )
         if uploaded_file:
-            with open(HOME_BANNER_PATH, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            set_banner(uploaded_file.getvalue())
             st.success("✅ Banner uploaded!")
-            st.image(HOME_BANNER_PATH, use_container_width=True)
+            st.image(banner_bytes(), use_container_width=True)
 
         st.write("---")
 
@@ -77,10 +120,9 @@ def run():
                     resp = requests.get(url, timeout=10)
                     ctype = resp.headers.get("Content-Type", "")
                     if resp.status_code == 200 and ctype.startswith("image"):
-                        with open(HOME_BANNER_PATH, "wb") as f:
-                            f.write(resp.content)
+                        set_banner(resp.content)
                         st.success("✅ Banner fetched!")
-                        st.image(HOME_BANNER_PATH, use_container_width=True)
+                        st.image(banner_bytes(), use_container_width=True)
                     else:
                         st.error("Response was not an image.")
                 except Exception as e:
@@ -90,8 +132,7 @@ def run():
 
         # --- Delete / Reset ---
         if st.button("Delete/Reset Banner", key="delete_banner"):
-            if os.path.exists(HOME_BANNER_PATH):
-                os.remove(HOME_BANNER_PATH)
+            if clear_banner():
                 st.success("🗑️ Banner deleted.")
             else:
                 st.info("No banner to delete.")
@@ -0,0 +1,183 @@
+# hydrology.py
+import numpy as np
+import pandas as pd
+from scipy.signal import fftconvolve
+
+def scs_potential_retention(cn):
+    """S (mm) for an SCS curve number."""
+    return 25400.0 / cn - 254.0
+
+def scs_cumulative_excess(P, cn, ia_ratio=0.2):
+    """Cumulative excess rainfall (mm) for cumulative event rainfall P (mm)."""
+    S = scs_potential_retention(cn)
+    Ia = ia_ratio * S
+    wet = np.maximum(P - Ia, 0.0)
+    return wet ** 2 / (wet + S)
+
+def unit_hydrograph(area_km2, tc_h, dt_min, shape=3.7):
+    """
+    SCS (gamma‑shaped) unit hydrograph sampled every dt: ordinates in m³/s
+    per mm of excess rainfall, rescaled so that they hold exactly 1 mm over
+    the catchment.
+    """
+    dt_h = dt_min / 60.0
+    tp = dt_h / 2 + 0.6 * tc_h
+    t = np.arange(dt_h, 6 * tp + dt_h, dt_h)
+    ratio = t / tp
+    u = (ratio * np.exp(1 - ratio)) ** shape
+    volume = area_km2 * 1e6 * 1e-3          # m³ in 1 mm over the catchment
+    return u * volume / (u.sum() * dt_h * 3600)
+
+class PeakDownsampler:
+    """
+    Keeps a bounded (time, max) summary of an arbitrarily long series for
+    plotting: values are reduced to per‑bucket maxima, and when the buffer
+    reaches 2·max_points adjacent buckets are merged and the bucket width
+    doubles.  Peaks survive any amount of downsampling.
+    """
+
+    def __init__(self, max_points=2000):
+        self.max_points = max_points
+        self.width = 1
+        self._t, self._v = [], []
+        self._pend_t, self._pend_v = np.empty(0, "datetime64[ns]"), np.empty(0)
+
+    def add(self, times, values):
+        t = np.concatenate([self._pend_t, np.asarray(times, "datetime64[ns]")])
+        v = np.concatenate([self._pend_v, np.asarray(values, float)])
+        full = len(v) // self.width * self.width
+        if full:
+            self._t.append(t[:full:self.width])
+            self._v.append(v[:full].reshape(-1, self.width).max(axis=1))
+        self._pend_t, self._pend_v = t[full:], v[full:]
+        while sum(map(len, self._v)) >= 2 * self.max_points:
+            bt, bv = np.concatenate(self._t), np.concatenate(self._v)
+            even = len(bv) // 2 * 2
+            # an odd last bucket stays as it is; buckets are keyed by start time
+            self._t = [bt[:even:2], bt[even:]]
+            self._v = [bv[:even].reshape(-1, 2).max(axis=1), bv[even:]]
+            self.width *= 2
+
+    def series(self):
+        t = np.concatenate([*self._t, self._pend_t[:1]])
+        v = np.concatenate([*self._v, self._pend_v.max(keepdims=True) if len(self._pend_v) else []])
+        return pd.Series(v, index=pd.DatetimeIndex(t))
+
+class RunoffSimulation:
+    """
+    Streaming SCS‑CN rainfall–runoff model.  Rainfall arrives in chunks
+    (e.g. `pd.read_csv(..., chunksize=...)`); excess rainfall is computed per
+    storm event — an event ends after `dry_hours` without rain, resetting the
+    initial abstraction — and routed through the unit hydrograph by FFT
+    overlap‑add, carrying the convolution tail between chunks (finish()
+    emits it after the last one).  Only running results (peaks, volumes, a
+    downsampled hydrograph) are kept.
+    """
+
+    def __init__(self, cn, area_km2, tc_h, dt_min=5.0, dry_hours=6.0, ia_ratio=0.2, max_points=2000):
+        if not 0 < cn <= 100:
+            raise ValueError("Curve number must be in (0, 100].")
+        self.cn, self.ia_ratio, self.dt_min = cn, ia_ratio, dt_min
+        self.uh = unit_hydrograph(area_km2, tc_h, dt_min)
+        self.gap = max(int(round(dry_hours * 60 / dt_min)), 1)
+        self.flow_plot = PeakDownsampler(max_points)
+        self.rain_plot = PeakDownsampler(max_points)
+        # carried state
+        self._tail = np.zeros(len(self.uh) - 1)
+        self._event_P = 0.0
+        self._event_Pe = 0.0
+        self._since_wet = self.gap + 1
+        self._step = 0
+        self._next_time = None   # time step after the last chunk fed
+        # running results
+        self.total_rain = self.total_excess = self.volume = 0.0
+        self.peak_flow, self.peak_time = 0.0, None
+        self.annual = {}
+
+    def excess(self, rain):
+        """Incremental excess rainfall (mm) for one chunk, continuing the current event."""
+        n = len(rain)
+        cum = np.cumsum(rain)
+        wet = np.flatnonzero(rain > 0)
+        # steps since the previous wet step (the first may reach back into earlier chunks)
+        prev = np.concatenate([[-self._since_wet], wet[:-1]])
+        starts = wet[wet - prev > self.gap] if len(wet) else wet
+        # event base: cumulative rain just before the latest event start at or before each step
+        marker = np.full(n, -1)
+        marker[starts] = starts
+        latest = np.maximum.accumulate(marker)
+        base = np.where(latest >= 0, cum[np.maximum(latest, 0)] - rain[np.maximum(latest, 0)], -self._event_P)
+        event_P = cum - base
+        event_Pe = scs_cumulative_excess(event_P, self.cn, self.ia_ratio)
+        before = np.concatenate([[self._event_Pe], event_Pe[:-1]])
+        before[starts] = 0.0
+        if n:
+            self._event_P, self._event_Pe = event_P[-1], event_Pe[-1]
+            self._since_wet = n - wet[-1] if len(wet) else self._since_wet + n
+        return event_Pe - before
+
+    def add(self, rain, times=None):
+        """Feed the next chunk of rainfall depths (mm per step); returns the chunk's flows (m³/s)."""
+        rain = np.nan_to_num(np.asarray(rain, dtype=float))
+        n = len(rain)
+        if not n:
+            return np.empty(0)
+        dt = np.timedelta64(int(self.dt_min * 60), "s")
+        if times is None:
+            start = self._next_time if self._next_time is not None else np.datetime64("2000-01-01") + self._step * dt
+            times = start + np.arange(n) * dt
+        times = np.asarray(times, "datetime64[ns]")
+        self._next_time = times[-1] + dt
+        pe = self.excess(rain)
+        # overlap‑add: the previous chunks' tail is len(uh)-1 long, never longer than conv
+        conv = fftconvolve(pe, self.uh)
+        conv[:len(self._tail)] += self._tail
+        flow, self._tail = conv[:n], conv[n:].copy()
+
+        self._step += n
+        self.total_rain += rain.sum()
+        self.total_excess += pe.sum()
+        self.volume += flow.sum() * self.dt_min * 60
+        i = flow.argmax()
+        if flow[i] > self.peak_flow:
+            self.peak_flow, self.peak_time = float(flow[i]), pd.Timestamp(times[i])
+        years = times.astype("datetime64[Y]").astype(int) + 1970
+        for y in np.unique(years):
+            sel = years == y
+            self.annual[int(y)] = max(self.annual.get(int(y), 0.0), float(flow[sel].max()))
+        self.flow_plot.add(times, flow)
+        self.rain_plot.add(times, rain)
+        return flow
+
+    def finish(self):
+        """
+        Emit the receding limb still held in the convolution tail once the
+        last chunk is in (as dry steps after it); returns those flows (m³/s).
+        """
+        return self.add(np.zeros(len(self._tail)))
+
+    def summary(self):
+        return {
+            "Total Rainfall (mm)": self.total_rain,
+            "Total Excess (mm)": self.total_excess,
+            "Runoff Coefficient": self.total_excess / self.total_rain if self.total_rain else 0.0,
+            "Peak Flow (m³/s)": self.peak_flow,
+            "Time of Peak": self.peak_time,
+            "Runoff Volume (m³)": self.volume,
+        }
+
+    def annual_peaks(self):
+        return pd.DataFrame({"Year": list(self.annual), "Peak Flow (m³/s)": list(self.annual.values())})
+
+def simulate_csv(source, cn, area_km2, tc_h, dt_min=5.0, dry_hours=6.0, chunksize=200_000, **kwargs):
+    """
+    Run RunoffSimulation over a CSV of rainfall (a 'Rainfall (mm)' column or
+    the last column; an optional 'Time' column) read `chunksize` rows at a time.
+    """
+    sim = RunoffSimulation(cn, area_km2, tc_h, dt_min, dry_hours, **kwargs)
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        rain_col = "Rainfall (mm)" if "Rainfall (mm)" in chunk else chunk.columns[-1]
+        times = pd.to_datetime(chunk["Time"], errors="coerce").to_numpy() if "Time" in chunk else None
+        sim.add(pd.to_numeric(chunk[rain_col], errors="coerce").to_numpy(), times)
+    sim.finish()
+    return sim
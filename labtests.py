@@ -0,0 +1,70 @@
+# labtests.py
+import numpy as np
+import pandas as pd
+
+# Classification tables: (edges, labels).  A value below edges[0] gets
+# labels[0]; one at or above edges[i] moves up to labels[i+1].
+TDS_CLASSES = ([300, 600, 900], ["Excellent", "Good", "Fair", "Poor"])                      # mg/L
+WATER_PH_CLASSES = ([6.5, np.nextafter(8.5, np.inf)], ["Acidic", "Acceptable", "Alkaline"])  # 6.5–8.5 inclusive
+SOIL_PH_CLASSES = ([4.5, 5.1, 5.6, 6.1, 6.6, 7.4, 7.9, 8.5, 9.1],                           # USDA
+                   ["Extremely acid", "Very strongly acid", "Strongly acid", "Moderately acid",
+                    "Slightly acid", "Neutral", "Slightly alkaline", "Moderately alkaline",
+                    "Strongly alkaline", "Very strongly alkaline"])
+SALINITY_CLASSES = ([2, 4, 8, 16], ["Non-saline", "Slightly saline", "Moderately saline",    # EC, dS/m
+                                    "Strongly saline", "Very strongly saline"])
+PLASTICITY_CLASSES = ([1, 5, 10, 20, 40], ["Non-plastic", "Slight", "Low", "Medium", "High", "Very high"])  # PI, %
+
+WATER_COLUMNS = ["Sample ID", "EC (µS/cm)", "pH"]
+SOIL_COLUMNS = ["Sample ID", "pH", "EC (dS/m)", "Liquid Limit (%)", "Plastic Limit (%)",
+                "Wet Mass (g)", "Dry Mass (g)"]
+
+def classify(values, classes):
+    """Vectorised threshold lookup → Categorical (NaN stays missing)."""
+    edges, labels = classes
+    values = np.asarray(values, dtype=float)
+    codes = np.searchsorted(edges, values, side="right")
+    codes[np.isnan(values)] = -1
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+def _numeric(df, name):
+    """
+    Column `name` (case‑insensitive, unit optional) as floats, written back
+    to df so unreadable entries show as blanks; all‑NaN when absent.
+    """
+    key = name.split(" (")[0].strip().lower()
+    for c in df.columns:
+        if str(c).split(" (")[0].strip().lower() == key:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype(float)
+            return df[c].to_numpy()
+    return np.full(len(df), np.nan)
+
+def process_water_batch(df, tds_factor=0.64):
+    """Adds TDS (mg/L) = EC × factor and TDS / pH classes to a water lab sheet."""
+    out = df.copy()
+    ec, ph = _numeric(out, "EC"), _numeric(out, "pH")
+    out["TDS (mg/L)"] = ec * tds_factor
+    out["Water Quality"] = classify(out["TDS (mg/L)"], TDS_CLASSES)
+    out["pH Class"] = classify(ph, WATER_PH_CLASSES)
+    return out
+
+def process_soil_batch(df):
+    """Adds pH, salinity and plasticity classes, PI and moisture content to a soil lab sheet."""
+    out = df.copy()
+    ll, pl = _numeric(out, "Liquid Limit"), _numeric(out, "Plastic Limit")
+    wet, dry = _numeric(out, "Wet Mass"), _numeric(out, "Dry Mass")
+    out["pH Class"] = classify(_numeric(out, "pH"), SOIL_PH_CLASSES)
+    out["Salinity"] = classify(_numeric(out, "EC"), SALINITY_CLASSES)
+    out["Plasticity Index (%)"] = np.maximum(ll - pl, 0.0)
+    out["Plasticity"] = classify(out["Plasticity Index (%)"], PLASTICITY_CLASSES)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["Moisture Content (%)"] = np.where(dry > 0, (wet - dry) / dry * 100, np.nan)
+    return out
+
+def batch_summary(results):
+    """(statistics of the numeric columns, counts of every class column)."""
+    stats = results.select_dtypes("number").describe().T
+    classes = [c for c in results.columns if isinstance(results[c].dtype, pd.CategoricalDtype)]
+    counts = pd.DataFrame(
+        [(c, label, n) for c in classes for label, n in results[c].value_counts(sort=False).items()],
+        columns=["Test", "Class", "Samples"])
+    return stats, counts
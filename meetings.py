@@ -0,0 +1,178 @@
+# meetings.py
+"""
+Meeting schedule with per‑attendee interval trees.
+
+Meetings live in an append‑only MessageLog (one CSV record each).  The
+process keeps one Schedule per log, caught up with only the records added
+since it last looked, so a rerun reads nothing.  A Schedule indexes every
+meeting in one interval tree for time‑range views and in one tree per
+attendee for conflict and free‑slot checks: each is a treap ordered by
+start, every node carrying the latest end in its subtree, so an overlap
+query only descends into subtrees that can still overlap — O(log n + k).
+"""
+import csv
+import os
+import random
+import threading
+from datetime import timedelta
+
+import pandas as pd
+
+from messagelog import MessageLog
+
+MEETING_COLUMNS = ["Date", "Time", "Duration (min)", "Title", "Attendees"]
+DEFAULT_DURATION = 60
+
+def split_attendees(text):
+    """'a, b; c' → ['a', 'b', 'c'] (order kept, duplicates and blanks dropped)."""
+    return list(dict.fromkeys(a.strip() for a in str(text).replace(";", ",").split(",") if a.strip()))
+
+# ── Interval tree ────────────────────────────────────────────────────────────
+class _Node:
+    __slots__ = ("start", "end", "item", "max_end", "priority", "left", "right")
+
+    def __init__(self, start, end, item):
+        self.start, self.end, self.item = start, end, item
+        self.max_end = end
+        self.priority = random.random()
+        self.left = self.right = None
+
+    def update(self):
+        self.max_end = max(self.end,
+                           self.left.max_end if self.left else self.end,
+                           self.right.max_end if self.right else self.end)
+
+class IntervalTree:
+    """Half‑open [start, end) intervals with an item each; insert O(log n), overlaps O(log n + k)."""
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, start, end, item):
+        self.root = self._insert(self.root, _Node(start, end, item))
+        self.size += 1
+
+    def _insert(self, node, new):
+        if node is None:
+            return new
+        if new.start < node.start:
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:   # rotate right
+                top, node.left = node.left, node.left.right
+                node.update()
+                top.right = node
+                node = top
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:  # rotate left
+                top, node.right = node.right, node.right.left
+                node.update()
+                top.left = node
+                node = top
+        node.update()
+        return node
+
+    def overlapping(self, lo, hi):
+        """(start, end, item) of every interval overlapping [lo, hi), unordered."""
+        out, stack = [], [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_end <= lo:
+                continue   # nothing in this subtree ends after lo
+            stack.append(node.left)
+            if node.start < hi:   # right subtree starts later still — skip it once past hi
+                if node.end > lo:
+                    out.append((node.start, node.end, node.item))
+                stack.append(node.right)
+        return out
+
+# ── Schedule ─────────────────────────────────────────────────────────────────
+class Schedule:
+    def __init__(self):
+        self.all = IntervalTree()
+        self.by_attendee = {}   # attendee → IntervalTree
+        self.loaded = 0         # log records indexed so far
+
+    def add(self, start, end, meeting):
+        self.all.insert(start, end, meeting)
+        for a in meeting["Attendees"]:
+            self.by_attendee.setdefault(a, IntervalTree()).insert(start, end, meeting)
+
+    def between(self, lo, hi):
+        """Meetings overlapping [lo, hi), in start order."""
+        return [m for _, _, m in sorted(self.all.overlapping(lo, hi), key=lambda r: r[0])]
+
+    def conflicts(self, attendees, start, end):
+        """Meetings of any of `attendees` overlapping [start, end), in start order."""
+        found = {id(m): (s, m) for a in attendees if a in self.by_attendee
+                 for s, _, m in self.by_attendee[a].overlapping(start, end)}
+        return [m for _, m in sorted(found.values(), key=lambda r: r[0])]
+
+    def free_slots(self, attendees, lo, hi, minutes):
+        """Gaps of at least `minutes` in [lo, hi) when none of `attendees` is busy."""
+        busy = sorted((max(s, lo), min(e, hi)) for a in attendees if a in self.by_attendee
+                      for s, e, _ in self.by_attendee[a].overlapping(lo, hi))
+        slots, t, need = [], lo, timedelta(minutes=minutes)
+        for s, e in busy + [(hi, hi)]:
+            if s - t >= need:
+                slots.append((t, s))
+            t = max(t, e)
+        return slots
+
+def _meeting(record):
+    """(start, end, meeting dict) from a log record; None if its date/time don't parse."""
+    start = pd.to_datetime(f"{record['Date']} {record['Time']}", errors="coerce")
+    if pd.isna(start):
+        return None
+    minutes = pd.to_numeric(record.get("Duration (min)"), errors="coerce")
+    minutes = DEFAULT_DURATION if pd.isna(minutes) or minutes <= 0 else float(minutes)
+    start = start.to_pydatetime()
+    end = start + timedelta(minutes=minutes)
+    return start, end, {"Start": start, "End": end, "Title": record.get("Title", ""),
+                        "Attendees": split_attendees(record.get("Attendees", ""))}
+
+# ── Log ──────────────────────────────────────────────────────────────────────
+_SCHEDULES = {}   # log path → Schedule
+_LOCK = threading.Lock()
+
+def meeting_log(path):
+    """The meetings log at `path`; an older Date/Time‑only file is migrated once."""
+    log = MessageLog(path, MEETING_COLUMNS)
+    if log.columns != MEETING_COLUMNS:
+        with log._locked():
+            # another session may have migrated it first, or appended since it was opened
+            with open(path, newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f))
+            if header != MEETING_COLUMNS:
+                log._sync_index()
+                old = log.read().reindex(columns=MEETING_COLUMNS).fillna("")
+                tmp = f"{path}.tmp{os.getpid()}"
+                old.to_csv(tmp, index=False)
+                os.replace(tmp, path)
+                os.remove(log.index_path)   # offsets of the old layout
+        log = MessageLog(path, MEETING_COLUMNS)
+    return log
+
+def schedule(log):
+    """The Schedule for `log`, indexing only the records added since the last call."""
+    with _LOCK:
+        sched = _SCHEDULES.get(log.path)
+        n = len(log)
+        if sched is None or sched.loaded > n:   # first use, or the file was replaced
+            sched = _SCHEDULES[log.path] = Schedule()
+        if sched.loaded < n:
+            for record in log.read(sched.loaded).to_dict("records"):
+                parsed = _meeting(record)
+                if parsed:
+                    sched.add(*parsed)
+            sched.loaded = n
+        return sched
+
+def add_meeting(log, start, minutes, title, attendees):
+    """Append a meeting to the log (the Schedule picks it up on its next call)."""
+    log.append({"Date": start.strftime("%Y-%m-%d"), "Time": start.strftime("%H:%M:%S"),
+                "Duration (min)": int(minutes), "Title": title, "Attendees": ", ".join(attendees)})
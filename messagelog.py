@@ -0,0 +1,149 @@
+# messagelog.py
+"""
+Append‑only CSV log with an offset index.
+
+The data file stays a plain CSV (header + one record per message, quoted
+newlines allowed).  Beside it, ``<file>.idx`` holds little‑endian uint64
+byte offsets: the end of the header, then the end of every record.  An
+append writes the record and then its end offset, both under an exclusive
+file lock, so it never reads or rewrites what is already there; any slice
+of records — the last N, or a page further back — is two 8‑byte index
+reads and one contiguous read of the data file.  Readers need no lock:
+they only read up to the last offset in the index, which always ends a
+complete record.
+"""
+import csv
+import io
+import os
+import struct
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+
+    def _lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+_OFFSET = struct.Struct("<Q")
+
+def _record_ends(data, base):
+    """End offsets of the complete CSV records in `data` (which starts at `base`)."""
+    ends, quotes, pos = [], 0, 0
+    for line in data.splitlines(keepends=True):
+        pos += len(line)
+        quotes += line.count(b'"')
+        if quotes % 2 == 0 and line.endswith(b"\n"):
+            ends.append(base + pos)
+            quotes = 0
+    return ends
+
+class MessageLog:
+    def __init__(self, path, columns):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._locked():
+            if not os.path.exists(path):
+                with open(path, "w", newline="", encoding="utf-8") as f:
+                    csv.writer(f, lineterminator="\n").writerow(columns)
+            self._sync_index()
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            self.columns = next(csv.reader(f))
+
+    @contextmanager
+    def _locked(self):
+        with open(f"{self.path}.lock", "a+b") as f:
+            _lock(f)
+            try:
+                yield
+            finally:
+                _unlock(f)
+
+    def _offset(self, i):
+        with open(self.index_path, "rb") as f:
+            f.seek(i * _OFFSET.size)
+            return _OFFSET.unpack(f.read(_OFFSET.size))[0]
+
+    def _sync_index(self):
+        """
+        Bring the index level with the data file (under the lock): build it
+        on first use, and pick up records a crashed writer didn't index.
+        """
+        size = os.path.getsize(self.path)
+        n = os.path.getsize(self.index_path) // _OFFSET.size if os.path.exists(self.index_path) else 0
+        last = self._offset(n - 1) if n else None
+        if last is None or last > size:   # no index, or the data file was replaced
+            with open(self.path, "rb") as f:
+                header = f.readline()
+            ends, start, mode = [len(header)], len(header), "wb"
+        else:
+            ends, start, mode = [], last, "ab"
+        if start < size:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                ends += _record_ends(f.read(), start)
+        if ends or mode == "wb":
+            with open(self.index_path, mode) as f:
+                if mode == "ab":
+                    f.truncate(n * _OFFSET.size)   # drop a torn trailing offset
+                f.write(b"".join(_OFFSET.pack(e) for e in ends))
+
+    def __len__(self):
+        return max(os.path.getsize(self.index_path) // _OFFSET.size - 1, 0)
+
+    def append(self, row):
+        """Append one record (a dict keyed by column); returns its record number."""
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerow([row.get(c, "") for c in self.columns])
+        data = buf.getvalue().encode("utf-8")
+        with self._locked():
+            self._sync_index()
+            n = len(self)
+            with open(self.path, "ab") as f:
+                end = f.seek(0, os.SEEK_END) + len(data)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.index_path, "ab") as f:
+                f.write(_OFFSET.pack(end))
+        return n
+
+    def read(self, start=0, stop=None):
+        """Records start … stop‑1 as a DataFrame indexed by record number."""
+        n = len(self)
+        stop = n if stop is None else max(min(stop, n), 0)
+        start = min(max(start, 0), stop)
+        if start == stop:
+            return pd.DataFrame(columns=self.columns)
+        lo, hi = self._offset(start), self._offset(stop)
+        with open(self.path, "rb") as f:
+            f.seek(lo)
+            data = f.read(hi - lo)
+        df = pd.read_csv(io.BytesIO(data), header=None, names=self.columns, dtype=str,
+                         keep_default_na=False, encoding="utf-8")
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+    def tail(self, n):
+        """The last `n` records, oldest first."""
+        return self.read(len(self) - n)
+
+    def page(self, number, size=50):
+        """Page `number` counting back from the newest (0 = the latest `size` records), oldest first."""
+        stop = len(self) - number * size
+        return self.read(stop - size, stop)
@@ -1,6 +1,8 @@
 # plots.py
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
+import plotly.graph_objects as go
 
 def plot_beam_diagram(beam, show_dimensions=True):
     length = beam.length
@@ -60,7 +62,7 @@ def plot_beam_diagram(beam, show_dimensions=True):
 
 def plot_sfd(beam):
     xs = np.linspace(0, beam.length, 200)
-    Vs = [beam.shear_at(x) for x in xs]
+    Vs = beam.shear(xs)
     fig, ax = plt.subplots()
     ax.plot(xs, Vs)
     ax.axhline(0, color='black', linewidth=0.5)
@@ -71,7 +73,7 @@ def plot_sfd(beam):
 
 def plot_bmd(beam):
     xs = np.linspace(0, beam.length, 200)
-    Ms = [beam.moment_at(x) for x in xs]
+    Ms = beam.moment(xs)
     fig, ax = plt.subplots()
     ax.plot(xs, Ms)
     ax.axhline(0, color='black', linewidth=0.5)
@@ -79,3 +81,94 @@ def plot_bmd(beam):
     ax.set_xlabel("x (m)")
     ax.set_title("Bending Moment Diagram")
     return fig
+
+def plot_hydrograph(flow, rain=None):
+    """Flow series (m³/s, DatetimeIndex) with the rainfall hyetograph hanging from the top axis."""
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.plot(flow.index, flow.values, linewidth=0.8)
+    ax.set_ylabel("Flow (m³/s)")
+    ax.set_title("Runoff Hydrograph")
+    if rain is not None and len(rain):
+        ax2 = ax.twinx()
+        ax2.fill_between(rain.index, 0, rain.values, step="post", color="tab:blue", alpha=0.3, linewidth=0)
+        ax2.set_ylim(rain.max() * 3 if rain.max() > 0 else 1, 0)
+        ax2.set_ylabel("Rainfall (mm)")
+    fig.autofmt_xdate()
+    return fig
+
+def gantt_window(tasks, date_range=None, rows=None, max_bars=1500):
+    """
+    The bars to draw for one view of a schedule.
+
+    `tasks` has Task, Start, Finish (datetimes) and optionally Critical,
+    sorted as it should appear top to bottom.  Only tasks overlapping
+    `date_range` and inside the `rows` (first, last) slice are kept; if more
+    than `max_bars` remain, consecutive tasks are collapsed into summary bars
+    of equal size spanning their earliest start to latest finish.
+    """
+    start, finish = tasks["Start"].to_numpy("datetime64[ns]"), tasks["Finish"].to_numpy("datetime64[ns]")
+    keep = np.ones(len(tasks), dtype=bool)
+    if date_range is not None:
+        lo, hi = (np.datetime64(pd.Timestamp(d), "ns") for d in date_range)
+        keep &= (finish >= lo) & (start <= hi)
+    idx = np.flatnonzero(keep)
+    if rows is not None:
+        idx = idx[rows[0]:rows[1]]
+    critical = (tasks["Critical"].to_numpy(bool) if "Critical" in tasks else np.zeros(len(tasks), bool))
+    names = tasks["Task"].astype(str).to_numpy()
+    if len(idx) <= max_bars:
+        return pd.DataFrame({"Task": names[idx], "Start": start[idx], "Finish": finish[idx],
+                             "Critical": critical[idx], "Count": 1})
+    size = -(-len(idx) // max_bars)
+    groups = np.arange(len(idx)) // size
+    bounds = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    counts = np.diff(np.r_[bounds, len(idx)])
+    return pd.DataFrame({
+        "Task": [f"{names[idx[b]]} … {names[idx[b + c - 1]]}" for b, c in zip(bounds, counts)],
+        "Start": np.minimum.reduceat(start[idx], bounds),
+        "Finish": np.maximum.reduceat(finish[idx], bounds),
+        "Critical": np.logical_or.reduceat(critical[idx], bounds),
+        "Count": counts,
+    })
+
+def plot_gantt(bars, height=None):
+    """
+    Gantt chart as WebGL line segments (one Scattergl trace per bar class),
+    so tens of thousands of bars pan smoothly.  Zero‑length bars are drawn
+    as milestone diamonds.
+    """
+    n = len(bars)
+    height = height or int(min(900, max(300, 18 * n + 120)))
+    width = max(2, min(18, (height - 120) / max(n, 1) * 0.7))
+    y = np.arange(n)
+    fig = go.Figure()
+    milestone = (bars["Finish"] == bars["Start"]).to_numpy()
+    summary = (bars["Count"] > 1).to_numpy()
+    critical = bars["Critical"].to_numpy(bool)
+    for name, mask, color in (("Tasks", ~critical & ~summary, "#4c78a8"), ("Critical", critical & ~summary, "#e45756"),
+                              ("Summary", summary & ~critical, "#9d9d9d"), ("Summary (critical)", summary & critical, "#f4a3a3")):
+        sel = np.flatnonzero(mask & ~milestone)
+        if not sel.size:
+            continue
+        s, f = bars["Start"].to_numpy()[sel], bars["Finish"].to_numpy()[sel]
+        mid = s + (f - s) / 2
+        nat = np.full(sel.size, np.datetime64("NaT"), dtype=s.dtype)
+        label = (bars["Task"].to_numpy()[sel] + np.where(bars["Count"].to_numpy()[sel] > 1,
+                 " (" + bars["Count"].astype(str).to_numpy()[sel] + " tasks)", "")).astype(object)
+        fig.add_trace(go.Scattergl(
+            x=np.column_stack([s, mid, f, nat]).ravel(),
+            y=np.column_stack([y[sel], y[sel], y[sel], np.full(sel.size, np.nan)]).ravel(),
+            text=np.repeat(label, 4), mode="lines", name=name,
+            line=dict(width=width, color=color), hovertemplate="%{text}<br>%{x|%Y-%m-%d}<extra></extra>",
+        ))
+    sel = np.flatnonzero(milestone)
+    if sel.size:
+        fig.add_trace(go.Scattergl(x=bars["Start"].to_numpy()[sel], y=y[sel], mode="markers", name="Milestones",
+                                   text=bars["Task"].to_numpy()[sel], marker=dict(symbol="diamond", size=10, color="black"),
+                                   hovertemplate="%{text}<br>%{x|%Y-%m-%d}<extra></extra>"))
+    labels = n <= 60
+    fig.update_yaxes(autorange="reversed", tickvals=y if labels else None,
+                     ticktext=bars["Task"].tolist() if labels else None, showticklabels=labels)
+    fig.update_layout(height=height, margin=dict(l=10, r=10, t=30, b=10), xaxis_type="date",
+                      legend=dict(orientation="h", y=1.02), dragmode="pan")
+    return fig
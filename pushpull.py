@@ -1,21 +1,49 @@
 import streamlit as st
 import requests
 import base64
+import io
+import json
+import os
 import pandas as pd
+from urllib.parse import quote
 
-GITHUB_TOKEN = st.secrets["GITHUB_TOKEN"]
+# Environment overrides let devtools/ point the app at a local stand‑in
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN") or st.secrets["GITHUB_TOKEN"]
+GITHUB_API   = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 GITHUB_REPO  = "Rekar-J/Civil-Engineer-Automation-Tool"
 DATABASE_FILE = "database.csv"
 USERS_FILE    = "users.csv"
+BLOBS_DIR     = "blobs"
+DB_DIR        = "db"                         # one shard file per (Tab, SubTab)
+DB_MANIFEST   = os.path.join(DB_DIR, "manifest.json")
 
-DB_URL   = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{DATABASE_FILE}"
-USERS_URL= f"https://api.github.com/repos/{GITHUB_REPO}/contents/{USERS_FILE}"
+DB_URL   = f"{GITHUB_API}/repos/{GITHUB_REPO}/contents/{DATABASE_FILE}"
+USERS_URL= f"{GITHUB_API}/repos/{GITHUB_REPO}/contents/{USERS_FILE}"
+API_URL  = f"{GITHUB_API}/repos/{GITHUB_REPO}"
+DB_DIR_URL = f"{API_URL}/contents/{DB_DIR}"
 HEADERS  = {"Authorization": f"token {GITHUB_TOKEN}"}
 
+# ETag cache for the GETs made on every rerun: a 304 carries no body and
+# doesn't count against the API rate limit.
+_ETAGS = {}
+
+def _get_json(url):
+    """GET with If-None-Match revalidation; returns (status, json or None)."""
+    cached = _ETAGS.get(url)
+    headers = {**HEADERS, "If-None-Match": cached[0]} if cached else HEADERS
+    resp = requests.get(url, headers=headers)
+    if resp.status_code == 304 and cached:
+        return 200, cached[1]
+    if resp.status_code != 200:
+        return resp.status_code, None
+    data = resp.json()
+    if resp.headers.get("ETag"):
+        _ETAGS[url] = (resp.headers["ETag"], data)
+    return 200, data
+
 def pull_database():
-    resp = requests.get(DB_URL, headers=HEADERS)
-    if resp.status_code == 200:
-        data = resp.json()
+    code, data = _get_json(DB_URL)
+    if code == 200:
         content = base64.b64decode(data["content"]).decode()
         sha     = data["sha"]
         with open(DATABASE_FILE,"w") as f: f.write(content)
@@ -33,9 +61,8 @@ def push_database(df, sha=None):
     return requests.put(DB_URL, headers=HEADERS, json=payload).status_code
 
 def pull_users():
-    resp = requests.get(USERS_URL, headers=HEADERS)
-    if resp.status_code == 200:
-        data = resp.json()
+    code, data = _get_json(USERS_URL)
+    if code == 200:
         content = base64.b64decode(data["content"]).decode()
         sha     = data["sha"]
         with open(USERS_FILE,"w") as f: f.write(content)
@@ -56,3 +83,197 @@ def push_users(df, sha=None):
     payload = {"message":"Update users.csv","content":content}
     if sha: payload["sha"] = sha
     return requests.put(USERS_URL, headers=HEADERS, json=payload).status_code
+
+# ── Binary blobs (content‑addressed, see blobstore.py) ──────────────────────
+# Each blob is committed once as blobs/<git sha>, so its path *is* its hash
+# and it is fetched through the git blobs API, which has no 1 MB cap.
+def blob_exists(sha):
+    return requests.head(f"{API_URL}/git/blobs/{sha}", headers=HEADERS).status_code == 200
+
+def pull_blob(sha):
+    resp = requests.get(f"{API_URL}/git/blobs/{sha}",
+                        headers={**HEADERS, "Accept": "application/vnd.github.raw+json"})
+    if resp.status_code != 200:
+        return None
+    if resp.headers.get("Content-Type", "").startswith("application/json"):
+        return base64.b64decode(resp.json()["content"])
+    return resp.content
+
+def push_blob(sha, data):
+    content = base64.b64encode(data).decode()
+    payload = {"message": f"Add blob {sha}", "content": content}
+    code = requests.put(f"{API_URL}/contents/{BLOBS_DIR}/{sha}", headers=HEADERS, json=payload).status_code
+    # 422 → the path already exists, i.e. someone stored the same content first
+    return 200 if code == 422 else code
+
+# ── Sharded database: db/<Tab>__<SubTab>.<format> ───────────────────────────
+# The listing of db/ on GitHub is the remote manifest (name → sha, one small
+# request); db/manifest.json records the sha of every shard we have on disk.
+# Pulls download only shards whose sha moved, saves upload only one shard.
+# The file extension is the record's format tag (see encode_table below).
+def shard_name(tab, subtab, fmt="csv"):
+    return f"{tab}__{subtab or ''}.{fmt}".replace("/", "-")
+
+def _shard_path(name):
+    return os.path.join(DB_DIR, name)
+
+def _load_manifest():
+    try:
+        with open(DB_MANIFEST) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_manifest(manifest):
+    os.makedirs(DB_DIR, exist_ok=True)
+    tmp = f"{DB_MANIFEST}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, DB_MANIFEST)
+
+def _write_shard(name, content):
+    os.makedirs(DB_DIR, exist_ok=True)
+    with open(_shard_path(name), "wb") as f:
+        f.write(content)
+
+def _find_shard(manifest, tab, subtab):
+    """Name of the stored shard for (tab, subtab), whatever its format."""
+    base = os.path.splitext(shard_name(tab, subtab))[0]
+    for name in manifest:
+        if os.path.splitext(name)[0] == base:
+            return name
+    return None
+
+def list_shards():
+    """Remote manifest {name: sha}; None if db/ does not exist yet."""
+    code, listing = _get_json(DB_DIR_URL)
+    if code == 200:
+        return {e["name"]: e["sha"] for e in listing if e.get("type") == "file"}
+    if code == 404:
+        return None
+    return _load_manifest()  # GitHub unreachable → keep what we have
+
+def _put_shard(name, content, sha=None):
+    payload = {"message": f"Update {DB_DIR}/{name}",
+               "content": base64.b64encode(content).decode()}
+    if sha: payload["sha"] = sha
+    return requests.put(f"{DB_DIR_URL}/{quote(name)}", headers=HEADERS, json=payload)
+
+def _delete_shard(name, sha):
+    payload = {"message": f"Remove {DB_DIR}/{name}", "sha": sha}
+    return requests.delete(f"{DB_DIR_URL}/{quote(name)}", headers=HEADERS, json=payload).status_code
+
+_NO_LEGACY = False   # set once this process has found no database.csv to migrate
+
+def migrate_database():
+    """One‑time split of the legacy database.csv into db/ shards."""
+    global _NO_LEGACY
+    if _NO_LEGACY:
+        return {}
+    df, sha = pull_database()
+    if sha is None:
+        # a fresh repository: nothing to split, and no need to look again
+        _NO_LEGACY = True
+        return {}
+    for _, row in df.iterrows():
+        subtab = row["SubTab"] if isinstance(row["SubTab"], str) else ""
+        data   = row["Data"] if isinstance(row["Data"], str) else ""
+        # 422 → another session migrated this shard first; theirs wins
+        _put_shard(shard_name(row["Tab"], subtab), data.encode())
+    return list_shards() or {}
+
+def pull_shards():
+    """Bring db/ up to date with GitHub and return the local manifest."""
+    remote = list_shards()
+    if remote is None:
+        remote = migrate_database()
+    manifest = _load_manifest()
+    changed = False
+    for name, sha in remote.items():
+        if manifest.get(name) == sha and os.path.exists(_shard_path(name)):
+            continue
+        data = pull_blob(sha)
+        if data is None:
+            continue
+        _write_shard(name, data)
+        manifest[name] = sha
+        changed = True
+    for name in set(manifest) - set(remote):
+        if os.path.exists(_shard_path(name)):
+            os.remove(_shard_path(name))
+        del manifest[name]
+        changed = True
+    if changed:
+        _save_manifest(manifest)
+    return manifest
+
+def read_shard(tab, subtab=""):
+    """Local contents (bytes) of a shard as last pulled/pushed, or None."""
+    name = _find_shard(_load_manifest(), tab, subtab)
+    if name is None or not os.path.exists(_shard_path(name)):
+        return None
+    with open(_shard_path(name), "rb") as f:
+        return f.read()
+
+def push_shard(tab, subtab, content, fmt="csv"):
+    """Upload a single shard; returns the HTTP status code."""
+    if isinstance(content, str):
+        content = content.encode()
+    name = shard_name(tab, subtab, fmt)
+    manifest = _load_manifest()
+    resp = _put_shard(name, content, manifest.get(name))
+    if resp.status_code in (409, 422):
+        # our sha is stale → overwrite the latest, as whole‑database saves did
+        resp = _put_shard(name, content, (list_shards() or {}).get(name))
+    if resp.status_code in (200, 201):
+        _write_shard(name, content)
+        manifest = _load_manifest()
+        manifest[name] = resp.json()["content"]["sha"]
+        # the record changed format → drop the copy in the old one
+        old = _find_shard({k: v for k, v in manifest.items() if k != name}, tab, subtab)
+        if old:
+            _delete_shard(old, manifest.pop(old))
+            if os.path.exists(_shard_path(old)):
+                os.remove(_shard_path(old))
+        _save_manifest(manifest)
+    return resp.status_code
+
+# ── Table records ────────────────────────────────────────────────────────────
+# Tables are stored as zstd‑compressed Parquet when pyarrow is available
+# (it ships with streamlit): dtypes survive the round trip and the payload
+# is several times smaller than CSV even after Base64.  CSV records written
+# by older versions are still read transparently.
+try:
+    import pyarrow  # noqa: F401
+    TABLE_FORMAT = "parquet"
+except ImportError:
+    TABLE_FORMAT = "csv"
+
+def encode_table(df, fmt=TABLE_FORMAT):
+    """Serialize `df`; returns (bytes, format actually used)."""
+    if fmt == "parquet":
+        try:
+            buf = io.BytesIO()
+            df.to_parquet(buf, index=False, compression="zstd")
+            return buf.getvalue(), "parquet"
+        except (ValueError, TypeError, NotImplementedError):
+            pass  # mixed‑type object columns can't be typed by Arrow → keep CSV
+    return df.to_csv(index=False).encode(), "csv"
+
+def decode_table(data, fmt="csv"):
+    if fmt == "parquet":
+        return pd.read_parquet(io.BytesIO(data))
+    return pd.read_csv(io.BytesIO(data))
+
+def read_table(tab, subtab):
+    """Stored table for (tab, subtab) as a DataFrame, or None."""
+    name = _find_shard(_load_manifest(), tab, subtab)
+    if name is None or not os.path.exists(_shard_path(name)):
+        return None
+    with open(_shard_path(name), "rb") as f:
+        data = f.read()
+    return decode_table(data, os.path.splitext(name)[1].lstrip(".")) if data else None
+
+def push_table(tab, subtab, df, fmt=TABLE_FORMAT):
+    data, fmt = encode_table(df, fmt)
+    return push_shard(tab, subtab, data, fmt)
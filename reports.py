@@ -0,0 +1,226 @@
+# reports.py
+import base64
+import hashlib
+import html
+import io
+import itertools
+import re
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+
+import matplotlib
+import matplotlib.image
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from plots import plot_beam_diagram, plot_sfd, plot_bmd
+
+# ── Templates ────────────────────────────────────────────────────────────────
+# name → (rows shown per table — None for all, include figures, include detailed content)
+TEMPLATES = {
+    "Standard": (50, True, True),
+    "Executive Summary": (10, False, False),
+    "Detailed Analysis": (None, True, True),
+}
+
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>$title</title><style>%s</style></head>
+<body><header><h1>$title</h1><p class="meta">$date · $author · $template</p></header>
+$body
+</body></html>"""
+_CSS = ("body{font-family:Helvetica,Arial,sans-serif;margin:2em auto;max-width:60em;color:#222}"
+        "h1{border-bottom:3px solid #1f4e79;padding-bottom:.2em}.meta{color:#666}"
+        "table{border-collapse:collapse;font-size:.8em;margin:.5em 0 1.5em}"
+        "th,td{border:1px solid #ccc;padding:.2em .5em;text-align:right}th{background:#eef2f7}"
+        "figure{margin:1em 0}img{max-width:100%}.note{color:#666;font-style:italic}"
+        "@media print{section{page-break-inside:avoid}}")
+_ACCENT = {"Standard": "", "Executive Summary": "h1{border-color:#2e7d32}",
+           "Detailed Analysis": "h1{border-color:#8e2430}table{font-size:.7em}"}
+_TEMPLATES = {}   # name → compiled page Template
+
+def _template(name):
+    if name not in _TEMPLATES:
+        _TEMPLATES[name] = Template(_PAGE % (_CSS + _ACCENT.get(name, "")))
+    return _TEMPLATES[name]
+
+# ── Figure cache ─────────────────────────────────────────────────────────────
+# Beam diagrams keyed by the beam's content, drawn once in the UI thread;
+# PNG bytes are rendered on first use by whichever report needs them.  A
+# queued report holds its own entries, so eviction never takes them away.
+_FIGURES = {}      # key → [(caption, Figure, png bytes or None), ...]
+_MAX_FIGURES = 16
+_MPL_LOCK = threading.RLock()   # one matplotlib renderer at a time across workers
+
+def beam_figures(beam, show_dimensions=True):
+    """Analyse `beam` and cache its schematic, SFD and BMD; returns the cache key."""
+    beam.analyze()
+    digest = hashlib.sha1(repr((beam.length, beam.supports, show_dimensions)).encode())
+    for kind in ("point", "udl"):
+        digest.update(np.ascontiguousarray(beam.load_array(kind)[1]).tobytes())
+    key = digest.hexdigest()
+    if key not in _FIGURES:
+        figs = [("Beam Schematic", plot_beam_diagram(beam, show_dimensions)),
+                ("Shear Force Diagram", plot_sfd(beam)), ("Bending Moment Diagram", plot_bmd(beam))]
+        for _, fig in figs:
+            plt.close(fig)   # keep them out of pyplot's registry; the Figure still renders
+        _FIGURES[key] = [[caption, fig, None] for caption, fig in figs]
+        while len(_FIGURES) > _MAX_FIGURES:
+            _FIGURES.pop(next(iter(_FIGURES)))
+    return key
+
+def _figure_png(entry):
+    with _MPL_LOCK:
+        if entry[2] is None:
+            buf = io.BytesIO()
+            entry[1].savefig(buf, format="png", dpi=150, bbox_inches="tight")
+            entry[2] = buf.getvalue()
+    return entry[2]
+
+# ── HTML ─────────────────────────────────────────────────────────────────────
+def _fmt(v):
+    return f"{v:,.3f}".rstrip("0").rstrip(".") if isinstance(v, float) else v
+
+def _render_html(spec, progress):
+    max_rows, with_figures, with_content = TEMPLATES.get(spec["template"], TEMPLATES["Standard"])
+    esc = lambda s: html.escape(str(s))
+    parts = [f"<section><h2>Summary</h2><p>{esc(spec['summary'])}</p></section>"]
+    if with_content and spec["content"]:
+        parts.append("<section><h2>Details</h2>" + "".join(f"<p>{esc(p)}</p>" for p in spec["content"].split("\n\n")) + "</section>")
+    if with_figures:
+        for entry in spec["figures"]:
+            png = base64.b64encode(_figure_png(entry)).decode()
+            parts.append(f'<figure><img src="data:image/png;base64,{png}" alt="{esc(entry[0])}">'
+                         f"<figcaption>{esc(entry[0])}</figcaption></figure>")
+            progress(1)
+    for caption, df in spec["tables"]:
+        shown = df if max_rows is None else df.head(max_rows)
+        note = f'<p class="note">{len(df) - len(shown):,} more rows not shown.</p>' if len(shown) < len(df) else ""
+        parts.append(f"<section><h2>{esc(caption)}</h2>"
+                     + shown.to_html(index=False, na_rep="", formatters={c: _fmt for c in shown.columns}) + note
+                     + "</section>")
+        progress(1)
+    page = _template(spec["template"]).substitute(
+        title=esc(spec["title"]), date=esc(spec["date"]), author=esc(spec["author"]),
+        template=esc(spec["template"]), body="\n".join(parts))
+    return page.encode("utf-8")
+
+# ── PDF ──────────────────────────────────────────────────────────────────────
+# Pages are drawn with the PDF core fonts (no per‑glyph TrueType layout,
+# ~20× faster for text‑heavy pages), which only cover cp1252.
+_PDF_CHARS = str.maketrans({"≤": "<=", "≥": ">=", "φ": "phi", "√": "sqrt", "‑": "-", "—": "-", "–": "-",
+                            "→": "->", "≃": "~", "ₘ": "m", "ₐ": "a", "ₓ": "x", "…": "..."})
+PORTRAIT, LANDSCAPE = (8.27, 11.69), (11.69, 8.27)
+TABLE_ROWS_PER_PAGE = 60
+TEXT_LINES_PER_PAGE = 62
+
+def _pdf_text(s):
+    return str(s).translate(_PDF_CHARS).encode("cp1252", "replace").decode("cp1252")
+
+def _text_page(pdf, lines, heading=None):
+    fig = Figure(figsize=PORTRAIT)
+    top = 0.95
+    if heading:
+        fig.text(0.08, top, _pdf_text(heading), fontsize=14, weight="bold", va="top")
+        top -= 0.04
+    fig.text(0.08, top, _pdf_text("\n".join(lines)), fontsize=9, family="Courier", weight="medium",
+             va="top", linespacing=1.3)
+    pdf.savefig(fig)
+
+def _render_pdf(spec, progress):
+    max_rows, with_figures, with_content = TEMPLATES.get(spec["template"], TEMPLATES["Standard"])
+    wrap = lambda text: [l for p in str(text).split("\n") for l in (textwrap.wrap(p, 90) or [""])]
+    with _MPL_LOCK, matplotlib.rc_context({"pdf.use14corefonts": True}):
+        buf = io.BytesIO()
+        with PdfPages(buf, metadata={"Title": spec["title"], "Author": spec["author"]}) as pdf:
+            # title page with the summary
+            fig = Figure(figsize=PORTRAIT)
+            fig.text(0.08, 0.90, _pdf_text(spec["title"]), fontsize=22, weight="bold", va="top")
+            fig.text(0.08, 0.85, _pdf_text(f"{spec['date']}  |  {spec['author']}  |  {spec['template']}"),
+                     fontsize=10, weight="medium", va="top")
+            fig.text(0.08, 0.78, _pdf_text("\n".join(wrap(spec["summary"])[:TEXT_LINES_PER_PAGE - 12])),
+                     fontsize=9, family="Courier", weight="medium", va="top", linespacing=1.3)
+            pdf.savefig(fig)
+            progress(1)
+            if with_content and spec["content"]:
+                lines = wrap(spec["content"])
+                for i in range(0, len(lines), TEXT_LINES_PER_PAGE):
+                    _text_page(pdf, lines[i:i + TEXT_LINES_PER_PAGE], "Details" if i == 0 else None)
+                    progress(1)
+            if with_figures:
+                # the cached PNGs, so each diagram is rasterised once for every report and format
+                for entry in spec["figures"]:
+                    image = matplotlib.image.imread(io.BytesIO(_figure_png(entry)))
+                    fig = Figure(figsize=PORTRAIT)
+                    fig.text(0.08, 0.95, _pdf_text(entry[0]), fontsize=14, weight="bold", va="top")
+                    ax = fig.add_axes([0.08, 0.35, 0.84, 0.55])
+                    ax.imshow(image)
+                    ax.axis("off")
+                    pdf.savefig(fig)
+                    progress(1)
+            for caption, df in spec["tables"]:
+                shown = df if max_rows is None else df.head(max_rows)
+                pages = max(-(-len(shown) // TABLE_ROWS_PER_PAGE), 1)
+                for p in range(pages):
+                    chunk = shown.iloc[p * TABLE_ROWS_PER_PAGE:(p + 1) * TABLE_ROWS_PER_PAGE]
+                    fig = Figure(figsize=LANDSCAPE)
+                    title = caption if pages == 1 else f"{caption} ({p + 1}/{pages})"
+                    fig.text(0.04, 0.95, _pdf_text(title), fontsize=12, weight="bold", va="top")
+                    body = chunk.to_string(index=False, na_rep="", max_colwidth=28,
+                                           formatters={c: _fmt for c in chunk.columns})
+                    if p == pages - 1 and len(shown) < len(df):
+                        body += f"\n\n{len(df) - len(shown):,} more rows not shown."
+                    fig.text(0.04, 0.91, _pdf_text(body), fontsize=7, family="Courier", weight="medium", va="top")
+                    pdf.savefig(fig)
+                    progress(1)
+    return buf.getvalue()
+
+# ── Background jobs ──────────────────────────────────────────────────────────
+FORMATS = {"HTML": ("html", "text/html", _render_html), "PDF": ("pdf", "application/pdf", _render_pdf)}
+_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report")
+_JOBS = {}        # id → (future, spec)
+_PROGRESS = {}    # id → parts rendered
+_MAX_JOBS = 50
+_ids = itertools.count(1)
+
+def queue_report(title, date, author, template, summary, content, figures=None, tables=(), fmt="PDF"):
+    """
+    Queue a report for rendering in the worker pool and return its job id.
+    `figures` is a beam_figures key, resolved here so the job holds its
+    figures even after the cache evicts them; `tables` are (caption,
+    DataFrame) pairs, copied so later edits in the session don't leak into
+    the document.
+    """
+    spec = {"title": title or "Untitled Report", "date": str(date), "author": author or "", "template": template,
+            "summary": summary or "", "content": content or "", "figures": _FIGURES.get(figures, []), "format": fmt,
+            "tables": [(caption, df.copy()) for caption, df in tables if df is not None and len(df)]}
+    job = next(_ids)
+    _PROGRESS[job] = 0
+    def progress(n):
+        _PROGRESS[job] += n
+    _JOBS[job] = (_POOL.submit(FORMATS[fmt][2], spec, progress), spec)
+    # forget the oldest finished jobs
+    for old in [j for j, (f, _) in _JOBS.items() if f.done()][:max(len(_JOBS) - _MAX_JOBS, 0)]:
+        _JOBS.pop(old)
+        _PROGRESS.pop(old, None)
+    return job
+
+def report_status(job):
+    """(status, parts rendered) — status is Queued, Rendering, Ready, Failed: … or Expired."""
+    if job not in _JOBS:
+        return "Expired", 0
+    future, _ = _JOBS[job]
+    if future.done():
+        error = future.exception()
+        return ("Ready" if error is None else f"Failed: {error}"), _PROGRESS.get(job, 0)
+    return ("Rendering" if future.running() else "Queued"), _PROGRESS.get(job, 0)
+
+def report_file(job):
+    """(bytes, file name, MIME type) of a finished report."""
+    future, spec = _JOBS[job]
+    ext, mime, _ = FORMATS[spec["format"]]
+    name = re.sub(r"[^\w-]+", "_", spec["title"]).strip("_") or "report"
+    return future.result(), f"{name}.{ext}", mime
@@ -0,0 +1,398 @@
+# scheduling.py
+import numpy as np
+import pandas as pd
+
+def parse_predecessors(value):
+    """'A, B' (or a list) → ['A', 'B']; blanks → []."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(v).strip() for v in value if str(v).strip()]
+
+def _objects(values):
+    """1‑D object array of `values`, keeping list entries whole."""
+    values = list(values)
+    return np.fromiter(values, dtype=object, count=len(values))
+
+class CPMSchedule:
+    """
+    Critical Path Method over an activity‑on‑node network.
+
+    Tasks are layered so that every dependency points to a strictly higher
+    level (Kahn's topological sort, O(V+E)); the forward pass then processes
+    the edges level by level with vectorised max‑reductions.  The backward
+    pass stores each task's *tail* — the longest path from its start to the
+    end of the project — so late dates follow from LS = T − tail without
+    depending on the project duration T.  After a change to one task only
+    the levels that can see it are re‑run: its successors' levels forward,
+    its predecessors' levels backward.
+    """
+
+    def __init__(self, tasks=(), durations=(), predecessors=None, release=None):
+        tasks = list(tasks)
+        self._build(tasks, durations, predecessors or [[] for _ in tasks], release)
+
+    # ── Construction ──────────────────────────────────────────────────────
+    def _build(self, tasks, durations, predecessors, release):
+        self.ids = [str(t) for t in tasks]
+        self.index = {t: i for i, t in enumerate(self.ids)}
+        if len(self.index) != len(self.ids):
+            dupes = sorted({t for t in self.ids if self.ids.count(t) > 1})
+            raise ValueError(f"Duplicate task names: {', '.join(dupes[:10])}")
+        n = len(self.ids)
+        self.dur = np.asarray(durations, dtype=float).copy()
+        self.release = np.zeros(n) if release is None else np.asarray(release, dtype=float).copy()
+        self.preds = [self._resolve(p, i) for i, p in enumerate(predecessors)]
+        self._pred_text = _objects(predecessors)   # as given, so sync can spot edits without parsing
+        self._edges()
+        self.level = self._levels()
+        self.es = np.zeros(n)
+        self._succmax = np.zeros(n)
+        self._group()
+        self._forward(0)
+        self._backward(self.max_level)
+
+    def _resolve(self, names, i):
+        out = []
+        for name in parse_predecessors(names):
+            j = self.index.get(name)
+            if j is None:
+                raise ValueError(f"Unknown predecessor '{name}' for task '{self.ids[i]}'.")
+            if j == i:
+                raise ValueError(f"Task '{name}' cannot depend on itself.")
+            out.append(j)
+        return sorted(set(out))
+
+    def _edges(self):
+        lens = np.fromiter(map(len, self.preds), dtype=np.int64, count=len(self.preds))
+        self.src = (np.fromiter((j for p in self.preds for j in p), dtype=np.int64, count=int(lens.sum()))
+                    if lens.size else np.empty(0, np.int64))
+        self.dst = np.repeat(np.arange(len(self.preds)), lens)
+
+    def _levels(self):
+        """Longest‑path level of every task by frontier‑at‑a‑time Kahn; raises on a cycle."""
+        n = len(self.ids)
+        indeg = np.bincount(self.dst, minlength=n)
+        by_src = np.argsort(self.src, kind="stable")
+        indptr = np.searchsorted(self.src[by_src], np.arange(n + 1))
+        level = np.full(n, -1)
+        frontier, k = np.flatnonzero(indeg == 0), 0
+        while frontier.size:
+            level[frontier] = k
+            starts, counts = indptr[frontier], indptr[frontier + 1] - indptr[frontier]
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            targets = self.dst[by_src[offsets + np.arange(counts.sum())]]
+            np.subtract.at(indeg, targets, 1)
+            frontier = np.unique(targets[indeg[targets] == 0])
+            k += 1
+        if (level < 0).any():
+            stuck = [self.ids[i] for i in np.flatnonzero(level < 0)[:10]]
+            raise ValueError(f"Dependency cycle among: {', '.join(stuck)}")
+        return level
+
+    def _group(self):
+        """Edges ordered by destination level (forward) and by source level (backward)."""
+        self.max_level = int(self.level.max()) if len(self.level) else -1
+        bounds = np.arange(self.max_level + 2)
+        dl, sl = self.level[self.dst], self.level[self.src]
+        self._fwd = np.argsort(dl, kind="stable")
+        self._fwd_b = np.searchsorted(dl[self._fwd], bounds)
+        self._bwd = np.argsort(sl, kind="stable")
+        self._bwd_b = np.searchsorted(sl[self._bwd], bounds)
+
+    # ── Passes ────────────────────────────────────────────────────────────
+    def _forward(self, L):
+        """Recompute early starts of every task at level ≥ L."""
+        redo = self.level >= L
+        self.es[redo] = self.release[redo]
+        for k in range(max(L, 1), self.max_level + 1):
+            e = self._fwd[self._fwd_b[k]:self._fwd_b[k + 1]]
+            s = self.src[e]
+            np.maximum.at(self.es, self.dst[e], self.es[s] + self.dur[s])
+
+    def _backward(self, L):
+        """Recompute tails of every task at level ≤ L."""
+        self._succmax[self.level <= L] = 0.0
+        for k in range(min(L, self.max_level - 1), -1, -1):
+            e = self._bwd[self._bwd_b[k]:self._bwd_b[k + 1]]
+            d = self.dst[e]
+            np.maximum.at(self._succmax, self.src[e], self.dur[d] + self._succmax[d])
+
+    # ── Incremental edits ─────────────────────────────────────────────────
+    def set_duration(self, task, duration):
+        i = self.index[task]
+        self.dur[i] = duration
+        L = self.level[i]
+        self._forward(L + 1)
+        self._backward(L - 1)
+
+    def set_release(self, task, offset):
+        """Earliest allowed start (days from the project start)."""
+        i = self.index[task]
+        self.release[i] = offset
+        self._forward(self.level[i])
+
+    def set_predecessors(self, task, predecessors):
+        i = self.index[task]
+        old, new = self.preds[i], self._resolve(predecessors, i)
+        old_text = self._pred_text[i]
+        self.preds[i] = new
+        self._pred_text[i] = predecessors
+        self._edges()
+        if all(self.level[j] < self.level[i] for j in new):
+            # layering still valid: only i's successors and both old and new predecessors move
+            self._group()
+            self._forward(self.level[i])
+            self._backward(max((self.level[j] for j in old + new), default=-1))
+            return
+        try:
+            self.level = self._levels()
+        except ValueError:
+            self.preds[i] = old
+            self._pred_text[i] = old_text
+            self._edges()
+            raise
+        self._group()
+        self._forward(0)
+        self._backward(self.max_level)
+
+    def add_task(self, task, duration, predecessors=(), release=0.0):
+        task = str(task)
+        if task in self.index:
+            raise ValueError(f"Duplicate task names: {task}")
+        i = len(self.ids)
+        self.ids.append(task)
+        self.index[task] = i
+        self.preds.append([])
+        try:
+            self.preds[i] = self._resolve(predecessors, i)
+        except ValueError:
+            self.ids.pop(), self.preds.pop(), self.index.pop(task)
+            raise
+        level = max((self.level[j] for j in self.preds[i]), default=-1) + 1
+        self._pred_text = np.concatenate([self._pred_text, _objects([predecessors])])
+        self.dur = np.append(self.dur, float(duration))
+        self.release = np.append(self.release, float(release))
+        self.level = np.append(self.level, level)
+        self.es = np.append(self.es, 0.0)
+        self._succmax = np.append(self._succmax, 0.0)
+        self._edges()
+        self._group()
+        self._forward(level)
+        self._backward(level - 1)
+
+    def sync(self, tasks, durations, predecessors, release=None, max_edits=64):
+        """
+        Bring the schedule in line with a full task list.  Appended tasks and
+        changed durations / predecessors / release dates of existing tasks are
+        applied incrementally; removals, reordering or a large batch of edits
+        rebuild.  Returns the number of incremental edits (-1 for a rebuild).
+        """
+        tasks = list(map(str, tasks))
+        durations = np.asarray(durations, dtype=float)
+        release = np.zeros(len(tasks)) if release is None else np.asarray(release, dtype=float)
+        predecessors = _objects(predecessors)
+        n = len(self.ids)
+        if tasks[:n] != self.ids:
+            self._build(tasks, durations, predecessors, release)
+            return -1
+        edits = []
+        for i in np.flatnonzero(durations[:n] != self.dur):
+            edits.append((self.set_duration, self.ids[i], durations[i]))
+        for i in np.flatnonzero(release[:n] != self.release):
+            edits.append((self.set_release, self.ids[i], release[i]))
+        # only entries whose text differs are parsed (and then only edited if the set differs);
+        # x != x marks NaN cells, which never compare equal
+        old, new = self._pred_text, predecessors[:n]
+        for i in np.flatnonzero((new != old) & ~((new != new) & (old != old))):
+            if set(parse_predecessors(new[i])) != {self.ids[j] for j in self.preds[i]}:
+                edits.append((self.set_predecessors, self.ids[i], new[i]))
+        for i in range(n, len(tasks)):
+            edits.append((self.add_task, tasks[i], durations[i], predecessors[i], release[i]))
+        if len(edits) > max_edits:
+            self._build(tasks, durations, predecessors, release)
+            return -1
+        try:
+            for edit, *args in edits:
+                edit(*args)
+            self._pred_text = predecessors
+        except ValueError:
+            # e.g. a new task referencing one added after it — the full build sorts it out (or raises)
+            self._build(tasks, durations, predecessors, release)
+            return -1
+        return len(edits)
+
+    # ── Results ───────────────────────────────────────────────────────────
+    @property
+    def project_duration(self):
+        return float((self.es + self.dur).max()) if len(self.ids) else 0.0
+
+    def results(self):
+        """Early/late dates (days from the project start), floats and the critical flag per task."""
+        T = self.project_duration
+        ef = self.es + self.dur
+        tail = self.dur + self._succmax
+        ls = T - tail
+        next_es = np.full(len(self.ids), T)
+        np.minimum.at(next_es, self.src, self.es[self.dst])
+        total_float = ls - self.es
+        return pd.DataFrame({
+            "Task": self.ids,
+            "Duration (days)": self.dur,
+            "Early Start": self.es,
+            "Early Finish": ef,
+            "Late Start": ls,
+            "Late Finish": ls + self.dur,
+            "Total Float": total_float,
+            "Free Float": next_es - ef,
+            "Critical": np.isclose(total_float, 0.0, atol=1e-9),
+        })
+
+    def critical_path(self):
+        """Critical tasks in early‑start order."""
+        r = self.results()
+        return r.loc[r["Critical"]].sort_values(["Early Start", "Early Finish"])["Task"].tolist()
+
+def schedule_inputs(df):
+    """
+    (tasks, durations, predecessors, release offsets, project start) from a
+    scheduling table.  Duration defaults to End − Start; release is the
+    entered Start Date measured from the earliest one.
+    """
+    start = pd.to_datetime(df["Start Date"], errors="coerce")
+    end = pd.to_datetime(df["End Date"], errors="coerce")
+    given = pd.to_numeric(df["Duration (days)"], errors="coerce") if "Duration (days)" in df else np.nan
+    duration = pd.Series(given, index=df.index).fillna((end - start).dt.days).fillna(0).clip(lower=0)
+    project_start = start.min()
+    release = ((start - project_start).dt.days if pd.notna(project_start) else pd.Series(0, index=df.index))
+    preds = df["Predecessors"] if "Predecessors" in df else pd.Series([None] * len(df), index=df.index)
+    return (df["Task"].astype(str).tolist(), duration.to_numpy(dtype=float), preds.tolist(),
+            release.fillna(0).to_numpy(dtype=float), project_start)
+
+# ── Resources ────────────────────────────────────────────────────────────────
+# Leveling results keyed by a hash of their inputs; shared by every session.
+_PLANS = {}
+_PLANS_MAX = 16
+
+def resource_histogram(starts, ends, codes, qty, n_resources, horizon):
+    """
+    Daily usage (resources × days) of allocations using `qty` of resource
+    `codes[i]` every day in [starts[i], ends[i]) — a difference array per
+    resource, +q at the start and −q at the end, then one cumulative sum.
+    """
+    diff = np.zeros((n_resources, horizon + 1))
+    np.add.at(diff, (codes, np.clip(starts, 0, horizon)), qty)
+    np.add.at(diff, (codes, np.clip(ends, 0, horizon)), -qty)
+    return np.cumsum(diff, axis=1)[:, :horizon]
+
+def _plan_key(cpm, allocations, capacity):
+    h = pd.util.hash_pandas_object
+    parts = [h(pd.Series(cpm.ids), index=False).to_numpy(), cpm.dur, cpm.release, cpm.src, cpm.dst,
+             h(allocations[["Resource", "Assigned Task", "Quantity"]].astype(str), index=False).to_numpy(),
+             h(pd.Series(capacity, dtype=float).sort_index()).to_numpy()]
+    return hash(b"".join(np.ascontiguousarray(p).tobytes() for p in parts))
+
+def _level_cost(u, cap, overload_weight=1e4):
+    return overload_weight * np.maximum(u - cap, 0.0) ** 2 + u ** 2
+
+def level_resources(cpm, allocations, capacity=None, max_passes=5):
+    """
+    Resource leveling within total float.
+
+    `cpm` is a CPMSchedule; `allocations` has Resource, Assigned Task and
+    Quantity (units per working day of the task); `capacity` maps a
+    resource to its daily limit (missing → unlimited: the histogram is only
+    smoothed).  Tasks only move inside the gap left by their predecessors
+    and successors, so precedence holds and the project finish never moves.
+    Tasks still sitting on an over‑allocated day are flagged.
+
+    Returns a dict of DataFrames: schedule (per task), before / after
+    (daily histograms, one column per resource) and overallocation (per
+    resource).  Cached until the schedule, allocations or capacities change.
+    """
+    capacity = {str(k): float(v) for k, v in (capacity or {}).items() if pd.notna(v)}
+    key = _plan_key(cpm, allocations, capacity)
+    if key in _PLANS:
+        return _PLANS[key]
+
+    results = cpm.results()
+    tasks = pd.Index(results["Task"].astype(str))
+    es = np.floor(results["Early Start"].to_numpy(float)).astype(int)
+    dur = np.ceil(results["Duration (days)"].to_numpy(float)).astype(int)
+    ls = np.maximum(np.floor(results["Late Start"].to_numpy(float)).astype(int), es)
+    horizon = int((es + dur).max()) if len(es) else 0
+
+    alloc = allocations.assign(
+        _task=tasks.get_indexer(allocations["Assigned Task"].astype(str)),
+        _qty=pd.to_numeric(allocations["Quantity"], errors="coerce").fillna(0.0))
+    alloc = alloc[alloc["_task"] >= 0]
+    names = pd.Index(sorted(alloc["Resource"].astype(str).unique()))
+    codes = names.get_indexer(alloc["Resource"].astype(str))
+    t_idx, qty = alloc["_task"].to_numpy(), alloc["_qty"].to_numpy(float)
+    cap = np.array([capacity.get(r, np.inf) for r in names])
+
+    before = resource_histogram(es[t_idx], es[t_idx] + dur[t_idx], codes, qty, len(names), horizon)
+
+    # per‑task resource demand as (codes, quantities), summed over duplicate rows
+    demand = pd.DataFrame({"t": t_idx, "r": codes, "q": qty}).groupby(["t", "r"])["q"].sum()
+    by_task = {t: (g.index.get_level_values("r").to_numpy(), g.to_numpy())
+               for t, g in demand.groupby(level="t")} if len(demand) else {}
+
+    # Burgess‑style improvement: starting from early starts, move each task
+    # (latest first) to the start between its predecessors' finish and its
+    # successors' start that most lowers Σ W·overload² + usage².  Every move
+    # strictly improves, so leveling never makes the histogram worse.
+    n = len(es)
+    succs = [[] for _ in range(n)]
+    for i, p in enumerate(cpm.preds):
+        for j in p:
+            succs[j].append(i)
+    start = es.copy()
+    usage = np.zeros((len(names), horizon + 1))
+    usage[:, :horizon] = before
+    order = np.lexsort((-cpm.level, -es))
+    for _ in range(max_passes):
+        moved = 0
+        for t in order:
+            if t not in by_task or dur[t] == 0:
+                continue
+            lo = max([es[t], *(start[p] + dur[p] for p in cpm.preds[t])])
+            hi = min([horizon, *(start[s] for s in succs[t])]) - dur[t]
+            if hi <= lo:
+                continue
+            r, q = by_task[t]
+            q = q[:, None]
+            usage[r, start[t]:start[t] + dur[t]] -= q
+            seg = usage[r, lo:hi + dur[t]]
+            delta = (_level_cost(seg + q, cap[r, None]) - _level_cost(seg, cap[r, None])).sum(axis=0)
+            c = np.concatenate([[0.0], np.cumsum(delta)])
+            cost = c[dur[t]:] - c[:-dur[t]]
+            best = lo + int(cost.argmin())
+            if cost[best - lo] < cost[start[t] - lo] - 1e-9:
+                start[t] = best
+                moved += 1
+            usage[r, start[t]:start[t] + dur[t]] += q
+        if not moved:
+            break
+    over = usage[:, :horizon] > cap[:, None] + 1e-9
+    unresolved = np.array([t in by_task and bool(over[by_task[t][0], start[t]:start[t] + dur[t]].any())
+                           for t in range(n)], dtype=bool)
+    after = resource_histogram(start[t_idx], start[t_idx] + dur[t_idx], codes, qty, len(names), horizon)
+
+    days = pd.RangeIndex(horizon, name="Day")
+    plan = {
+        "schedule": pd.DataFrame({"Task": tasks, "Early Start": es, "Levelled Start": start,
+                                  "Shift (days)": start - es, "Total Float": ls - es,
+                                  "Unresolved": unresolved}),
+        "before": pd.DataFrame(before.T, index=days, columns=names),
+        "after": pd.DataFrame(after.T, index=days, columns=names),
+        "overallocation": pd.DataFrame({
+            "Resource": names, "Capacity": cap,
+            "Peak Before": before.max(axis=1, initial=0), "Days Over Before": (before > cap[:, None] + 1e-9).sum(axis=1),
+            "Peak After": after.max(axis=1, initial=0), "Days Over After": (after > cap[:, None] + 1e-9).sum(axis=1)}),
+    }
+    if len(_PLANS) >= _PLANS_MAX:
+        _PLANS.pop(next(iter(_PLANS)))
+    _PLANS[key] = plan
+    return plan
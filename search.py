@@ -0,0 +1,147 @@
+# search.py
+"""
+Full‑text index over reports, messages, tasks and documents.
+
+A local SQLite FTS5 table (porter‑stemmed, BM25‑ranked) kept up to date
+entry by entry: every add upserts its row, nothing is ever rebuilt.  Each
+entry is identified by (kind, key) — a task id, a message's line number, a
+document's blob hash, a hash of a report's text.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+
+SEARCH_DB = "uploads/search.db"
+KINDS = ["Report", "Message", "Task", "Document"]
+MAX_CANDIDATES = 5000
+
+_local = threading.local()   # sqlite connections can't cross threads; one per thread
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (id INTEGER PRIMARY KEY, kind TEXT NOT NULL, key TEXT NOT NULL,
+                                    UNIQUE(kind, key));
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(title, body, tokenize='porter unicode61', prefix='2 3');
+CREATE TABLE IF NOT EXISTS sources (kind TEXT, source TEXT, rows INTEGER, PRIMARY KEY (kind, source));
+"""
+
+def _db():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(SEARCH_DB), exist_ok=True)
+        conn = sqlite3.connect(SEARCH_DB, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+def text_key(*parts):
+    """Stable key for entries without an id of their own (e.g. reports)."""
+    return hashlib.sha1("\x1f".join(map(str, parts)).encode()).hexdigest()
+
+def index_many(kind, rows):
+    """Add or replace (key, title, body) entries of one kind in a single transaction."""
+    rows = {str(k): ("" if t is None else str(t), "" if b is None else str(b)) for k, t, b in rows}
+    if not rows:
+        return
+    with _db() as conn:
+        conn.executemany("INSERT OR IGNORE INTO entries(kind, key) VALUES (?, ?)", [(kind, k) for k in rows])
+        ids = dict(conn.execute("SELECT key, id FROM entries WHERE kind = ? AND key IN (SELECT value FROM json_each(?))",
+                                (kind, json.dumps(list(rows)))))
+        conn.executemany("DELETE FROM entries_fts WHERE rowid = ?", [(i,) for i in ids.values()])
+        conn.executemany("INSERT INTO entries_fts(rowid, title, body) VALUES (?, ?, ?)",
+                         [(ids[k], t, b) for k, (t, b) in rows.items()])
+
+def index(kind, key, title, body=""):
+    index_many(kind, [(key, title, body)])
+
+def remove(kind, key):
+    with _db() as conn:
+        row = conn.execute("SELECT id FROM entries WHERE kind = ? AND key = ?", (kind, str(key))).fetchone()
+        if row:
+            conn.execute("DELETE FROM entries_fts WHERE rowid = ?", row)
+            conn.execute("DELETE FROM entries WHERE id = ?", row)
+
+def index_frame(kind, df, key, title, body=()):
+    """Index every row of a table: `key`/`title` are column names, `body` more columns to search."""
+    if df is None or not len(df) or key not in df:
+        return
+    column = lambda c: df[c].fillna("").astype(str).tolist()
+    keys = column(key)
+    titles = column(title) if title in df else keys
+    cols = [column(c) for c in body if c in df]
+    text = [" · ".join(filter(None, parts)) for parts in zip(*cols)] if cols else [""] * len(df)
+    index_many(kind, zip(keys, titles, text))
+
+def indexed_rows(kind, source):
+    """How many rows of an append‑only source catch_up() has indexed."""
+    row = _db().execute("SELECT rows FROM sources WHERE kind = ? AND source = ?", (kind, source)).fetchone()
+    return row[0] if row else 0
+
+def catch_up(kind, source, df, key, title, body=(), start=0):
+    """
+    Index the rows of an append‑only source (`df` holds its rows from
+    `start` on) not indexed yet — the position is kept in the index itself,
+    so a restart doesn't re‑index anything.  `key` may be None to use the
+    row number.
+    """
+    seen = indexed_rows(kind, source)
+    replaced = seen > start + len(df)
+    if replaced:
+        seen = start
+    new = df.iloc[max(seen - start, 0):]
+    if not len(new) and not replaced:
+        return
+    if key is None:
+        new = new.assign(_row=range(start + len(df) - len(new), start + len(df)))
+        key = "_row"
+    index_frame(kind, new, key, title, body)
+    with _db() as conn:
+        conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (kind, source, start + len(df)))
+
+def catch_up_log(kind, log, title, body=()):
+    """
+    catch_up() for a MessageLog, reading only the records added since.  A
+    log replaced by a shorter one (e.g. by a pull) is indexed from the start
+    and the rows past its end are dropped from the index.
+    """
+    seen, n = indexed_rows(kind, log.path), len(log)
+    if seen > n:
+        for row in range(n, seen):
+            remove(kind, row)
+        seen = 0
+    catch_up(kind, log.path, log.read(seen), None, title, body, start=seen)
+
+def _match_query(text):
+    """
+    User text → FTS5 query: every word must match, the last one also as a
+    prefix (from 3 letters — shorter prefixes match most of the index).
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    if len(words[-1]) >= 3:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+def search(text, limit=20, kinds=None):
+    """Best `limit` matches (Kind, Key, Title, Snippet, Score), highest BM25 relevance first."""
+    query = _match_query(text)
+    if query is None:
+        return pd.DataFrame(columns=["Kind", "Key", "Title", "Snippet", "Score"])
+    # BM25 ranks the newest MAX_CANDIDATES matches, so a word found in most of
+    # the index costs no more than a selective one
+    kind_filter = f" AND e.kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+    sql = ("SELECT e.kind, e.key, f.title, snippet(entries_fts, 1, '**', '**', '…', 12), bm25(entries_fts, 4.0, 1.0) AS score "
+           "FROM entries_fts f JOIN entries e ON e.id = f.rowid "
+           f"WHERE entries_fts MATCH ?{kind_filter} ORDER BY f.rowid DESC LIMIT {MAX_CANDIDATES}")
+    rows = _db().execute(f"SELECT * FROM ({sql}) ORDER BY score LIMIT ?", [query, *(kinds or []), limit]).fetchall()
+    out = pd.DataFrame(rows, columns=["Kind", "Key", "Title", "Snippet", "Score"])
+    out["Score"] = -out["Score"]
+    return out
@@ -1,8 +1,25 @@
 import streamlit as st
 from streamlit_option_menu import option_menu
+import search
+from tabs.collaboration_documentation import message_log
+
+def render_search():
+    """One search box over reports, messages, tasks and documents."""
+    query = st.text_input("🔍 Search", key="global_search", placeholder="Reports, messages, tasks, documents")
+    if not query.strip():
+        return
+    search.catch_up_log("Message", message_log(), "User", ["Message"])
+    results = search.search(query, limit=10)
+    if results.empty:
+        st.caption("No matches.")
+    for r in results.itertuples():
+        st.markdown(f"**{r.Kind}** · {r.Title}")
+        if r.Snippet:
+            st.caption(r.Snippet)
 
 def render_sidebar():
     with st.sidebar:
+        render_search()
         return option_menu(
             "Main Menu",
             ["Home", "Design and Analysis", "Project Management",
@@ -0,0 +1,242 @@
+# tables.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+class AppendTable:
+    """
+    Append‑optimised table for st.session_state.
+
+    Each column lives in its own NumPy buffer whose capacity doubles when
+    full, so adding a row is amortised O(1) instead of the O(n) copy that
+    `pd.concat([df, new_row])` makes.  The DataFrame is only materialised
+    (and then cached) when something asks for it — a display or a save.
+    Numeric columns keep a running sum/min/max that `append` updates.
+    """
+
+    def __init__(self, columns, dtypes=None, capacity=16):
+        dtypes = dtypes or {}
+        self.columns = list(columns)
+        self.dtypes = {c: np.dtype(dtypes.get(c, object)) for c in self.columns}
+        self._n = 0
+        self._buf = {c: np.empty(capacity, dtype=self.dtypes[c]) for c in self.columns}
+        self._agg = {c: [0, np.nan, np.nan] for c in self.columns if self._numeric(c)}  # sum, min, max
+        self._frame = None
+
+    @classmethod
+    def from_frame(cls, df, dtypes=None, **kwargs):
+        """Build from a DataFrame; numeric columns keep their dtype unless overridden."""
+        dtypes = {c: df[c].dtype for c in df.columns
+                  if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])} | (dtypes or {})
+        for c, dt in dtypes.items():
+            dt = np.dtype(getattr(dt, "numpy_dtype", dt))  # nullable Int64 etc. → int64
+            # an integer column with gaps can't live in an integer buffer
+            dtypes[c] = np.float64 if dt.kind in "iu" and c in df and df[c].isna().any() else dt
+        table = cls(df.columns, dtypes, capacity=max(16, len(df)), **kwargs)
+        table.extend(df)
+        return table
+
+    def _numeric(self, col):
+        return self.dtypes[col].kind in "iuf"
+
+    def _reserve(self, n):
+        cap = len(next(iter(self._buf.values()))) if self._buf else 0
+        if n <= cap:
+            return
+        cap = max(cap, 1)
+        while cap < n:
+            cap *= 2
+        for c, buf in self._buf.items():
+            grown = np.empty(cap, dtype=buf.dtype)
+            grown[:self._n] = buf[:self._n]
+            self._buf[c] = grown
+
+    def _fold(self, col, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size:
+            agg = self._agg[col]
+            agg[0] += values.sum()
+            agg[1] = np.fmin(agg[1], values.min())
+            agg[2] = np.fmax(agg[2], values.max())
+
+    def append(self, row):
+        """Add one row (a dict keyed by column name; missing keys → empty)."""
+        self._reserve(self._n + 1)
+        for c in self.columns:
+            value = row.get(c, 0 if self._numeric(c) else None)
+            self._buf[c][self._n] = value
+            agg = self._agg.get(c)
+            if agg is not None:
+                value = self._buf[c][self._n].item()  # as stored (None → nan)
+            if agg is not None and value == value:  # skip NaN, like DataFrame.sum/max
+                agg[0] += value
+                agg[1] = value if not agg[1] <= value else agg[1]
+                agg[2] = value if not agg[2] >= value else agg[2]
+        self._n += 1
+        self._frame = None
+
+    def extend(self, df):
+        """Add every row of a DataFrame in one vectorised copy per column."""
+        m = len(df)
+        if not m:
+            return
+        self._reserve(self._n + m)
+        for c in self.columns:
+            if c in df:
+                values = (pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=self.dtypes[c]) if self._numeric(c)
+                          else df[c].to_numpy(dtype=object))
+            else:
+                values = np.zeros(m, self.dtypes[c]) if self._numeric(c) else np.full(m, None, dtype=object)
+            self._buf[c][self._n:self._n + m] = values
+            if c in self._agg:
+                self._fold(c, values)
+        self._n += m
+        self._frame = None
+
+    def update(self, i, row):
+        """
+        Overwrite some columns of row `i` in place.  Sums stay exact in O(1);
+        min/max are only rescanned when the old value was the extreme.
+        """
+        for c, value in row.items():
+            old = self._buf[c][i]
+            self._buf[c][i] = value
+            agg = self._agg.get(c)
+            if agg is None:
+                continue
+            old, new = float(old), self._buf[c][i].item()
+            agg[0] += (0.0 if old != old else -old) + (0.0 if new != new else new)
+            if old == agg[1] or old == agg[2]:
+                values = self._buf[c][:self._n].astype(float)
+                agg[1], agg[2] = (np.nanmin(values), np.nanmax(values)) if np.isfinite(values).any() else (np.nan, np.nan)
+            elif new == new:
+                agg[1], agg[2] = np.fmin(agg[1], new), np.fmax(agg[2], new)
+        self._frame = None
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, col):
+        return col in self._buf
+
+    @property
+    def empty(self):
+        return self._n == 0
+
+    def column(self, col):
+        """Read‑only view of the filled part of one column's buffer."""
+        view = self._buf[col][:self._n]
+        view.flags.writeable = False
+        return view
+
+    def sum(self, col):
+        return self._agg[col][0]
+
+    def min(self, col):
+        return 0 if np.isnan(self._agg[col][1]) else self._agg[col][1]
+
+    def max(self, col):
+        return 0 if np.isnan(self._agg[col][2]) else self._agg[col][2]
+
+    def to_frame(self):
+        """The table as a DataFrame (cached until the next append; don't mutate it)."""
+        if self._frame is None:
+            self._frame = pd.DataFrame({c: self._buf[c][:self._n].copy() for c in self.columns},
+                                       columns=self.columns)
+        return self._frame
+
+    def to_csv(self, *args, **kwargs):
+        return self.to_frame().to_csv(*args, **kwargs)
+
+class KeyedTable(AppendTable):
+    """
+    AppendTable that also indexes its rows by one column (e.g. the task of a
+    progress log): the latest row and the full history of a key are dict
+    lookups instead of a scan.  Rows are assumed to arrive in time order.
+    """
+
+    def __init__(self, columns, dtypes=None, capacity=16, index=None):
+        super().__init__(columns, dtypes, capacity)
+        self.index = index or self.columns[0]
+        self._rows = {}
+        self._keys = []   # keys in first‑seen order, for slicing
+
+    def append(self, row):
+        super().append(row)
+        key = self._buf[self.index][self._n - 1]
+        self._add_rows(None if pd.isna(key) else key, [self._n - 1])
+
+    def _add_rows(self, key, rows):
+        if key not in self._rows:
+            self._rows[key] = []
+            self._keys.append(key)
+        self._rows[key].extend(rows)
+
+    def extend(self, df):
+        start = self._n
+        super().extend(df)
+        codes, keys = pd.factorize(self._buf[self.index][start:self._n], use_na_sentinel=False)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        for key, rows in zip(keys, np.split(order + start, bounds)):
+            self._add_rows(None if pd.isna(key) else key, rows.tolist())
+
+    def keys(self):
+        """Live view of the keys, in first‑seen order."""
+        return self._rows.keys()
+
+    def key_slice(self, start, stop):
+        """Keys start … stop‑1 in first‑seen order, without touching the rest."""
+        return self._keys[start:stop]
+
+    def _take(self, rows):
+        return pd.DataFrame({c: self._buf[c][rows] for c in self.columns}, columns=self.columns)
+
+    def count(self, key):
+        """Number of rows for `key`."""
+        return len(self._rows.get(key, ()))
+
+    def history(self, key):
+        """Every row for `key`, oldest first."""
+        return self._take(np.array(self._rows.get(key, []), dtype=int))
+
+    def latest(self, key):
+        """The most recent row for `key` as a dict (None if there is none)."""
+        rows = self._rows.get(key)
+        return {c: self._buf[c][rows[-1]] for c in self.columns} if rows else None
+
+    def latest_frame(self):
+        """One row per key — its most recent — in first‑seen key order."""
+        return self._take(np.array([rows[-1] for rows in self._rows.values()], dtype=int))
+
+def session_table(key, columns, dtypes=None, index=None):
+    """
+    The AppendTable stored under st.session_state[key], created if missing.
+    A plain DataFrame found there (e.g. loaded from the database) is adopted.
+    With `index`, the table is a KeyedTable indexed by that column.
+    """
+    cls, kwargs = (KeyedTable, {"index": index}) if index else (AppendTable, {})
+    table = st.session_state.get(key)
+    if isinstance(table, AppendTable) and not isinstance(table, cls):
+        table = table.to_frame()
+    if isinstance(table, pd.DataFrame):
+        # columns the stored frame predates start empty, not as all‑NaN floats
+        added = {c: object for c in columns if c not in table}
+        table = cls.from_frame(table.reindex(columns=list(dict.fromkeys([*columns, *table.columns]))),
+                               added | (dtypes or {}), **kwargs)
+    elif not isinstance(table, cls):
+        table = cls(columns, dtypes, **kwargs)
+    st.session_state[key] = table
+    return table
+
+def as_frame(table):
+    """DataFrame view of a session table, whether or not it has been adopted yet."""
+    return table.to_frame() if isinstance(table, AppendTable) else table
+
+def read_upload(uploaded_file):
+    """Read an uploaded CSV or Excel file into a DataFrame."""
+    name = uploaded_file.name.lower()
+    if name.endswith((".xlsx", ".xls")):
+        return pd.read_excel(uploaded_file)
+    return pd.read_csv(uploaded_file)
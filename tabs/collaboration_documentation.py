@@ -1,10 +1,22 @@
 import streamlit as st
 import pandas as pd
 import os
+from datetime import datetime, time, timedelta
+import blobstore
+from messagelog import MessageLog
+import search
+from tables import session_table
+from meetings import DEFAULT_DURATION, add_meeting, meeting_log, schedule, split_attendees
+from docstore import DOCUMENT_COLUMNS, DOCUMENT_DTYPES, add_version, document_page
 
 # Communication Tools Section
 MESSAGES_FILE = "uploads/messages.csv"
 MEETINGS_FILE = "uploads/meetings.csv"
+MESSAGES_PAGE = 50
+MEETING_DAY = (time(8, 0), time(18, 0))   # window searched for free slots
+
+def message_log():
+    return MessageLog(MESSAGES_FILE, ["User", "Message"])
 
 def run_communication_tools():
     st.header("Communication Tools")
@@ -14,77 +26,120 @@ def run_communication_tools():
     # Ensure message storage exists
     if not os.path.exists("uploads"):
         os.makedirs("uploads")
-    if not os.path.exists(MESSAGES_FILE):
-        pd.DataFrame(columns=["User", "Message"]).to_csv(MESSAGES_FILE, index=False)
-    if not os.path.exists(MEETINGS_FILE):
-        pd.DataFrame(columns=["Date", "Time"]).to_csv(MEETINGS_FILE, index=False)
 
-    # Messaging System
+    # Messaging System: an append-only log; only the messages on screen are read
+    log = message_log()
     st.write("### Team Messaging")
     message = st.text_area("Send a Message", key="comm_message")
     if st.button("Send Message", key="send_message"):
         if message.strip():
-            messages_df = pd.read_csv(MESSAGES_FILE)
-            new_message = pd.DataFrame({"User": [st.session_state.get("username", "Unknown")], "Message": [message]})
-            messages_df = pd.concat([messages_df, new_message], ignore_index=True)
-            messages_df.to_csv(MESSAGES_FILE, index=False)
+            log.append({"User": st.session_state.get("username", "Unknown"), "Message": message})
+            search.catch_up_log("Message", log, "User", ["Message"])
 
     st.write("### Previous Messages")
-    messages_df = pd.read_csv(MESSAGES_FILE)
+    shown = st.session_state.setdefault("messages_shown", MESSAGES_PAGE)
+    messages_df = log.tail(shown)
     if not messages_df.empty:
-        for _, row in messages_df.iterrows():
-            st.markdown(f"🗨️ **{row['User']}**: {row['Message']}")
+        if len(messages_df) < len(log) and st.button(f"Load older messages ({len(log) - len(messages_df)} more)",
+                                                     key="load_older_messages"):
+            st.session_state.messages_shown += MESSAGES_PAGE
+            st.rerun()
+        st.markdown("  \n".join(f"🗨️ **{u}**: {m}" for u, m in zip(messages_df["User"], messages_df["Message"])))
     else:
         st.info("No messages yet.")
 
-    # Meeting Scheduling
+    # Meeting Scheduling: conflicts and the upcoming list are interval-tree queries
+    meetings = meeting_log(MEETINGS_FILE)
+    calendar = schedule(meetings)
     st.write("### Schedule a Meeting")
-    meeting_date = st.date_input("Select a Date", key="meeting_date")
-    meeting_time = st.time_input("Select a Time", key="meeting_time")
+    c1, c2, c3 = st.columns(3)
+    meeting_date = c1.date_input("Select a Date", key="meeting_date")
+    meeting_time = c2.time_input("Select a Time", key="meeting_time")
+    duration = c3.number_input("Duration (min)", 15, 480, DEFAULT_DURATION, step=15, key="meeting_duration")
+    title = st.text_input("Title", key="meeting_title")
+    attendees = split_attendees(st.text_input("Attendees (comma-separated)", st.session_state.get("username", ""),
+                                              key="meeting_attendees"))
+    allow_conflicts = st.checkbox("Schedule even if attendees are busy", key="meeting_allow_conflicts")
 
     if st.button("Schedule Meeting", key="schedule_meeting"):
-        meetings_df = pd.read_csv(MEETINGS_FILE)
-        new_meeting = pd.DataFrame({"Date": [meeting_date], "Time": [meeting_time]})
-        meetings_df = pd.concat([meetings_df, new_meeting], ignore_index=True)
-        meetings_df.to_csv(MEETINGS_FILE, index=False)
+        start = datetime.combine(meeting_date, meeting_time)
+        clashes = calendar.conflicts(attendees, start, start + timedelta(minutes=duration))
+        if clashes and not allow_conflicts:
+            st.error("Conflicts with: " + "; ".join(
+                f"{m['Title'] or 'Meeting'} {m['Start']:%H:%M}–{m['End']:%H:%M} "
+                f"({', '.join(a for a in m['Attendees'] if a in attendees)})" for m in clashes))
+            day = datetime.combine(meeting_date, MEETING_DAY[0])
+            slots = calendar.free_slots(attendees, day, datetime.combine(meeting_date, MEETING_DAY[1]), duration)
+            st.info("Free that day: " + (", ".join(f"{s:%H:%M}–{e:%H:%M}" for s, e in slots) or "none"))
+        else:
+            add_meeting(meetings, start, duration, title, attendees)
+            calendar = schedule(meetings)
+            st.success("Meeting scheduled.")
 
     st.write("### Upcoming Meetings")
-    meetings_df = pd.read_csv(MEETINGS_FILE)
-    if not meetings_df.empty:
-        for _, row in meetings_df.iterrows():
-            st.markdown(f"📅 **{row['Date']} at {row['Time']}**")
+    horizon = st.selectbox("Show the next", [7, 30, 90, 365], format_func=lambda d: f"{d} days", key="meeting_horizon")
+    now = datetime.now()
+    upcoming = calendar.between(now, now + timedelta(days=horizon))
+    if upcoming:
+        st.markdown("  \n".join(
+            f"📅 **{m['Start']:%Y-%m-%d %H:%M}–{m['End']:%H:%M}**"
+            + (f" {m['Title']}" if m["Title"] else "")
+            + (f" · {', '.join(m['Attendees'])}" if m["Attendees"] else "")
+            for m in upcoming))
     else:
         st.info("No meetings scheduled yet.")
 
 # Document Management Section
-UPLOADS_DIR = "uploads/documents"
+UPLOADS_DIR = "uploads/documents"   # legacy per-name copies; contents now live in the blob store
+DOCUMENTS_PAGE = 20
 
 def run_document_management():
     st.header("Document Management")
     st.subheader("📌 About Document Management")
     st.info("Upload, store, and manage project documents with **version control and sharing options**.")
 
-    # Ensure the 'uploads/documents' directory exists
-    if not os.path.exists(UPLOADS_DIR):
-        os.makedirs(UPLOADS_DIR)
-
     uploaded_file = st.file_uploader("Upload Project Document", type=["pdf", "docx", "xlsx"], key="doc_upload")
 
-    if "document_data" not in st.session_state:
-        st.session_state.document_data = pd.DataFrame(columns=["File Name", "File Path"])
-
-    if uploaded_file:
-        file_path = os.path.join(UPLOADS_DIR, uploaded_file.name)
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+    documents = session_table("document_data", DOCUMENT_COLUMNS, DOCUMENT_DTYPES, index="File Name")
 
-        new_row = pd.DataFrame({"File Name": [uploaded_file.name], "File Path": [file_path]})
-        st.session_state.document_data = pd.concat([st.session_state.document_data, new_row], ignore_index=True)
+    # the uploader keeps its file across reruns — store each upload once
+    if uploaded_file is not None and st.session_state.get("doc_stored_upload") != uploaded_file.file_id:
+        row, added = add_version(documents, uploaded_file.name, uploaded_file, st.session_state.get("username"))
+        st.session_state.doc_stored_upload = uploaded_file.file_id
+        if added:
+            search.index("Document", uploaded_file.name, uploaded_file.name, uploaded_file.name)
+            st.success(f"Stored {uploaded_file.name} as version {row['Version']}.")
+        else:
+            st.info(f"{uploaded_file.name} is identical to its current version — nothing new stored.")
 
     st.write("### Stored Documents")
-    if not st.session_state.document_data.empty:
-        for _, row in st.session_state.document_data.iterrows():
-            st.markdown(f"📄 **{row['File Name']}**  |  [Download](/{row['File Path']})")
+    if not documents.empty:
+        pages = -(-len(documents.keys()) // DOCUMENTS_PAGE)
+        page = st.number_input(f"Page (of {pages})", 1, pages, 1, key="doc_page") - 1 if pages > 1 else 0
+        rows, _ = document_page(documents, page, DOCUMENTS_PAGE)
+        st.markdown("  \n".join(
+            f"📄 **{r['File Name']}** — v{r['Versions']}"
+            + (f" · {r['Size (bytes)'] / 1024:,.0f} KB" if pd.notna(r["Size (bytes)"]) else "")
+            + (f" · {r['Uploaded At']}" if isinstance(r["Uploaded At"], str) else "")
+            for r in rows))
+
+        # Only the selected version's blob is fetched (from cache or GitHub)
+        c1, c2 = st.columns([3, 1])
+        name = c1.selectbox("Select Document to Download", [r["File Name"] for r in rows], key="doc_download_name")
+        versions = documents.history(name).iloc[::-1]
+        choice = c2.selectbox("Version", range(len(versions)), key="doc_download_version",
+                              format_func=lambda i: f"v{len(versions) - i}" + (" (current)" if i == 0 else ""))
+        blob = versions["Blob"].iloc[min(choice, len(versions) - 1)]
+        # read once per selected blob, not on every rerun
+        cached = st.session_state.get("doc_download_blob")
+        if cached is None or cached[0] != blob:
+            cached = (blob, blobstore.get(blob) if isinstance(blob, str) and blob else None)
+            st.session_state.doc_download_blob = cached
+        data = cached[1]
+        if data is not None:
+            st.download_button("⬇️ Download", data, file_name=name, key="doc_download")
+        else:
+            st.warning("Document contents are not available.")
     else:
         st.info("No documents uploaded yet.")
 
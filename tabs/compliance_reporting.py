@@ -1,6 +1,19 @@
 import streamlit as st
-import pandas as pd
 from datetime import date
+import search
+from tables import AppendTable, KeyedTable, session_table, read_upload, as_frame
+from reports import TEMPLATES, beam_figures, queue_report, report_status, report_file
+from compliance import (DEFAULT_RULES, MEMBER_COLUMNS, FOOTING_VARIABLES, MEMBER_VARIABLES, FUNCTIONS,
+                        evaluate, compliance_rows)
+
+# report section → session table it comes from
+REPORT_TABLES = {"Load Data": "structural_data", "Member Results": "member_results",
+                 "Compliance Checks": "compliance_data", "Soil Data": "geotechnical_data",
+                 "Footing Design": "footing_results", "Cost Estimate": "cost_estimation_data",
+                 "Schedule": "scheduling_data"}
+
+COMPLIANCE_COLUMNS = ["Requirement", "Regulation", "Project Component", "Risk Level", "Date", "Status",
+                      "Utilization", "Source"]
 
 # --- Enhanced Standards Verification Section ---
 def run_standards_verification():
@@ -21,27 +34,94 @@ def run_standards_verification():
     compliance_status = st.selectbox("Compliance Status", status_options, key="comp_status")
 
     # Initialize session state DataFrame if not exists
-    if "compliance_data" not in st.session_state:
-        st.session_state.compliance_data = pd.DataFrame(columns=[
-            "Requirement", "Regulation", "Project Component", "Risk Level", "Date", "Status"
-        ])
+    checks = session_table("compliance_data", COMPLIANCE_COLUMNS)
 
     if st.button("Add Compliance Check", key="add_compliance"):
-        new_row = pd.DataFrame({
-            "Requirement": [requirement],
-            "Regulation": [regulation],
-            "Project Component": [project_component],
-            "Risk Level": [risk_level],
-            "Date": [check_date],
-            "Status": [compliance_status]
+        checks.append({
+            "Requirement": requirement,
+            "Regulation": regulation,
+            "Project Component": project_component,
+            "Risk Level": risk_level,
+            "Date": check_date,
+            "Status": compliance_status,
+            "Source": "Manual",
         })
-        st.session_state.compliance_data = pd.concat(
-            [st.session_state.compliance_data, new_row], ignore_index=True
-        )
         st.success("Compliance check added!")
 
+    # Automated checks: every rule over every member / footing result in one pass
+    st.write("### Automated Checks")
+    st.caption("A rule passes where Demand ≤ Capacity.  Beam variables: "
+               + ", ".join(f"{v} = {c}" for v, c in MEMBER_VARIABLES.items())
+               + ".  Foundation variables: " + ", ".join(f"{v} = {c}" for v, c in FOOTING_VARIABLES.items())
+               + ".  Functions: " + ", ".join(FUNCTIONS) + ".")
+    if "compliance_rules" not in st.session_state:
+        st.session_state.compliance_rules = DEFAULT_RULES.copy()
+    rules = st.data_editor(
+        st.session_state.compliance_rules, num_rows="dynamic", key="compliance_rules_editor",
+        column_config={
+            "Component": st.column_config.SelectboxColumn("Component", options=["Beam", "Foundation"]),
+            "Risk Level": st.column_config.SelectboxColumn("Risk Level", options=["Low", "Medium", "High"]),
+            "Regulation": st.column_config.SelectboxColumn("Regulation", options=regulation_options),
+        },
+    )
+
+    members = session_table("member_results", MEMBER_COLUMNS, {c: float for c in MEMBER_COLUMNS[1:]},
+                            index="Member")
+    with st.expander("Import Member Results (CSV/Excel)"):
+        st.caption("Columns: " + ", ".join(MEMBER_COLUMNS) + ".  A member imported again replaces its earlier row.")
+        upload = st.file_uploader("Member results", type=["csv", "xlsx", "xls"], key="member_results_file")
+        if upload and st.button("Import Members", key="import_member_results"):
+            try:
+                members.extend(read_upload(upload).reindex(columns=MEMBER_COLUMNS))
+            except Exception as e:
+                st.error(f"Could not read {upload.name}: {e}")
+    member_frame = members.latest_frame()
+    footings = st.session_state.get("footing_results")
+    st.write(f"{len(member_frame)} beam members (saved from Beam Analysis or imported), "
+             f"{0 if footings is None else len(footings)} footings (from the latest Footing Design).")
+
+    if st.button("Run Compliance Checks", key="run_compliance"):
+        results, errors = evaluate(rules, {"Beam": member_frame, "Foundation": footings})
+        for rule, message in errors:
+            st.error(f"Rule '{rule}' skipped: {message}")
+        if results.empty:
+            st.warning("No member or footing results to check.")
+        else:
+            # replace the previous automated rows, keep the manual ones
+            kept = checks.to_frame()
+            kept = kept[kept["Source"] != "Rule engine"]
+            checks = st.session_state.compliance_data = AppendTable.from_frame(kept.reindex(columns=COMPLIANCE_COLUMNS))
+            checks.extend(compliance_rows(results, check_date))
+            counts = results["Status"].value_counts()
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Pass", int(counts.get("Pass", 0)))
+            m2.metric("Fail", int(counts.get("Fail", 0)))
+            m3.metric("Pending", int(counts.get("Pending", 0)))
+            st.dataframe(results.pivot_table(index="Rule", columns="Status", values="Member",
+                                             aggfunc="count", fill_value=0))
+            st.write("#### Failing Checks")
+            st.dataframe(results[results["Status"] == "Fail"].sort_values("Utilization", ascending=False),
+                         hide_index=True)
+
     st.write("### Compliance Checks")
-    st.dataframe(st.session_state.compliance_data)
+    st.dataframe(checks.to_frame())
+
+
+def _report_queue(jobs, polling):
+    """Status and downloads of the queued reports; polls while any is still rendering."""
+    for job in reversed(jobs):
+        status, parts = report_status(job)
+        c1, c2 = st.columns([3, 1])
+        if status == "Ready":
+            data, name, mime = report_file(job)
+            c1.write(f"**{name}** — ready ({len(data) / 1024:,.0f} KB)")
+            c2.download_button("Download", data, file_name=name, mime=mime, key=f"download_report_{job}")
+        elif status in ("Queued", "Rendering"):
+            c1.write(f"Report #{job} — {status.lower()}… {parts} parts done")
+        else:
+            c1.write(f"Report #{job} — {status}")
+    if polling and not any(report_status(j)[0] in ("Queued", "Rendering") for j in jobs):
+        st.rerun()   # everything finished: stop polling
 
 
 # --- Enhanced Report Generation Section ---
@@ -56,36 +136,58 @@ def run_report_generation():
     report_author = st.text_input("Report Author", key="report_author")
     report_summary = st.text_area("Enter Report Summary", key="report_summary")
     report_content = st.text_area("Enter Detailed Report Content", key="report_content")
-    template_options = ["Standard", "Executive Summary", "Detailed Analysis"]
-    report_template = st.selectbox("Select Report Template", template_options, key="report_template")
+    report_template = st.selectbox("Select Report Template", list(TEMPLATES), key="report_template")
+    sections = st.multiselect("Include", ["Beam Diagrams", *REPORT_TABLES],
+                              default=["Beam Diagrams", "Compliance Checks"], key="report_sections")
+    report_format = st.radio("Format", ["PDF", "HTML"], horizontal=True, key="report_format")
 
     # Initialize session state DataFrame if not exists
-    if "report_data" not in st.session_state:
-        st.session_state.report_data = pd.DataFrame(columns=[
-            "Title", "Date", "Author", "Template", "Summary", "Content"
-        ])
+    reports = session_table("report_data", [
+        "Title", "Date", "Author", "Template", "Summary", "Content"
+    ])
 
     if st.button("Generate Report", key="generate_report"):
-        new_row = pd.DataFrame({
-            "Title": [report_title],
-            "Date": [report_date],
-            "Author": [report_author],
-            "Template": [report_template],
-            "Summary": [report_summary],
-            "Content": [report_content]
+        reports.append({
+            "Title": report_title,
+            "Date": report_date,
+            "Author": report_author,
+            "Template": report_template,
+            "Summary": report_summary,
+            "Content": report_content
         })
-        st.session_state.report_data = pd.concat(
-            [st.session_state.report_data, new_row], ignore_index=True
-        )
-        st.success("Report generated successfully!")
+        search.index("Report", search.text_key(report_title, report_date, report_author, report_summary, report_content),
+                     report_title, " · ".join(filter(None, [report_summary, report_content, report_author])))
+        # snapshot what the report needs; the document is rendered in the background
+        figures = None
+        beam = st.session_state.get("beam_model")
+        if "Beam Diagrams" in sections and beam is not None:
+            try:
+                figures = beam_figures(beam)
+            except (ValueError, ZeroDivisionError):
+                st.warning("The beam in Beam Analysis can't be solved — diagrams left out.")
+        tables = []
+        for name in sections:
+            table = st.session_state.get(REPORT_TABLES.get(name))
+            if table is not None:
+                tables.append((name, table.latest_frame() if isinstance(table, KeyedTable) else as_frame(table)))
+        job = queue_report(report_title, report_date, report_author, report_template, report_summary,
+                           report_content, figures, tables, report_format)
+        st.session_state.setdefault("report_jobs", []).append(job)
+        st.success("Report queued — download it from the queue below when it is ready.")
+
+    if st.session_state.get("report_jobs"):
+        st.write("### Report Queue")
+        jobs = st.session_state.report_jobs
+        pending = any(report_status(j)[0] in ("Queued", "Rendering") for j in jobs)
+        st.fragment(run_every=1.5 if pending else None)(_report_queue)(jobs, pending)
 
     st.write("### Generated Reports")
-    st.dataframe(st.session_state.report_data)
+    st.dataframe(reports.to_frame())
 
     # Report Preview (Optional)
-    if not st.session_state.report_data.empty:
-        selected_index = st.selectbox("Select Report to Preview", st.session_state.report_data.index, key="report_preview_index")
-        selected_report = st.session_state.report_data.loc[selected_index]
+    if not reports.empty:
+        selected_index = st.selectbox("Select Report to Preview", reports.to_frame().index, key="report_preview_index")
+        selected_report = reports.to_frame().loc[selected_index]
         st.markdown("## Report Preview")
         st.markdown(f"**Title:** {selected_report['Title']}")
         st.markdown(f"**Date:** {selected_report['Date']}")
@@ -3,8 +3,19 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from core import Beam
-from plots import plot_beam_diagram, plot_sfd, plot_bmd
+from core import (Beam, LOAD_COLUMNS, LOAD_TYPES, compute_load_table, beam_load_rows, beam_summary,
+                  split_beam_loads)
+from plots import plot_beam_diagram, plot_sfd, plot_bmd, plot_hydrograph
+from tables import AppendTable, session_table, read_upload
+from compliance import MEMBER_COLUMNS, beam_member_result
+from geotech import SOIL_DEFAULTS, SOIL_COLUMNS, design_footings
+from hydraulics import PipeNetwork, NODE_COLUMNS, PIPE_COLUMNS
+from hydrology import simulate_csv
+from labtests import (TDS_CLASSES, WATER_PH_CLASSES, WATER_COLUMNS as WATER_LAB_COLUMNS,
+                      SOIL_COLUMNS as SOIL_LAB_COLUMNS, classify, process_water_batch,
+                      process_soil_batch, batch_summary)
+
+LOAD_DTYPES = {"Load Value (kN)": float, "Distance (m)": float, "Load Factor": float, "Moment (kN-m)": float}
 
 # --- Enhanced Structural Analysis Section ---
 def run_structural_analysis():
@@ -15,37 +26,65 @@ def run_structural_analysis():
         "including bending moment analysis and load combination assessments, in accordance with ACI standards."
     )
 
-    load_options = ["Dead Load", "Live Load", "Wind Load", "Seismic Load", "Snow Load"]
-    selected_load = st.selectbox("Select Load Type", load_options, key="struct_load_type")
+    selected_load = st.selectbox("Select Load Type", LOAD_TYPES, key="struct_load_type")
     load_value = st.number_input("Enter Load Value (kN)", min_value=0.0, key="struct_load_value")
     distance = st.number_input("Enter Distance from Support (m)", min_value=0.0, key="struct_distance")
     load_factor = st.number_input("Enter Load Factor", min_value=0.0, value=1.0, key="struct_load_factor")
 
-    if "structural_data" not in st.session_state:
-        st.session_state.structural_data = pd.DataFrame(
-            columns=["Load Type", "Load Value (kN)", "Distance (m)", "Load Factor", "Moment (kN-m)"]
-        )
+    data = session_table("structural_data", LOAD_COLUMNS, LOAD_DTYPES)
 
     if st.button("Add Load", key="add_struct_load"):
         moment = load_value * distance * load_factor
-        new_row = pd.DataFrame({
-            "Load Type": [selected_load],
-            "Load Value (kN)": [load_value],
-            "Distance (m)": [distance],
-            "Load Factor": [load_factor],
-            "Moment (kN-m)": [moment]
+        data.append({
+            "Load Type": selected_load,
+            "Load Value (kN)": load_value,
+            "Distance (m)": distance,
+            "Load Factor": load_factor,
+            "Moment (kN-m)": moment
         })
-        st.session_state.structural_data = pd.concat(
-            [st.session_state.structural_data, new_row], ignore_index=True
-        )
 
-    st.write("### Load Data")
-    st.dataframe(st.session_state.structural_data)
+    # Bulk import: validation + moments for the whole file in one vectorised pass
+    with st.expander("Import Load Schedule (CSV/Excel)"):
+        st.caption("Columns: Load Type, Load Value (kN), Distance (m), Load Factor (optional, default 1.0).")
+        upload = st.file_uploader("Load schedule", type=["csv", "xlsx", "xls"], key="struct_import_file")
+        replace = st.checkbox("Replace existing loads", key="struct_import_replace")
+        if upload and st.button("Import Loads", key="import_struct_loads"):
+            try:
+                loads, rejected = compute_load_table(read_upload(upload))
+            except Exception as e:
+                st.error(f"Could not read {upload.name}: {e}")
+            else:
+                if replace:
+                    data = st.session_state.structural_data = AppendTable.from_frame(loads, LOAD_DTYPES)
+                else:
+                    data.extend(loads)
+                st.session_state.struct_editor_version = st.session_state.get("struct_editor_version", 0) + 1
+                st.success(f"Imported {len(loads)} loads.")
+                if len(rejected):
+                    st.warning(f"{len(rejected)} rows rejected:")
+                    st.dataframe(rejected)
 
-    total_load = st.session_state.structural_data["Load Value (kN)"].sum() if not st.session_state.structural_data.empty else 0
-    max_load   = st.session_state.structural_data["Load Value (kN)"].max() if not st.session_state.structural_data.empty else 0
-    total_moment = st.session_state.structural_data["Moment (kN-m)"].sum() if not st.session_state.structural_data.empty else 0
-    max_moment   = st.session_state.structural_data["Moment (kN-m)"].max() if not st.session_state.structural_data.empty else 0
+    st.write("### Load Data")
+    # Editable grid; edits are applied (and moments recomputed) in one pass on demand.
+    # A fresh editor key after each apply/import resets the widget's pending edits.
+    version = st.session_state.get("struct_editor_version", 0)
+    edited = st.data_editor(
+        data.to_frame(), num_rows="dynamic", disabled=["Moment (kN-m)"],
+        column_config={"Load Type": st.column_config.SelectboxColumn("Load Type", options=LOAD_TYPES)},
+        key=f"struct_editor_{version}",
+    )
+    if st.button("Apply Edits", key="apply_struct_edits"):
+        loads, rejected = compute_load_table(edited)
+        data = st.session_state.structural_data = AppendTable.from_frame(loads, LOAD_DTYPES)
+        st.session_state.struct_editor_version = version + 1
+        if len(rejected):
+            st.warning(f"{len(rejected)} incomplete rows were dropped.")
+
+    # running aggregates — no pass over the table
+    total_load   = data.sum("Load Value (kN)")
+    max_load     = data.max("Load Value (kN)")
+    total_moment = data.sum("Moment (kN-m)")
+    max_moment   = data.max("Moment (kN-m)")
 
     st.write("### Analysis Results")
     st.write(f"- **Total Load:** {total_load:.2f} kN")
@@ -61,26 +100,65 @@ def run_geotechnical_analysis():
     st.subheader("📌 About Geotechnical Analysis")
     st.info("Geotechnical analysis assesses **soil properties** to determine foundation suitability.")
 
-    soil_types = ["Clay", "Sand", "Gravel", "Silt", "Rock"]
+    soil_types = list(SOIL_DEFAULTS.index)
     selected_soil = st.selectbox("Select Soil Type", soil_types)
     density = st.number_input("Enter Density (kg/m³)", min_value=1000, max_value=2500, step=10)
     cohesion = st.number_input("Enter Cohesion (kPa)", min_value=0, max_value=100, step=1)
-
-    if "geotechnical_data" not in st.session_state:
-        st.session_state.geotechnical_data = pd.DataFrame(columns=["Soil Type", "Density", "Cohesion"])
+    typical = SOIL_DEFAULTS.loc[selected_soil]
+    with st.expander("Strength & compressibility (typical values for the soil type)"):
+        c1, c2, c3 = st.columns(3)
+        phi = c1.number_input("Friction Angle (°)", 0.0, 50.0, float(typical["Friction Angle (°)"]), key=f"geo_phi_{selected_soil}")
+        modulus = c2.number_input("Elastic Modulus (MPa)", 0.1, 5000.0, float(typical["Elastic Modulus (MPa)"]), key=f"geo_E_{selected_soil}")
+        poisson = c3.number_input("Poisson's Ratio", 0.0, 0.5, float(typical["Poisson's Ratio"]), key=f"geo_nu_{selected_soil}")
+        cc = c1.number_input("Compression Index", 0.0, 3.0, float(typical["Compression Index"]), key=f"geo_cc_{selected_soil}")
+        e0 = c2.number_input("Void Ratio", 0.1, 5.0, float(typical["Void Ratio"]), key=f"geo_e0_{selected_soil}")
+        thickness = c3.number_input("Layer Thickness (m)", 0.1, 50.0, float(typical["Layer Thickness (m)"]), key=f"geo_H_{selected_soil}")
+
+    data = session_table("geotechnical_data", SOIL_COLUMNS,
+                         {"Density": int, "Cohesion": int, **{c: float for c in SOIL_DEFAULTS.columns}})
 
     if st.button("Add Soil Data"):
-        new_row = pd.DataFrame({
-            "Soil Type": [selected_soil],
-            "Density": [density],
-            "Cohesion": [cohesion]
+        data.append({
+            "Soil Type": selected_soil,
+            "Density": density,
+            "Cohesion": cohesion,
+            "Friction Angle (°)": phi,
+            "Elastic Modulus (MPa)": modulus,
+            "Poisson's Ratio": poisson,
+            "Compression Index": cc,
+            "Void Ratio": e0,
+            "Layer Thickness (m)": thickness,
         })
-        st.session_state.geotechnical_data = pd.concat(
-            [st.session_state.geotechnical_data, new_row], ignore_index=True
-        )
 
     st.write("### Soil Data")
-    st.dataframe(st.session_state.geotechnical_data)
+    st.dataframe(data.to_frame())
+
+    # Bearing capacity & settlement for every soil row over a B × Df grid
+    st.write("### Footing Design (square footing)")
+    c1, c2, c3, c4 = st.columns(4)
+    column_load = c1.number_input("Column Load (kN)", min_value=1.0, value=800.0, key="geo_load")
+    fs_target = c2.number_input("Target Factor of Safety", min_value=1.0, value=3.0, step=0.5, key="geo_fs")
+    max_settle = c3.number_input("Allowable Settlement (mm)", min_value=1.0, value=25.0, key="geo_settle")
+    method = c4.selectbox("Method", ["Terzaghi", "Meyerhof"], key="geo_method")
+    b_range = st.slider("Width range B (m)", 0.3, 10.0, (0.5, 5.0), key="geo_b_range")
+    d_range = st.slider("Depth range Df (m)", 0.3, 6.0, (0.5, 3.0), key="geo_d_range")
+    steps = st.select_slider("Grid resolution (per axis)", [25, 50, 100, 200], value=100, key="geo_steps")
+
+    if st.button("Design Footings", key="design_footings"):
+        if data.empty:
+            st.warning("Add at least one soil row first.")
+        else:
+            result = design_footings(
+                data.to_frame(), column_load,
+                np.linspace(*b_range, steps), np.linspace(*d_range, steps),
+                fs_target, max_settle, method,
+            )
+            st.dataframe(result.style.format(precision=2))
+            # kept for the compliance checks
+            st.session_state.footing_results = result.assign(
+                Member=[f"F{i + 1} ({soil})" for i, soil in enumerate(result["Soil Type"])])
+            if not result["Feasible"].all():
+                st.warning("No footing in the grid satisfies the criteria for some soils — widen the ranges.")
 
 
 # --- Hydraulic and Hydrological Modeling Section ---
@@ -92,20 +170,96 @@ def run_hydraulic_analysis():
     simulation_time = st.number_input("Enter Simulation Time (s)", min_value=1)
     flow_rate = st.number_input("Enter Flow Rate (L/s)", min_value=1)
 
-    if "hydraulic_data" not in st.session_state:
-        st.session_state.hydraulic_data = pd.DataFrame(columns=["Time (s)", "Flow Rate (L/s)"])
+    data = session_table("hydraulic_data", ["Time (s)", "Flow Rate (L/s)"],
+                         {"Time (s)": int, "Flow Rate (L/s)": int})
 
     if st.button("Add Simulation Data"):
-        new_row = pd.DataFrame({
-            "Time (s)": [simulation_time],
-            "Flow Rate (L/s)": [flow_rate]
+        data.append({
+            "Time (s)": simulation_time,
+            "Flow Rate (L/s)": flow_rate
         })
-        st.session_state.hydraulic_data = pd.concat(
-            [st.session_state.hydraulic_data, new_row], ignore_index=True
-        )
 
     st.write("### Flow Simulation Data")
-    st.dataframe(st.session_state.hydraulic_data)
+    st.dataframe(data.to_frame())
+
+    # Pipe network: nodes (junctions + fixed-head reservoirs) and pipes
+    st.write("### Pipe Network Solver")
+    if "pipe_nodes" not in st.session_state:
+        st.session_state.pipe_nodes = pd.DataFrame({
+            "Node": ["R1", "J1", "J2", "J3"], "Elevation (m)": [50.0, 10.0, 12.0, 8.0],
+            "Demand (L/s)": [0.0, 5.0, 8.0, 6.0], "Fixed Head (m)": [50.0, None, None, None]})
+        st.session_state.pipe_pipes = pd.DataFrame({
+            "Pipe": ["P1", "P2", "P3", "P4"], "From": ["R1", "J1", "J1", "J2"], "To": ["J1", "J2", "J3", "J3"],
+            "Length (m)": [500.0, 300.0, 400.0, 250.0], "Diameter (mm)": [200.0, 150.0, 150.0, 100.0],
+            "Roughness": [130.0, 130.0, 130.0, 130.0]})
+    version = st.session_state.setdefault("pipe_editor_version", 0)
+
+    with st.expander("Import Network (CSV/Excel)"):
+        st.caption("Nodes: " + ", ".join(NODE_COLUMNS) + " — leave Fixed Head blank for junctions.  "
+                   "Pipes: " + ", ".join(PIPE_COLUMNS) + ".")
+        node_file = st.file_uploader("Nodes", type=["csv", "xlsx", "xls"], key="pipe_nodes_file")
+        pipe_file = st.file_uploader("Pipes", type=["csv", "xlsx", "xls"], key="pipe_pipes_file")
+        if node_file and pipe_file and st.button("Import Network", key="import_network"):
+            st.session_state.pipe_nodes = read_upload(node_file).reindex(columns=NODE_COLUMNS)
+            st.session_state.pipe_pipes = read_upload(pipe_file).reindex(columns=PIPE_COLUMNS)
+            st.session_state.pipe_editor_version += 1
+            st.rerun()
+
+    nodes = st.data_editor(st.session_state.pipe_nodes, num_rows="dynamic", key=f"pipe_nodes_editor_{version}")
+    pipes = st.data_editor(st.session_state.pipe_pipes, num_rows="dynamic", key=f"pipe_pipes_editor_{version}")
+    headloss = st.selectbox("Head Loss Formula", ["Hazen-Williams", "Darcy-Weisbach"], key="pipe_headloss",
+                            help="Roughness is the C factor for Hazen‑Williams, absolute roughness (mm) for Darcy‑Weisbach.")
+
+    if st.button("Solve Network", key="solve_network"):
+        try:
+            network = PipeNetwork(nodes.dropna(how="all"), pipes.dropna(how="all"))
+        except (KeyError, ValueError) as e:
+            st.error(f"Invalid network: {e}")
+        else:
+            # same pipes and reservoirs as last time → keep the old solution as the starting point,
+            # taking the edited demands and elevations
+            cached = st.session_state.get("pipe_network")
+            if cached is not None and cached.key == network.key:
+                cached.set_demands(network.demand * 1000)
+                cached.elevation = network.elevation
+                network = cached
+            st.session_state.pipe_network = network
+            node_res, pipe_res, info = network.solve(headloss)
+            if info["converged"]:
+                st.success(f"Converged in {info['iterations']} iterations.")
+            else:
+                st.warning(f"Did not converge in {info['iterations']} iterations — check the network.")
+            st.dataframe(node_res.style.format(precision=2))
+            st.dataframe(pipe_res.style.format(precision=3))
+            if (node_res["Pressure (m)"] < 0).any():
+                st.warning("Negative pressure at some nodes — the supply head is insufficient.")
+
+    # Rainfall–runoff: SCS-CN excess routed through a unit hydrograph, streamed in chunks
+    st.write("### Rainfall–Runoff Simulation (SCS‑CN + Unit Hydrograph)")
+    rain_file = st.file_uploader("Rainfall record (CSV: Time, Rainfall (mm))", type=["csv"], key="rain_file")
+    c1, c2, c3 = st.columns(3)
+    cn = c1.number_input("Curve Number", min_value=30.0, max_value=100.0, value=75.0, key="rr_cn")
+    area = c2.number_input("Catchment Area (km²)", min_value=0.01, value=5.0, key="rr_area")
+    tc = c3.number_input("Time of Concentration (h)", min_value=0.05, value=1.0, key="rr_tc")
+    dt_min = c1.number_input("Time Step (min)", min_value=1.0, value=5.0, key="rr_dt")
+    dry = c2.number_input("Inter‑event Dry Period (h)", min_value=0.5, value=6.0, key="rr_dry")
+
+    if rain_file and st.button("Run Simulation", key="run_runoff"):
+        try:
+            sim = simulate_csv(rain_file, cn, area, tc, dt_min, dry)
+        except Exception as e:
+            st.error(f"Could not simulate {rain_file.name}: {e}")
+        else:
+            summary = sim.summary()
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Peak Flow", f"{summary['Peak Flow (m³/s)']:.2f} m³/s")
+            m2.metric("Runoff Coefficient", f"{summary['Runoff Coefficient']:.2f}")
+            m3.metric("Runoff Volume", f"{summary['Runoff Volume (m³)']:,.0f} m³")
+            st.write(f"Peak at **{summary['Time of Peak']}** — {summary['Total Rainfall (mm)']:.1f} mm rain, "
+                     f"{summary['Total Excess (mm)']:.1f} mm excess.")
+            st.pyplot(plot_hydrograph(sim.flow_plot.series(), sim.rain_plot.series()))
+            st.write("#### Annual Peak Flows")
+            st.dataframe(sim.annual_peaks())
 
 
 # --- Engineering Tests Section ---
@@ -115,7 +269,39 @@ def run_tests():
     st.info("Conduct lab tests on **water, soil, and materials**.")
 
     test_category = st.selectbox("Select Test Category", ["Water Tests", "Soil Tests"], key="test_category")
-
+    mode = st.radio("Mode", ["Single Sample", "Batch (CSV/Excel)"], horizontal=True, key="test_mode")
+
+    if mode == "Batch (CSV/Excel)":
+        columns = WATER_LAB_COLUMNS if test_category == "Water Tests" else SOIL_LAB_COLUMNS
+        st.caption("Columns: " + ", ".join(columns) + " — missing tests are left blank.")
+        upload = st.file_uploader("Lab results", type=["csv", "xlsx", "xls"], key="lab_batch_file")
+        if test_category == "Water Tests":
+            conv = st.slider("TDS Conversion Factor (0.5–0.7)", min_value=0.5, max_value=0.7, value=0.64,
+                             step=0.01, key="batch_tds_conv")
+        if upload and st.button("Process Batch", key="process_lab_batch"):
+            try:
+                samples = read_upload(upload)
+            except Exception as e:
+                st.error(f"Could not read {upload.name}: {e}")
+                return
+            results = (process_water_batch(samples, conv) if test_category == "Water Tests"
+                       else process_soil_batch(samples))
+            stats, counts = batch_summary(results)
+            st.success(f"Processed {len(results)} samples.")
+            st.write("#### Summary Statistics")
+            st.dataframe(stats.style.format(precision=2))
+            st.write("#### Class Counts")
+            st.dataframe(counts, hide_index=True)
+            st.write("#### Results")
+            st.dataframe(results)
+            st.download_button("Download Results (CSV)", results.to_csv(index=False),
+                               file_name="lab_results.csv", mime="text/csv", key="download_lab_results")
+        return
+
+    # one sample: the same classification tables as the batch path
+    verdicts = {"Excellent": (st.success, "💧"), "Good": (st.info, "✅"), "Fair": (st.warning, "⚠️"),
+                "Poor": (st.error, "❌"), "Acceptable": (st.success, "✅"), "Acidic": (st.warning, "⚠️"),
+                "Alkaline": (st.warning, "⚠️")}
     if test_category == "Water Tests":
         test_type = st.selectbox("Select Water Test", ["TDS", "pH"], key="water_test_type")
         if test_type == "TDS":
@@ -125,14 +311,30 @@ def run_tests():
             if st.button("Calculate TDS", key="calc_tds"):
                 tds = ec * conv
                 st.write(f"**TDS:** {tds:.2f} mg/L")
-                if tds < 300:
-                    st.success("💧 Excellent Water Quality")
-                elif tds < 600:
-                    st.info("✅ Good Water Quality")
-                elif tds < 900:
-                    st.warning("⚠️ Fair Water Quality")
-                else:
-                    st.error("❌ Poor Water Quality")
+                quality = classify([tds], TDS_CLASSES)[0]
+                show, icon = verdicts[quality]
+                show(f"{icon} {quality} Water Quality")
+        else:
+            st.subheader("🧪 pH Test")
+            ph = st.number_input("Enter pH", min_value=0.0, max_value=14.0, value=7.0, step=0.1, key="water_ph")
+            if st.button("Classify pH", key="calc_water_ph"):
+                ph_class = classify([ph], WATER_PH_CLASSES)[0]
+                show, icon = verdicts[ph_class]
+                show(f"{icon} pH {ph:.1f}: {ph_class} (drinking water range 6.5–8.5)")
+    else:
+        st.subheader("🌱 Soil Tests")
+        c1, c2 = st.columns(2)
+        ph = c1.number_input("Soil pH", min_value=0.0, max_value=14.0, value=7.0, step=0.1, key="soil_ph")
+        ec = c2.number_input("Soil EC (dS/m)", min_value=0.0, value=1.0, key="soil_ec")
+        ll = c1.number_input("Liquid Limit (%)", min_value=0.0, value=40.0, key="soil_ll")
+        pl = c2.number_input("Plastic Limit (%)", min_value=0.0, value=20.0, key="soil_pl")
+        if st.button("Classify Soil", key="calc_soil"):
+            result = process_soil_batch(pd.DataFrame({"pH": [ph], "EC (dS/m)": [ec],
+                                                      "Liquid Limit (%)": [ll], "Plastic Limit (%)": [pl]}))
+            row = result.iloc[0]
+            st.write(f"- **pH:** {row['pH Class']}")
+            st.write(f"- **Salinity:** {row['Salinity']}")
+            st.write(f"- **Plasticity Index:** {row['Plasticity Index (%)']:.1f}% ({row['Plasticity']})")
 
 
 # --- Beam Analysis Sub‑Tab ---
@@ -159,60 +361,72 @@ def run_beam_analysis():
         )
         supports.append({"pos":pos, "type":sup_type})
 
-    # Point loads (unlimited)
+    # Loads: one table widget per load kind (not 3–4 widgets per load), backed
+    # by a persistent Beam that only receives the rows that changed.
+    if "beam_pl_base" not in st.session_state:
+        st.session_state.beam_pl_base = pd.DataFrame(
+            {"Position (m)": pd.Series(dtype=float), "Magnitude (kN)": pd.Series(dtype=float),
+             "Direction": pd.Series(dtype=object)})
+        st.session_state.beam_udl_base = pd.DataFrame(
+            {"Start (m)": pd.Series(dtype=float), "End (m)": pd.Series(dtype=float),
+             "Intensity (kN/m)": pd.Series(dtype=float), "Direction": pd.Series(dtype=object)})
+
+    with st.expander("Import Loads (CSV/Excel)"):
+        st.caption("Point loads: Position, Magnitude[, Direction]. "
+                   "UDLs: Start, End, Intensity[, Direction]. Direction defaults to Downward.")
+        upload = st.file_uploader("Load file", type=["csv", "xlsx", "xls"], key="beam_import_file")
+        if upload and st.button("Import Loads", key="import_beam_loads"):
+            try:
+                pl_base, udl_base = split_beam_loads(read_upload(upload))
+            except Exception as e:
+                st.error(f"Could not read {upload.name}: {e}")
+            else:
+                st.session_state.beam_pl_base, st.session_state.beam_udl_base = pl_base, udl_base
+                st.session_state.beam_editor_version = st.session_state.get("beam_editor_version", 0) + 1
+                st.success(f"Imported {len(pl_base)} point loads and {len(udl_base)} UDLs.")
+
+    version = st.session_state.get("beam_editor_version", 0)
+    direction_col = st.column_config.SelectboxColumn("Direction", options=["Downward", "Upward"], default="Downward")
+
     st.write("#### Point Loads")
-    n_pl = st.number_input("How many point loads?", min_value=0, value=0, step=1, key="beam_pl_num")
-    point_loads = []
-    for i in range(int(n_pl)):
-        pos = st.number_input(f"Load #{i+1} Position (m)", min_value=0.0, max_value=length,
-                               value=length/2, key=f"beam_pl_pos_{i}")
-        mag = st.number_input(f"Load #{i+1} Magnitude (kN)", value=10.0, key=f"beam_pl_mag_{i}")
-        direction = st.selectbox(f"Load #{i+1} Direction", ["Downward","Upward"], key=f"beam_pl_dir_{i}")
-        sign = 1 if direction=="Upward" else -1
-        point_loads.append({"pos":pos, "mag":mag * sign})
-
-    # Uniformly distributed loads (unlimited)
+    pl_table = st.data_editor(
+        st.session_state.beam_pl_base, num_rows="dynamic", key=f"beam_pl_editor_{version}",
+        column_config={
+            "Position (m)": st.column_config.NumberColumn(min_value=0.0, max_value=length, default=length/2),
+            "Magnitude (kN)": st.column_config.NumberColumn(default=10.0),
+            "Direction": direction_col,
+        },
+    )
+
     st.write("#### Uniformly Distributed Loads")
-    n_udl = st.number_input("How many UDLs?", min_value=0, value=0, step=1, key="beam_udl_num")
-    udls = []
-    for i in range(int(n_udl)):
-        start = st.number_input(f"UDL #{i+1} Start (m)", min_value=0.0, max_value=length,
-                                 value=0.0, key=f"beam_udl_start_{i}")
-        end   = st.number_input(f"UDL #{i+1} End (m)",   min_value=0.0, max_value=length,
-                                 value=length, key=f"beam_udl_end_{i}")
-        intensity = st.number_input(f"UDL #{i+1} Intensity (kN/m)", value=5.0, key=f"beam_udl_int_{i}")
-        direction = st.selectbox(f"UDL #{i+1} Direction", ["Downward","Upward"], key=f"beam_udl_dir_{i}")
-        sign = 1 if direction=="Upward" else -1
-        udls.append({"start":start, "end":end, "int":intensity * sign})
-
-    # Build & solve
-    beam = Beam(length)
-    for sup in supports:
-        beam.add_support(sup["pos"], sup["type"])
-    for pl in point_loads:
-        beam.add_point_load(pl["pos"], pl["mag"])
-    for ud in udls:
-        beam.add_distributed_load(ud["start"], ud["end"], ud["int"])
+    udl_table = st.data_editor(
+        st.session_state.beam_udl_base, num_rows="dynamic", key=f"beam_udl_editor_{version}",
+        column_config={
+            "Start (m)": st.column_config.NumberColumn(min_value=0.0, max_value=length, default=0.0),
+            "End (m)": st.column_config.NumberColumn(min_value=0.0, max_value=length, default=length),
+            "Intensity (kN/m)": st.column_config.NumberColumn(default=5.0),
+            "Direction": direction_col,
+        },
+    )
+
+    # Sync & solve
+    beam = st.session_state.get("beam_model")
+    if beam is None:
+        beam = st.session_state.beam_model = Beam(length)
+    beam.length = length
+    if beam.supports != [(sup["pos"], sup["type"]) for sup in supports]:
+        beam.supports = []
+        for sup in supports:
+            beam.add_support(sup["pos"], sup["type"])
+    beam.sync_loads("point", *beam_load_rows(pl_table, "point"))
+    beam.sync_loads("udl", *beam_load_rows(udl_table, "udl"))
 
     if st.button("🔎 Analyze Beam", key="analyze_beam"):
-        beam.analyze()
-        reactions = beam.reactions
-
-        xs = np.linspace(0, beam.length, 500)
-        Vs = np.array([beam.shear_at(x) for x in xs])
-        Ms = np.array([beam.moment_at(x) for x in xs])
-
-        # Critical values
-        idx_v = np.argmax(np.abs(Vs))
-        Vmax, x_vmax = Vs[idx_v], xs[idx_v]
-        zero_idxs = np.where(Vs[:-1]*Vs[1:]<0)[0]
-        if zero_idxs.size>0:
-            i0 = zero_idxs[0]
-            x0 = xs[i0] - Vs[i0]*(xs[i0+1]-xs[i0])/(Vs[i0+1]-Vs[i0])
-        else:
-            x0 = xs[np.argmax(np.abs(Ms))]
-        idx_m = np.argmax(np.abs(Ms))
-        Mmax, x_mmax = Ms[idx_m], xs[idx_m]
+        summary = beam_summary(beam)
+        reactions = summary["Reactions (kN)"]
+        Vmax, x_vmax = summary["Max Shear (kN)"], summary["x Max Shear (m)"]
+        x0 = summary["Shear Zero (m)"]
+        Mmax, x_mmax = summary["Max Moment (kN·m)"], summary["x Max Moment (m)"]
 
         # Output
         st.write("#### Support Reactions")
@@ -238,6 +452,29 @@ def run_beam_analysis():
 Use these critical points for detailed design and reinforcement checks.
 """)
 
+    # Section properties → a member-results row for the compliance checks
+    with st.expander("Save to Member Results (RC section)"):
+        c1, c2, c3, c4 = st.columns(4)
+        member = c1.text_input("Member ID", value="B1", key="beam_member_id")
+        b = c2.number_input("b (mm)", min_value=50.0, value=300.0, key="beam_sec_b")
+        h = c3.number_input("h (mm)", min_value=50.0, value=500.0, key="beam_sec_h")
+        d = c4.number_input("d (mm)", min_value=25.0, value=450.0, key="beam_sec_d")
+        fc = c1.number_input("f'c (MPa)", min_value=10.0, value=28.0, key="beam_sec_fc")
+        fy = c2.number_input("fy (MPa)", min_value=200.0, value=420.0, key="beam_sec_fy")
+        As = c3.number_input("As (mm²)", min_value=0.0, value=1500.0, key="beam_sec_as")
+        Av = c4.number_input("Av (mm²)", min_value=0.0, value=157.0, key="beam_sec_av")
+        s = c1.number_input("Stirrup spacing s (mm)", min_value=0.0, value=150.0, key="beam_sec_s")
+        if st.button("Save Member", key="save_beam_member"):
+            try:
+                row = beam_member_result(beam, member, b, h, d, fc, fy, As, Av, s)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                session_table("member_results", MEMBER_COLUMNS,
+                              {c: float for c in MEMBER_COLUMNS[1:]}, index="Member").append(row)
+                st.success(f"Saved {member}: Mu = {row['Mu (kN·m)']:.1f} kN·m, Vu = {row['Vu (kN)']:.1f} kN, "
+                           f"deflection = {row['Deflection (mm)']:.2f} mm.")
+
 # --- Combined Tabs for Design & Analysis ---
 def run():
     st.title("🛠️ Design and Analysis")
@@ -1,6 +1,12 @@
 import streamlit as st
 import pandas as pd
+import plotly.express as px
 from datetime import datetime
+import search
+from tables import session_table, as_frame
+from scheduling import CPMSchedule, schedule_inputs, level_resources
+from earned_value import task_budgets, earned_value, ev_summary
+from plots import gantt_window, plot_gantt
 
 def run():
     st.title("📅 Project Management")
@@ -23,28 +29,73 @@ def run():
         status = st.selectbox("Status", ["Not Started", "In Progress", "Completed"], key="schedule_status")
 
         # Initialize scheduling data in session state if not present
-        if "scheduling_data" not in st.session_state:
-            st.session_state.scheduling_data = pd.DataFrame(
-                columns=["Task", "Description", "Priority", "Start Date", "End Date", "Status", "Created At"]
-            )
+        scheduling = session_table(
+            "scheduling_data",
+            ["Task", "Description", "Priority", "Start Date", "End Date", "Status", "Predecessors", "Created At"]
+        )
+        existing = [t for t in scheduling.column("Task") if t] if not scheduling.empty else []
+        predecessors = st.multiselect("Predecessors (must finish first)", existing, key="schedule_predecessors")
 
         # Add a task button
         if st.button("Add Task", key="add_schedule_task"):
             created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            new_row = pd.DataFrame({
-                "Task": [task],
-                "Description": [description],
-                "Priority": [priority],
-                "Start Date": [start_date],
-                "End Date": [end_date],
-                "Status": [status],
-                "Created At": [created_at]
+            scheduling.append({
+                "Task": task,
+                "Description": description,
+                "Priority": priority,
+                "Start Date": start_date,
+                "End Date": end_date,
+                "Status": status,
+                "Predecessors": ", ".join(predecessors),
+                "Created At": created_at
             })
-            st.session_state.scheduling_data = pd.concat(
-                [st.session_state.scheduling_data, new_row], ignore_index=True
-            )
+            search.index("Task", task, task, " · ".join(filter(None, [description, priority, status])))
         st.write("### Project Timeline")
-        st.dataframe(st.session_state.scheduling_data)
+        st.dataframe(scheduling.to_frame())
+
+        # CPM: kept in the session and synced, so one edited task only re-runs the levels it touches
+        if not scheduling.empty:
+            st.write("### Critical Path Analysis")
+            tasks, durations, preds, release, project_start = schedule_inputs(scheduling.to_frame())
+            cpm = st.session_state.get("cpm_schedule")
+            try:
+                if cpm is None:
+                    cpm = CPMSchedule(tasks, durations, preds, release)
+                else:
+                    cpm.sync(tasks, durations, preds, release)
+            except ValueError as e:
+                st.session_state.pop("cpm_schedule", None)
+                st.error(f"Cannot schedule: {e}")
+            else:
+                st.session_state.cpm_schedule = cpm
+                st.session_state.project_start = project_start
+                result = cpm.results()
+                if pd.notna(project_start):
+                    for col in ["Early Start", "Early Finish", "Late Start", "Late Finish"]:
+                        result[col + " Date"] = project_start + pd.to_timedelta(result[col], unit="D")
+                    finish = project_start + pd.Timedelta(days=cpm.project_duration)
+                    st.write(f"**Project Duration:** {cpm.project_duration:.0f} days (finish {finish:%Y-%m-%d})")
+                st.write(f"**Critical Path:** {' → '.join(cpm.critical_path())}")
+                st.dataframe(result, hide_index=True)
+
+                # Gantt: only the tasks in the chosen window go to the browser, collapsed when too many
+                if pd.notna(project_start):
+                    st.write("### Gantt Chart")
+                    tasks = (result.rename(columns={"Early Start Date": "Start", "Early Finish Date": "Finish"})
+                             .sort_values(["Start", "Finish"], kind="stable"))
+                    first, last = tasks["Start"].min().date(), max(tasks["Finish"].max().date(),
+                                                                     tasks["Start"].min().date() + pd.Timedelta(days=1))
+                    c1, c2 = st.columns([3, 1])
+                    window = c1.slider("Date window", min_value=first, max_value=last, value=(first, last),
+                                       key="gantt_window")
+                    max_bars = c2.select_slider("Max bars", [100, 300, 1000, 3000], value=1000, key="gantt_max_bars")
+                    rows = st.slider("Task rows", 0, len(tasks), (0, len(tasks)), key="gantt_rows") \
+                        if len(tasks) > max_bars else None
+                    bars = gantt_window(tasks, window, rows, max_bars)
+                    if (bars["Count"] > 1).any():
+                        st.caption(f"{bars['Count'].sum():,} tasks shown as {len(bars):,} summary bars — "
+                                   "narrow the window or rows to see individual tasks.")
+                    st.plotly_chart(plot_gantt(bars), use_container_width=True, config={"scrollZoom": True})
 
     # ---------- Resource Allocation Tab ----------
     with tabs[1]:
@@ -55,35 +106,64 @@ def run():
         # Input fields for resource allocation
         resource = st.text_input("Enter Resource Name", key="resource_name")
         resource_type = st.selectbox("Resource Type", ["Labor", "Equipment", "Materials"], key="resource_type")
-        assigned_task = st.text_input("Assigned Task", key="assigned_task")
-        quantity = st.number_input("Quantity", min_value=0.0, step=1.0, key="resource_quantity")
+        cpm = st.session_state.get("cpm_schedule")
+        if cpm is not None and cpm.ids:
+            assigned_task = st.selectbox("Assigned Task", cpm.ids, key="assigned_task_select")
+        else:
+            assigned_task = st.text_input("Assigned Task", key="assigned_task")
+        quantity = st.number_input("Quantity (per working day)", min_value=0.0, step=1.0, key="resource_quantity")
         unit_cost = st.number_input("Unit Cost", min_value=0.0, step=0.1, key="resource_unit_cost")
-        # Total cost calculated automatically if unit cost and quantity are given
-        total_cost = quantity * unit_cost
+        # Total cost over the assigned task's CPM duration (one day when the task isn't scheduled)
+        days = float(cpm.dur[cpm.index[assigned_task]]) if cpm is not None and assigned_task in cpm.index else 1.0
+        total_cost = quantity * unit_cost * days
+        st.caption(f"Total Cost: {total_cost:,.2f} over {days:g} working day(s)")
 
         # Initialize resource allocation data
-        if "resource_data" not in st.session_state:
-            st.session_state.resource_data = pd.DataFrame(
-                columns=["Resource", "Resource Type", "Assigned Task", "Quantity", "Unit Cost", "Total Cost", "Allocated At"]
-            )
+        resources = session_table(
+            "resource_data",
+            ["Resource", "Resource Type", "Assigned Task", "Quantity", "Unit Cost", "Total Cost", "Allocated At"],
+            {"Quantity": float, "Unit Cost": float, "Total Cost": float}
+        )
 
         # Add resource allocation entry
         if st.button("Allocate Resource", key="allocate_resource"):
             allocated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            new_row = pd.DataFrame({
-                "Resource": [resource],
-                "Resource Type": [resource_type],
-                "Assigned Task": [assigned_task],
-                "Quantity": [quantity],
-                "Unit Cost": [unit_cost],
-                "Total Cost": [total_cost],
-                "Allocated At": [allocated_at]
+            resources.append({
+                "Resource": resource,
+                "Resource Type": resource_type,
+                "Assigned Task": assigned_task,
+                "Quantity": quantity,
+                "Unit Cost": unit_cost,
+                "Total Cost": total_cost,
+                "Allocated At": allocated_at
             })
-            st.session_state.resource_data = pd.concat(
-                [st.session_state.resource_data, new_row], ignore_index=True
-            )
         st.write("### Resource Allocation")
-        st.dataframe(st.session_state.resource_data)
+        st.dataframe(resources.to_frame())
+
+        # Daily histogram against the CPM schedule, levelled within float
+        if cpm is not None and not resources.empty:
+            st.write("### Resource Histogram & Leveling")
+            names = sorted({str(r) for r in resources.column("Resource")})
+            limits = st.session_state.get("resource_capacity", pd.DataFrame(columns=["Resource", "Daily Capacity"]))
+            limits = (limits.set_index("Resource").reindex(names).rename_axis("Resource").reset_index()
+                      .astype({"Daily Capacity": float}))
+            limits = st.data_editor(
+                limits, disabled=["Resource"], hide_index=True, key="resource_capacity_editor",
+                column_config={"Daily Capacity": st.column_config.NumberColumn(
+                    "Daily Capacity", min_value=0.0, help="Units available per day; blank = unlimited.")},
+            )
+            st.session_state.resource_capacity = limits
+            plan = level_resources(cpm, resources.to_frame(), dict(zip(limits["Resource"], limits["Daily Capacity"])))
+            st.dataframe(plan["overallocation"], hide_index=True)
+            view = st.radio("Histogram", ["Levelled", "Early start"], horizontal=True, key="resource_hist_view")
+            hist = plan["after"] if view == "Levelled" else plan["before"]
+            if not hist.empty:
+                st.plotly_chart(px.line(hist, line_shape="hv", labels={"value": "Units / day", "variable": "Resource"}),
+                                use_container_width=True)
+            shifted = plan["schedule"][(plan["schedule"]["Shift (days)"] > 0) | plan["schedule"]["Unresolved"]]
+            if len(shifted):
+                st.write(f"{len(shifted)} tasks moved or still over‑allocated:")
+                st.dataframe(shifted, hide_index=True)
 
     # ---------- Progress Monitoring Tab ----------
     with tabs[2]:
@@ -92,29 +172,63 @@ def run():
         st.info("Monitor project progress with detailed status updates and remarks.")
 
         # Input fields for progress monitoring
-        prog_task = st.text_input("Enter Task Name", key="progress_task_name")
+        cpm = st.session_state.get("cpm_schedule")
+        if cpm is not None and cpm.ids:
+            prog_task = st.selectbox("Task", cpm.ids, key="progress_task_select")
+        else:
+            prog_task = st.text_input("Enter Task Name", key="progress_task_name")
         prog_status = st.selectbox("Task Status", ["Not Started", "In Progress", "Completed"], key="progress_status")
         progress_percentage = st.slider("Completion Percentage", 0, 100, step=5, key="progress_slider")
+        cost_to_date = st.number_input("Cost to Date", min_value=0.0, step=100.0, key="progress_cost")
         remarks = st.text_area("Remarks", key="progress_remarks")
 
-        # Initialize progress monitoring data
-        if "progress_data" not in st.session_state:
-            st.session_state.progress_data = pd.DataFrame(
-                columns=["Task", "Status", "Progress (%)", "Remarks", "Updated At"]
-            )
+        # Progress log indexed by task: current state and per-task history without a scan
+        progress = session_table(
+            "progress_data",
+            ["Task", "Status", "Progress (%)", "Cost to Date", "Remarks", "Updated At"],
+            {"Progress (%)": int, "Cost to Date": float},
+            index="Task",
+        )
 
         # Add progress data entry
         if st.button("Add Progress Data", key="add_progress_task"):
             updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            new_row = pd.DataFrame({
-                "Task": [prog_task],
-                "Status": [prog_status],
-                "Progress (%)": [progress_percentage],
-                "Remarks": [remarks],
-                "Updated At": [updated_at]
+            progress.append({
+                "Task": prog_task,
+                "Status": prog_status,
+                "Progress (%)": progress_percentage,
+                "Cost to Date": cost_to_date,
+                "Remarks": remarks,
+                "Updated At": updated_at
             })
-            st.session_state.progress_data = pd.concat(
-                [st.session_state.progress_data, new_row], ignore_index=True
-            )
-        st.write("### Task Progress")
-        st.dataframe(st.session_state.progress_data)
+        st.write("### Current Task Status")
+        st.dataframe(progress.latest_frame(), hide_index=True)
+        if prog_task in progress.keys():
+            with st.expander(f"History — {prog_task}"):
+                st.dataframe(progress.history(prog_task), hide_index=True)
+        with st.expander("Full progress log"):
+            st.dataframe(progress.to_frame())
+
+        # Earned value against the CPM baseline and the budgets of each task
+        project_start = st.session_state.get("project_start")
+        if cpm is not None and cpm.ids and pd.notna(project_start):
+            st.write("### Earned Value")
+            budgets, unlinked = task_budgets(cpm.ids, as_frame(st.session_state.get("resource_data")),
+                                             as_frame(st.session_state.get("cost_estimation_data")))
+            if not budgets.sum():
+                st.info("Link resource allocations or cost items to tasks to get a budget baseline.")
+            else:
+                curves = earned_value(cpm, project_start, progress.to_frame(), budgets)
+                summary = ev_summary(curves, budgets)
+                m = st.columns(4)
+                m[0].metric("Budget (BAC)", f"{summary['BAC']:,.0f}")
+                m[1].metric("SPI", f"{summary['SPI']:.2f}")
+                m[2].metric("CPI", f"{summary['CPI']:.2f}")
+                m[3].metric("Complete", f"{summary['% Complete']:.1f}%")
+                st.caption(f"As of {summary['Date']:%Y-%m-%d}: SV {summary['SV']:,.0f}, CV {summary['CV']:,.0f}, "
+                           f"EAC {summary['EAC']:,.0f}."
+                           + (f"  {unlinked:,.0f} of cost is not linked to a task." if unlinked else ""))
+                st.plotly_chart(px.line(curves[["PV", "EV", "AC"]], labels={"value": "Cost", "variable": ""}),
+                                use_container_width=True)
+                st.plotly_chart(px.line(curves[["SPI", "CPI"]], labels={"value": "Index", "variable": ""}),
+                                use_container_width=True)
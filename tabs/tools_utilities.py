@@ -1,6 +1,22 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
+from tables import session_table
+from takeoff import UNIT_SCALES, is_binary_dxf, takeoff
+import costing
+from costing import ROLLUP_DIMENSIONS, CostRollup
+
+COST_COLUMNS = ["Material", "Unit Price", "Quantity", "Unit", "Total Cost", "Currency", "Notes", "Task", "Category"]
+COST_DTYPES = {"Unit Price": float, "Quantity": float, "Total Cost": float}
+
+# takeoff quantity billed by default for each entity kind → (column, unit)
+TAKEOFF_MEASURES = {"Length": ("Length (m)", "meters"), "Area": ("Area (m²)", "m²"), "Count": ("Count", "pieces")}
+
+def _default_measure(entity):
+    if entity.startswith("Block"):
+        return "Count"
+    return "Area" if entity in ("Hatch", "Circle") else "Length"
 
 def run():
     st.title("🔧 Tools and Utilities")
@@ -20,6 +36,67 @@ def run():
         if uploaded_file:
             st.success(f"📁 {uploaded_file.name} uploaded successfully!")
 
+        if uploaded_file and uploaded_file.name.lower().endswith(".dxf"):
+            st.write("### Quantity Takeoff")
+            units = st.selectbox("Drawing units", ["From drawing", *UNIT_SCALES], key="cad_units")
+            scale = None if units == "From drawing" else UNIT_SCALES[units]
+            # parsed once per file and unit choice, not on every rerun
+            cached = st.session_state.get("cad_takeoff")
+            if cached is None or cached[0] != (uploaded_file.file_id, scale):
+                # a drawing that can't be read is cached with its message instead of the scale
+                if is_binary_dxf(uploaded_file):
+                    cached = ((uploaded_file.file_id, scale), None,
+                              "Binary DXF is not supported — save the drawing as ASCII DXF.")
+                else:
+                    with st.spinner("Reading drawing..."):
+                        uploaded_file.seek(0)
+                        try:
+                            quantities, used = takeoff(uploaded_file, scale)
+                        except (ValueError, IndexError) as e:
+                            quantities, used = None, f"Could not read DXF: {e}"
+                    cached = ((uploaded_file.file_id, scale), quantities, used)
+                st.session_state.cad_takeoff = cached
+            _, quantities, used = cached
+
+            if quantities is None:
+                st.error(used)
+            elif quantities.empty:
+                st.info("No lines, polylines, hatches, circles, arcs or blocks found in the drawing.")
+            else:
+                st.caption(f"1 drawing unit = {used:g} m")
+                items = quantities.assign(
+                    Add=True, Measure=quantities["Entity"].map(_default_measure),
+                    Material=quantities["Layer"], **{"Unit Price": 0.0})
+                items = st.data_editor(
+                    items[["Add", "Layer", "Entity", "Count", "Length (m)", "Area (m²)", "Measure", "Material", "Unit Price"]],
+                    column_config={
+                        "Measure": st.column_config.SelectboxColumn(options=list(TAKEOFF_MEASURES), required=True),
+                        "Length (m)": st.column_config.NumberColumn(format="%.2f"),
+                        "Area (m²)": st.column_config.NumberColumn(format="%.2f"),
+                        "Unit Price": st.column_config.NumberColumn(min_value=0.0),
+                    },
+                    disabled=["Layer", "Entity", "Count", "Length (m)", "Area (m²)"],
+                    hide_index=True, key=f"cad_takeoff_items_{uploaded_file.file_id}")
+
+                if st.button("Add to Cost Estimate", key="cad_add_costs"):
+                    picked = items[items["Add"]]
+                    quantity = np.select([picked["Measure"] == m for m in TAKEOFF_MEASURES],
+                                         [picked[c].to_numpy(dtype=float) for c, _ in TAKEOFF_MEASURES.values()], 0.0)
+                    costs = session_table("cost_estimation_data", COST_COLUMNS, COST_DTYPES)
+                    costs.extend(pd.DataFrame({
+                        "Material": picked["Material"].to_numpy(),
+                        "Unit Price": picked["Unit Price"].to_numpy(dtype=float),
+                        "Quantity": quantity.round(3),
+                        "Unit": picked["Measure"].map(lambda m: TAKEOFF_MEASURES[m][1]).to_numpy(),
+                        "Total Cost": picked["Unit Price"].to_numpy(dtype=float) * quantity,
+                        "Currency": st.session_state.get("qt_currency", "USD ($)"),
+                        "Notes": [f"DXF takeoff: {uploaded_file.name} · {l} · {e}"
+                                  for l, e in zip(picked["Layer"], picked["Entity"])],
+                        "Task": "",
+                        "Category": picked["Material"].map(costing.catalog().category).to_numpy(),
+                    }, columns=COST_COLUMNS))
+                    st.success(f"Added {len(picked)} takeoff items to the cost estimate.")
+
     # Quantity Takeoff & Cost Estimation Tab
     with tabs[1]:
         st.header("Quantity Takeoff & Cost Estimation")
@@ -65,41 +142,94 @@ def run():
         if selected_unit == "Other":
             selected_unit = st.text_input("Enter Custom Unit", key="qt_custom_unit")
 
-        # Currency selection
-        currency_options = ["USD ($)", "IQD (Iraqi Dinar)", "EUR (€)", "GBP (£)", "Other"]
+        # Currency selection (the rate table's currencies)
+        fx, price_list = costing.rates(), costing.catalog()
+        currency_options = [*fx, "Other"]
         selected_currency = st.selectbox("Select Currency", currency_options, key="qt_currency")
 
         # Allow user to enter custom currency if "Other" is selected
         currency_symbol = selected_currency if selected_currency != "Other" else st.text_input("Enter Custom Currency", key="qt_custom_currency")
 
-        unit_price = st.number_input(f"Enter Unit Price ({currency_symbol}/{selected_unit})", min_value=0.0, key="qt_unit_price")
-        quantity = st.number_input(f"Enter Quantity Needed ({selected_unit})", min_value=0, key="qt_quantity")
+        # The catalog price (converted to the chosen currency) is the default unit price
+        listed = price_list.get(material, selected_unit)
+        list_price = costing.convert(listed["Unit Price"], listed["Currency"], currency_symbol, fx) if listed else np.nan
+        unit_price = st.number_input(f"Enter Unit Price ({currency_symbol}/{selected_unit})", min_value=0.0,
+                                     value=float(list_price) if list_price == list_price else 0.0,
+                                     key=f"qt_unit_price_{material}_{selected_unit}_{currency_symbol}")
+        if listed:
+            st.caption(f"Catalog: {listed['Unit Price']:,.2f} {listed['Currency']}/{selected_unit} · {listed['Category']}")
+        quantity = st.number_input(f"Enter Quantity Needed ({selected_unit})", min_value=0.0, key="qt_quantity")
 
         # Notes input
         note = st.text_area("Add Notes (Optional)", key="qt_notes")
 
-        if "cost_estimation_data" not in st.session_state:
-            st.session_state.cost_estimation_data = pd.DataFrame(columns=["Material", "Unit Price", "Quantity", "Unit", "Total Cost", "Currency", "Notes"])
+        # Optional link to a scheduled task, so the item counts in that task's budget
+        cpm = st.session_state.get("cpm_schedule")
+        cost_task = st.selectbox("Task (optional)", ["", *cpm.ids] if cpm is not None else [""], key="qt_task")
+
+        costs = session_table("cost_estimation_data", COST_COLUMNS, COST_DTYPES)
 
         if st.button("Add Material", key="add_qt_material"):
             total_cost = unit_price * quantity
-            new_row = pd.DataFrame({
-                "Material": [material], 
-                "Unit Price": [unit_price], 
-                "Quantity": [quantity], 
-                "Unit": [selected_unit],
-                "Total Cost": [total_cost], 
-                "Currency": [currency_symbol], 
-                "Notes": [note]
+            costs.append({
+                "Material": material, 
+                "Unit Price": unit_price, 
+                "Quantity": quantity, 
+                "Unit": selected_unit,
+                "Total Cost": total_cost, 
+                "Currency": currency_symbol, 
+                "Notes": note,
+                "Task": cost_task,
+                "Category": price_list.category(material),
             })
-            st.session_state.cost_estimation_data = pd.concat([st.session_state.cost_estimation_data, new_row], ignore_index=True)
+
+        # Roll-ups follow the table incrementally: only lines added since the last rerun are folded in
+        rollup = st.session_state.get("cost_rollup")
+        if rollup is None or rollup[0] is not costs:
+            rollup = st.session_state.cost_rollup = (costs, CostRollup())
+        rollup = rollup[1]
+        rollup.catch_up(costs, price_list.category)
 
         st.write("### Cost Estimation Breakdown")
-        st.dataframe(st.session_state.cost_estimation_data)
+        st.dataframe(costs.to_frame())
+
+        with st.expander("Edit a line"):
+            if len(costs):
+                line = st.number_input("Line", 0, len(costs) - 1, key="qt_edit_line")
+                c1, c2 = st.columns(2)
+                new_quantity = c1.number_input("Quantity", min_value=0.0, value=float(costs.column("Quantity")[line]),
+                                               key=f"qt_edit_quantity_{line}")
+                new_price = c2.number_input("Unit Price", min_value=0.0, value=float(costs.column("Unit Price")[line]),
+                                            key=f"qt_edit_price_{line}")
+                if st.button("Update Line", key="qt_update_line"):
+                    rollup.update(costs, line, {"Quantity": new_quantity, "Unit Price": new_price,
+                                                "Total Cost": new_quantity * new_price}, price_list.category)
+                    st.rerun()
+
+        # Project totals converted through the rate table, O(currencies)
+        st.write("### Totals")
+        report_currency = st.selectbox("Show totals in", list(fx), key="qt_report_currency")
+        total_project_cost, unconverted = rollup.project_total(report_currency, fx)
+        st.write(f"**Total Project Cost:** {total_project_cost:,.2f} {report_currency}")
+        if unconverted:
+            st.warning("Not included (no exchange rate): "
+                       + ", ".join(f"{t:,.2f} {c}" for c, t in unconverted.items()))
+        for tab, dim in zip(st.tabs([f"By {d}" for d in ROLLUP_DIMENSIONS]), ROLLUP_DIMENSIONS):
+            tab.dataframe(rollup.table(dim, report_currency, fx), hide_index=True)
 
-        # Total Cost Summary
-        total_project_cost = st.session_state.cost_estimation_data["Total Cost"].sum()
-        st.write(f"**Total Project Cost:** {total_project_cost:,.2f} {currency_symbol}")
+        with st.expander("Price Catalog & Exchange Rates"):
+            version = st.session_state.setdefault("qt_catalog_version", 0)
+            st.caption(f"Exchange rates: units of each currency per 1 USD ({costing.RATES_FILE}).")
+            rate_table = st.data_editor(pd.DataFrame(list(fx.items()), columns=costing.RATE_COLUMNS),
+                                        num_rows="dynamic", hide_index=True, key=f"qt_rates_{version}")
+            st.caption(f"Price catalog, looked up by material and unit ({costing.CATALOG_FILE}).")
+            catalog_table = st.data_editor(price_list.frame, num_rows="dynamic", hide_index=True,
+                                           key=f"qt_catalog_{version}")
+            if st.button("Save Catalog & Rates", key="qt_save_catalog"):
+                costing.save_table(costing.RATES_FILE, rate_table.dropna(subset=["Currency"]))
+                costing.save_table(costing.CATALOG_FILE, catalog_table.dropna(subset=["Material"]))
+                st.session_state.qt_catalog_version += 1
+                st.rerun()
 
     # Data Visualization Tab
     with tabs[2]:
@@ -0,0 +1,291 @@
+# takeoff.py
+"""
+Quantity takeoff from ASCII DXF drawings.
+
+The file is read as a stream of (group code, value) pairs and only the
+current entity's pairs are held.  Geometry is queued in flat coordinate
+buffers that are measured CHUNK vertices at a time with NumPy and folded
+into running totals per (layer, kind), so memory stays bounded however
+many entities the drawing has.
+"""
+import io
+import math
+
+import numpy as np
+import pandas as pd
+
+CHUNK = 1 << 16   # vertices (or lines) measured per NumPy batch
+TAKEOFF_COLUMNS = ["Layer", "Entity", "Count", "Length (m)", "Area (m²)"]
+
+# $INSUNITS code → metres per drawing unit
+INSUNITS = {1: 0.0254, 2: 0.3048, 4: 0.001, 5: 0.01, 6: 1.0, 7: 1000.0, 14: 0.1, 15: 10.0}
+UNIT_SCALES = {"mm": 0.001, "cm": 0.01, "m": 1.0, "in": 0.0254, "ft": 0.3048}
+
+def read_pairs(stream, encoding="cp1252"):
+    """Yield (code, value) pairs from a binary DXF stream, one line pair at a time."""
+    text = io.TextIOWrapper(stream, encoding=encoding, errors="replace")
+    try:
+        lines = iter(text)
+        for code, value in zip(lines, lines):
+            yield int(code), value.strip()
+    finally:
+        text.detach()   # leave the caller's stream open
+
+def is_binary_dxf(stream):
+    head = stream.read(22)
+    stream.seek(0)
+    return head.startswith(b"AutoCAD Binary DXF")
+
+# ── Entity geometry ──────────────────────────────────────────────────────────
+def _lwpolyline_vertices(pairs):
+    verts = []
+    for code, value in pairs:
+        if code == 10:
+            verts.append([float(value), 0.0, 0.0])
+        elif code == 20 and verts:
+            verts[-1][1] = float(value)
+        elif code == 42 and verts:
+            verts[-1][2] = float(value)
+    return verts
+
+def _arc_vertices(cx, cy, r, a0, sweep):
+    """Start point(s) and bulges of an arc from angle a0 sweeping `sweep` degrees."""
+    if abs(sweep) >= 359.999:   # a full circle is two half‑circle bulges
+        s = math.copysign(1.0, sweep)
+        a = math.radians(a0)
+        return [[cx + r * math.cos(a), cy + r * math.sin(a), s],
+                [cx - r * math.cos(a), cy - r * math.sin(a), s]]
+    a = math.radians(a0)
+    return [[cx + r * math.cos(a), cy + r * math.sin(a), math.tan(math.radians(sweep) / 4)]]
+
+def _hatch_loops(pairs):
+    """
+    Boundary loops of a HATCH as (vertices, external) — vertices are
+    [x, y, bulge].  Line and arc edges are exact, ellipse edges are split
+    into 16 chords and spline edges follow their control points.
+    """
+    n, i = len(pairs), 0
+
+    def seek(code):
+        nonlocal i
+        while i < n and pairs[i][0] != code:
+            i += 1
+        if i == n:
+            raise ValueError
+        i += 1
+        return pairs[i - 1][1]
+
+    def num(code):
+        return float(seek(code))
+
+    loops = []
+    try:
+        for _ in range(int(seek(91))):
+            flag = int(seek(92))
+            verts = []
+            if flag & 2:   # polyline path
+                has_bulge = int(seek(72))
+                seek(73)
+                for _ in range(int(seek(93))):
+                    verts.append([num(10), num(20), 0.0])
+                    if has_bulge and i < n and pairs[i][0] == 42:
+                        verts[-1][2] = float(pairs[i][1])
+                        i += 1
+            else:
+                for _ in range(int(seek(93))):
+                    kind = int(seek(72))
+                    if kind == 1:     # line
+                        verts.append([num(10), num(20), 0.0])
+                        num(11), num(21)
+                    elif kind == 2:   # circular arc
+                        cx, cy, r, a0, a1 = num(10), num(20), num(40), num(50), num(51)
+                        ccw = int(seek(73))
+                        sweep = (a1 - a0) % 360 or 360 if ccw else -((a1 - a0) % 360 or 360)
+                        verts += _arc_vertices(cx, cy, r, a0 if ccw else -a0, sweep)
+                    elif kind == 3:   # elliptic arc
+                        cx, cy, mx, my, ratio, a0, a1 = num(10), num(20), num(11), num(21), num(40), num(50), num(51)
+                        ccw = int(seek(73))
+                        sweep = (a1 - a0) % 360 or 360
+                        t = np.radians(a0 + np.linspace(0, sweep, 16, endpoint=False)) * (1 if ccw else -1)
+                        verts += [[cx + math.cos(u) * mx - math.sin(u) * ratio * my,
+                                   cy + math.cos(u) * my + math.sin(u) * ratio * mx, 0.0] for u in t]
+                    elif kind == 4:   # spline
+                        seek(94)
+                        controls = int(seek(96))
+                        verts += [[num(10), num(20), 0.0] for _ in range(controls)]
+            loops.append((verts, bool(flag & 17)))
+    except (ValueError, IndexError):
+        pass   # keep the loops read before a malformed one
+    return loops
+
+# ── Takeoff ──────────────────────────────────────────────────────────────────
+class Takeoff:
+    """Count, length and area per (layer, kind), in drawing units."""
+
+    def __init__(self):
+        self.rows = {}   # (layer, kind) → row
+        self.count = []
+        self.length = np.zeros(0)
+        self.area = np.zeros(0)
+        self._lines = ([], [], [], [], [])   # x1, y1, x2, y2, row
+        self._verts = ([], [], [])           # x, y, bulge
+        self._polys = ([], [], [], [])       # first vertex, row, closed, area sign
+        self._polyline = None                # POLYLINE waiting for its VERTEX entities
+
+    def _row(self, layer, kind):
+        row = self.rows.get((layer, kind))
+        if row is None:
+            row = self.rows[(layer, kind)] = len(self.count)
+            self.count.append(0)
+            self.length = np.append(self.length, 0.0)
+            self.area = np.append(self.area, 0.0)
+        self.count[row] += 1
+        return row
+
+    def _polygon(self, row, verts, closed, sign):
+        if len(verts) < 2:
+            return
+        x, y, b = self._verts
+        self._polys[0].append(len(x))
+        self._polys[1].append(row)
+        self._polys[2].append(closed)
+        self._polys[3].append(sign)
+        for vx, vy, vb in verts:
+            x.append(vx)
+            y.append(vy)
+            b.append(vb)
+        if len(x) >= CHUNK:
+            self._flush_polys()
+
+    def add(self, kind, pairs):
+        """Take one entity: its type and its (code, value) pairs."""
+        if kind in ("VERTEX", "SEQEND"):
+            if self._polyline is not None:
+                if kind == "VERTEX":
+                    d = dict(pairs)
+                    self._polyline[2].append([float(d.get(10, 0)), float(d.get(20, 0)), float(d.get(42, 0))])
+                else:
+                    row, closed, verts = self._polyline
+                    self._polygon(row, verts, closed, 1.0 if closed else 0.0)
+                    self._polyline = None
+            return
+        d = dict(pairs)
+        layer = d.get(8, "0")
+        if kind == "LINE":
+            row = self._row(layer, "Line")
+            for buf, code in zip(self._lines, (10, 20, 11, 21)):
+                buf.append(float(d.get(code, 0)))
+            self._lines[4].append(row)
+            if len(self._lines[4]) >= CHUNK:
+                self._flush_lines()
+        elif kind == "LWPOLYLINE":
+            closed = bool(int(d.get(70, 0)) & 1)
+            self._polygon(self._row(layer, "Polyline"), _lwpolyline_vertices(pairs), closed, 1.0 if closed else 0.0)
+        elif kind == "POLYLINE":
+            flags = int(d.get(70, 0))
+            if not flags & (16 | 64):   # meshes aren't paths
+                self._polyline = (self._row(layer, "Polyline"), bool(flags & 1), [])
+        elif kind == "HATCH":
+            row = self._row(layer, "Hatch")
+            loops = _hatch_loops(pairs)
+            any_external = any(external for _, external in loops)
+            for verts, external in loops:
+                self._polygon(row, verts, True, 1.0 if external or not any_external else -1.0)
+        elif kind == "CIRCLE":
+            row, r = self._row(layer, "Circle"), float(d.get(40, 0))
+            self.length[row] += 2 * math.pi * r
+            self.area[row] += math.pi * r * r
+        elif kind == "ARC":
+            row, r = self._row(layer, "Arc"), float(d.get(40, 0))
+            self.length[row] += r * math.radians((float(d.get(51, 0)) - float(d.get(50, 0))) % 360 or 360)
+        elif kind == "INSERT":
+            self._row(layer, f"Block: {d.get(2, '?')}")
+
+    def _fold(self, rows, length=None, area=None):
+        n = len(self.count)
+        if length is not None:
+            self.length += np.bincount(rows, length, minlength=n)
+        if area is not None:
+            self.area += np.bincount(rows, area, minlength=n)
+
+    def _flush_lines(self):
+        x1, y1, x2, y2 = (np.asarray(v, dtype=float) for v in self._lines[:4])
+        self._fold(np.asarray(self._lines[4], dtype=np.int64), length=np.hypot(x2 - x1, y2 - y1))
+        for buf in self._lines:
+            buf.clear()
+
+    def _flush_polys(self):
+        x, y, b = (np.asarray(v, dtype=float) for v in self._verts)
+        first = np.asarray(self._polys[0], dtype=np.int64)
+        rows = np.asarray(self._polys[1], dtype=np.int64)
+        closed = np.asarray(self._polys[2], dtype=bool)
+        sign = np.asarray(self._polys[3], dtype=float)
+        if len(x):
+            # each vertex i pairs with the next of its polyline (the first again when closed)
+            poly = np.repeat(np.arange(len(first)), np.diff(np.append(first, len(x))))
+            nxt = np.arange(1, len(x) + 1)
+            last = nxt == np.append(first[1:], len(x))[poly]
+            nxt[last] = first[poly][last]
+            seg = ~last | closed[poly]
+            dx, dy = x[nxt] - x, y[nxt] - y
+            chord = np.hypot(dx, dy)
+            theta = 4 * np.arctan(b)   # bulge → included angle of an arc segment
+            with np.errstate(divide="ignore", invalid="ignore"):
+                arc = b != 0
+                length = np.where(arc, chord * (theta / 2) / np.sin(theta / 2), chord)
+                # shoelace term plus the circular segment an arc adds (signed by its direction)
+                area = (x * y[nxt] - x[nxt] * y) / 2 + np.where(
+                    arc, chord ** 2 / (8 * np.sin(theta / 2) ** 2) * (theta - np.sin(theta)), 0.0)
+            self._fold(rows[poly], length=np.where(seg, length, 0.0))
+            poly_area = np.abs(np.bincount(poly, np.where(seg, area, 0.0), minlength=len(first))) * sign
+            self._fold(rows, area=poly_area)
+        for buf in (*self._verts, *self._polys):
+            buf.clear()
+
+    def frame(self, scale=1.0):
+        """The totals so far as TAKEOFF_COLUMNS, lengths and areas in metres."""
+        self._flush_lines()
+        self._flush_polys()
+        keys = list(self.rows)
+        out = pd.DataFrame({
+            "Layer": [k[0] for k in keys], "Entity": [k[1] for k in keys],
+            "Count": np.asarray(self.count, dtype=np.int64),
+            "Length (m)": self.length * scale, "Area (m²)": np.maximum(self.area, 0.0) * scale ** 2,
+        }, columns=TAKEOFF_COLUMNS)
+        return out.sort_values(["Layer", "Entity"], ignore_index=True)
+
+def takeoff(stream, scale=None):
+    """
+    Quantities of the ENTITIES section of an ASCII DXF stream: returns
+    (TAKEOFF_COLUMNS frame, metres per drawing unit).  `scale` overrides
+    the drawing's $INSUNITS (unitless drawings count as metres).  Block
+    references are counted per block name, not exploded.
+    """
+    t = Takeoff()
+    section, variable, units = None, None, None
+    kind, pairs = None, []
+    wanted = {"LINE", "LWPOLYLINE", "POLYLINE", "VERTEX", "SEQEND", "HATCH", "CIRCLE", "ARC", "INSERT"}
+    for code, value in read_pairs(stream):
+        if code == 0:
+            if kind is not None:
+                t.add(kind, pairs)
+            kind, pairs = None, []
+            if value == "SECTION":
+                section = ""
+            elif value == "ENDSEC":
+                section = None
+            elif section == "ENTITIES" and value in wanted:
+                kind = value
+        elif kind is not None:
+            pairs.append((code, value))
+        elif section == "" and code == 2:
+            section = value
+        elif section == "HEADER":
+            if code == 9:
+                variable = value
+            elif variable == "$INSUNITS" and code == 70:
+                units = int(value)
+    if kind is not None:
+        t.add(kind, pairs)
+    scale = scale if scale is not None else INSUNITS.get(units, 1.0)
+    return t.frame(scale), scale